@@ -3,308 +3,410 @@ Airbnb Market Analysis
 ======================
 Analyzing Airbnb listings to understand pricing factors and market dynamics.
 
+Each numbered section is an importable function that prints its part of the
+report and returns its results as DataFrames or dicts. matplotlib is only
+imported when figures are rendered, so runs that only want the numbers never
+load the plotting stack. ``--report`` writes per-section wall/CPU time, peak
+memory and row counts as JSON (see ``analysis_core.instrumentation``). Once
+the listings are cleaned, the sections run at the same time (see
+``analysis_core.scheduler``); the report is still printed in section order.
+
+Usage:
+    python airbnb_analysis.py [--listings listings.csv] [--sections pricing,hosts]
+                              [--no-plots | --dpi 150 --format svg --panels --render-workers 4]
+                              [--report run.json --profile correlation --memory tracemalloc]
+                              [--section-workers 1]
+
 Author: [Your Name]
 Date: October 2025
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import re
+import argparse
+import math
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("Set2")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.compaction import compact_frame, filter_rows, flag_mask, print_compaction
+from analysis_core.correlation import correlate, print_target_correlations, target_correlations
+from analysis_core.instrumentation import (Instrumentation, add_instrumentation_arguments, finish_run,
+                                          instrumentation_from_args)
+from analysis_core.rendering import (DEFAULT_DPI, FigureSpec, Panel, add_render_arguments, binned,
+                                     categories, print_timings, render_figures, render_options)
+from analysis_core.result_cache import CACHE_DIRNAME, ResultCache, add_cache_arguments, cache_from_args
+from analysis_core.scheduler import SectionScheduler, add_scheduler_arguments
+from ingestion import COMPACT_SCHEMA, load_listings
+from prices import clean_price
+from pricing_model import fit_price_model, price_model_analysis, print_factor_ranking
 
-# Load the data
-df = pd.read_csv('listings.csv')
+# Sources whose hash versions the result cache
+CODE_PATHS = [os.path.dirname(os.path.abspath(__file__)),
+              os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'analysis_core')]
 
-print("="*80)
-print("AIRBNB MARKET ANALYSIS")
-print("="*80)
 
 # ==========================================
 # 1. DATA CLEANING & PREPARATION
 # ==========================================
-print("\n1. DATA CLEANING")
-print("-" * 80)
-print(f"Original dataset: {df.shape[0]} listings, {df.shape[1]} features")
+PRICE_QUANTILES = (0.01, 0.99)                # prices outside these quantiles are outliers
+
+
+def clean_data(df, quantiles=PRICE_QUANTILES):
+    """Compact the frame, parse prices and trim the price outliers outside ``quantiles``.
+
+    Returns ``(df_clean, stats)``.
+    """
+    print("\n1. DATA CLEANING")
+    print("-" * 80)
+    print(f"Original dataset: {df.shape[0]} listings, {df.shape[1]} features loaded")
 
-# Clean price column (remove $ and , then convert to float)
-df['price_cleaned'] = df['price'].str.replace('$', '').str.replace(',', '').astype(float)
+    # Categoricals, booleans and small ints first, so the trim below copies those
+    # instead of the strings
+    df, compaction = compact_frame(df, COMPACT_SCHEMA)
+    print_compaction(compaction)
 
-# Remove outliers (prices beyond reasonable range)
-q1 = df['price_cleaned'].quantile(0.01)
-q99 = df['price_cleaned'].quantile(0.99)
-df_clean = df[(df['price_cleaned'] >= q1) & (df['price_cleaned'] <= q99)].copy()
+    # Clean price column (currency symbols and separators; unparseable prices become NaN)
+    df['price_cleaned'] = clean_price(df['price'])
+
+    # Remove outliers (prices beyond reasonable range)
+    q1 = df['price_cleaned'].quantile(quantiles[0])
+    q99 = df['price_cleaned'].quantile(quantiles[1])
+    df_clean = filter_rows(df, (df['price_cleaned'] >= q1) & (df['price_cleaned'] <= q99))
+
+    print(f"After cleaning: {df_clean.shape[0]} listings")
+    print(f"Price range: ${df_clean['price_cleaned'].min():.2f} - ${df_clean['price_cleaned'].max():.2f}")
+    print(f"Average price: ${df_clean['price_cleaned'].mean():.2f}")
+    print(f"Median price: ${df_clean['price_cleaned'].median():.2f}")
+
+    return df_clean, {
+        'listings': len(df),
+        'listings_clean': len(df_clean),
+        'price_bounds': (q1, q99),
+        'mean_price': df_clean['price_cleaned'].mean(),
+        'median_price': df_clean['price_cleaned'].median(),
+        'memory': compaction,
+    }
 
-print(f"After cleaning: {df_clean.shape[0]} listings")
-print(f"Price range: ${df_clean['price_cleaned'].min():.2f} - ${df_clean['price_cleaned'].max():.2f}")
-print(f"Average price: ${df_clean['price_cleaned'].mean():.2f}")
-print(f"Median price: ${df_clean['price_cleaned'].median():.2f}")
 
 # ==========================================
 # 2. MARKET OVERVIEW
 # ==========================================
-print("\n2. MARKET OVERVIEW")
-print("-" * 80)
+def market_overview(df_clean):
+    """Room type, property type and neighbourhood composition."""
+    print("\n2. MARKET OVERVIEW")
+    print("-" * 80)
+    result = {}
+
+    # Room type distribution
+    result['room_types'] = df_clean['room_type'].value_counts()
+    print("\nRoom Type Distribution:")
+    print(result['room_types'])
+    print("\nRoom Type Percentages:")
+    print((result['room_types'] / len(df_clean) * 100).round(2))
+
+    # Property type distribution (top 10)
+    result['property_types'] = df_clean['property_type'].value_counts().head(10)
+    print("\nTop 10 Property Types:")
+    print(result['property_types'])
 
-# Room type distribution
-print("\nRoom Type Distribution:")
-print(df_clean['room_type'].value_counts())
-print("\nRoom Type Percentages:")
-print((df_clean['room_type'].value_counts() / len(df_clean) * 100).round(2))
+    # Neighborhood distribution (top 10)
+    if 'neighbourhood_cleansed' in df_clean.columns:
+        result['neighbourhoods'] = df_clean['neighbourhood_cleansed'].value_counts().head(10)
+        print("\nTop 10 Neighborhoods by Listings:")
+        print(result['neighbourhoods'])
 
-# Property type distribution (top 10)
-print("\nTop 10 Property Types:")
-print(df_clean['property_type'].value_counts().head(10))
+    return result
 
-# Neighborhood distribution (top 10)
-if 'neighbourhood_cleansed' in df_clean.columns:
-    print("\nTop 10 Neighborhoods by Listings:")
-    print(df_clean['neighbourhood_cleansed'].value_counts().head(10))
 
 # ==========================================
 # 3. PRICING ANALYSIS
 # ==========================================
-print("\n3. PRICING ANALYSIS")
-print("-" * 80)
-
-# Average price by room type
-print("\nAverage Price by Room Type:")
-price_by_room = df_clean.groupby('room_type')['price_cleaned'].agg(['mean', 'median', 'count'])
-print(price_by_room.round(2))
-
-# Average price by number of bedrooms
-if 'bedrooms' in df_clean.columns and df_clean['bedrooms'].notna().sum() > 0:
-    print("\nAverage Price by Number of Bedrooms:")
-    price_by_bedrooms = df_clean[df_clean['bedrooms'].notna()].groupby('bedrooms')['price_cleaned'].mean().sort_index()
-    print(price_by_bedrooms.head(8).round(2))
-
-# Average price by accommodates
-print("\nAverage Price by Guest Capacity:")
-price_by_accommodates = df_clean.groupby('accommodates')['price_cleaned'].mean().sort_index()
-print(price_by_accommodates.head(10).round(2))
-
-# Top 10 most expensive neighborhoods
-if 'neighbourhood_cleansed' in df_clean.columns:
-    print("\nTop 10 Most Expensive Neighborhoods:")
-    expensive_neighborhoods = df_clean.groupby('neighbourhood_cleansed').agg({
-        'price_cleaned': 'mean',
-        'id': 'count'
-    }).rename(columns={'id': 'count'})
-    expensive_neighborhoods = expensive_neighborhoods[expensive_neighborhoods['count'] >= 5]  # At least 5 listings
-    print(expensive_neighborhoods.sort_values('price_cleaned', ascending=False).head(10).round(2))
+def pricing_analysis(df_clean):
+    """Price by room type, bedrooms, capacity and neighbourhood."""
+    print("\n3. PRICING ANALYSIS")
+    print("-" * 80)
+    result = {}
+
+    # Average price by room type
+    print("\nAverage Price by Room Type:")
+    result['price_by_room'] = df_clean.groupby('room_type')['price_cleaned'].agg(['mean', 'median', 'count'])
+    print(result['price_by_room'].round(2))
+
+    # Average price by number of bedrooms
+    if 'bedrooms' in df_clean.columns and df_clean['bedrooms'].notna().sum() > 0:
+        print("\nAverage Price by Number of Bedrooms:")
+        result['price_by_bedrooms'] = df_clean[df_clean['bedrooms'].notna()].groupby('bedrooms')['price_cleaned'].mean().sort_index()
+        print(result['price_by_bedrooms'].head(8).round(2))
+
+    # Average price by accommodates
+    print("\nAverage Price by Guest Capacity:")
+    result['price_by_accommodates'] = df_clean.groupby('accommodates')['price_cleaned'].mean().sort_index()
+    print(result['price_by_accommodates'].head(10).round(2))
+
+    # Top 10 most expensive neighborhoods
+    if 'neighbourhood_cleansed' in df_clean.columns:
+        print("\nTop 10 Most Expensive Neighborhoods:")
+        expensive_neighborhoods = df_clean.groupby('neighbourhood_cleansed').agg({
+            'price_cleaned': 'mean',
+            'id': 'count'
+        }).rename(columns={'id': 'count'})
+        expensive_neighborhoods = expensive_neighborhoods[expensive_neighborhoods['count'] >= 5]  # At least 5 listings
+        result['top_neighbourhoods'] = expensive_neighborhoods.sort_values('price_cleaned', ascending=False).head(10)
+        print(result['top_neighbourhoods'].round(2))
+
+    return result
+
 
 # ==========================================
 # 4. REVIEW ANALYSIS
 # ==========================================
-print("\n4. REVIEW & RATING ANALYSIS")
-print("-" * 80)
-
-# Overall review statistics
-print(f"\nTotal reviews: {df_clean['number_of_reviews'].sum():,.0f}")
-print(f"Listings with reviews: {(df_clean['number_of_reviews'] > 0).sum()} ({(df_clean['number_of_reviews'] > 0).sum() / len(df_clean) * 100:.1f}%)")
-
-if 'review_scores_rating' in df_clean.columns:
-    ratings = df_clean['review_scores_rating'].dropna()
-    if len(ratings) > 0:
-        print(f"\nAverage rating: {ratings.mean():.2f} / 5.0")
-        print(f"Median rating: {ratings.median():.2f} / 5.0")
-        
-        # Correlation between reviews and price
-        if df_clean[['number_of_reviews', 'price_cleaned']].notna().all(axis=1).sum() > 10:
-            corr = df_clean[['number_of_reviews', 'price_cleaned']].corr().iloc[0, 1]
-            print(f"\nCorrelation between reviews and price: {corr:.3f}")
+def review_analysis(df_clean):
+    """Review volume, ratings and the reviews/price correlation."""
+    print("\n4. REVIEW & RATING ANALYSIS")
+    print("-" * 80)
+    result = {
+        'total_reviews': df_clean['number_of_reviews'].sum(),
+        'listings_with_reviews': (df_clean['number_of_reviews'] > 0).sum(),
+    }
+
+    # Overall review statistics
+    print(f"\nTotal reviews: {result['total_reviews']:,.0f}")
+    print(f"Listings with reviews: {result['listings_with_reviews']} ({result['listings_with_reviews'] / len(df_clean) * 100:.1f}%)")
+
+    if 'review_scores_rating' in df_clean.columns:
+        ratings = df_clean['review_scores_rating'].dropna()
+        if len(ratings) > 0:
+            result['mean_rating'] = ratings.mean()
+            result['median_rating'] = ratings.median()
+            print(f"\nAverage rating: {result['mean_rating']:.2f} / 5.0")
+            print(f"Median rating: {result['median_rating']:.2f} / 5.0")
+
+            # Correlation between reviews and price
+            if df_clean[['number_of_reviews', 'price_cleaned']].notna().all(axis=1).sum() > 10:
+                result['reviews_price_corr'] = df_clean[['number_of_reviews', 'price_cleaned']].corr().iloc[0, 1]
+                print(f"\nCorrelation between reviews and price: {result['reviews_price_corr']:.3f}")
+
+    return result
+
 
 # ==========================================
 # 5. HOST ANALYSIS
 # ==========================================
-print("\n5. HOST ANALYSIS")
-print("-" * 80)
-
-if 'host_is_superhost' in df_clean.columns:
-    superhosts = df_clean['host_is_superhost'].value_counts()
-    print(f"\nSuperhosts: {superhosts.get('t', 0)} ({superhosts.get('t', 0) / len(df_clean) * 100:.1f}%)")
-    
-    # Superhost vs regular host pricing
-    superhost_price = df_clean[df_clean['host_is_superhost'] == 't']['price_cleaned'].mean()
-    regular_price = df_clean[df_clean['host_is_superhost'] == 'f']['price_cleaned'].mean()
-    print(f"Superhost average price: ${superhost_price:.2f}")
-    print(f"Regular host average price: ${regular_price:.2f}")
+def dollars(price):
+    """``price`` as '$12.34', or 'n/a' when there are no listings to average (a market without superhosts)."""
+    return 'n/a' if math.isnan(price) else f'${price:.2f}'
+
+
+def host_analysis(df_clean):
+    """Superhost share and superhost vs regular host pricing."""
+    print("\n5. HOST ANALYSIS")
+    print("-" * 80)
+    result = {}
+
+    if 'host_is_superhost' in df_clean.columns:
+        is_superhost = flag_mask(df_clean['host_is_superhost'])
+        result['superhosts'] = int(is_superhost.sum())
+        print(f"\nSuperhosts: {result['superhosts']} ({result['superhosts'] / len(df_clean) * 100:.1f}%)")
+
+        # Superhost vs regular host pricing
+        result['superhost_price'] = df_clean.loc[is_superhost, 'price_cleaned'].mean()
+        result['regular_price'] = df_clean.loc[flag_mask(df_clean['host_is_superhost'], False), 'price_cleaned'].mean()
+        print(f"Superhost average price: {dollars(result['superhost_price'])}")
+        print(f"Regular host average price: {dollars(result['regular_price'])}")
+
+    return result
+
 
 # ==========================================
 # 6. AVAILABILITY & BOOKING ANALYSIS
 # ==========================================
-print("\n6. AVAILABILITY ANALYSIS")
-print("-" * 80)
-
-print(f"\nAverage availability (next 365 days): {df_clean['availability_365'].mean():.0f} days")
-print(f"Median availability: {df_clean['availability_365'].median():.0f} days")
-
-# Listings with high availability (>300 days)
-high_availability = (df_clean['availability_365'] > 300).sum()
-print(f"\nListings available >300 days/year: {high_availability} ({high_availability / len(df_clean) * 100:.1f}%)")
+def availability_analysis(df_clean):
+    """Availability over the next year and minimum-night requirements."""
+    print("\n6. AVAILABILITY ANALYSIS")
+    print("-" * 80)
+    result = {
+        'mean_availability': df_clean['availability_365'].mean(),
+        'median_availability': df_clean['availability_365'].median(),
+        # Listings with high availability (>300 days)
+        'high_availability': (df_clean['availability_365'] > 300).sum(),
+        'mean_minimum_nights': df_clean['minimum_nights'].mean(),
+        'median_minimum_nights': df_clean['minimum_nights'].median(),
+    }
+
+    print(f"\nAverage availability (next 365 days): {result['mean_availability']:.0f} days")
+    print(f"Median availability: {result['median_availability']:.0f} days")
+    print(f"\nListings available >300 days/year: {result['high_availability']} ({result['high_availability'] / len(df_clean) * 100:.1f}%)")
+
+    # Minimum nights analysis
+    print(f"\nAverage minimum nights: {result['mean_minimum_nights']:.1f}")
+    print(f"Median minimum nights: {result['median_minimum_nights']:.0f}")
+
+    return result
 
-# Minimum nights analysis
-print(f"\nAverage minimum nights: {df_clean['minimum_nights'].mean():.1f}")
-print(f"Median minimum nights: {df_clean['minimum_nights'].median():.0f}")
 
 # ==========================================
 # 7. VISUALIZATIONS
 # ==========================================
-print("\n7. GENERATING VISUALIZATIONS...")
-print("-" * 80)
-
-# Create comprehensive visualization
-fig = plt.figure(figsize=(20, 12))
-
-# 1. Price Distribution
-ax1 = plt.subplot(3, 3, 1)
-plt.hist(df_clean['price_cleaned'], bins=50, color='#3498db', alpha=0.7, edgecolor='black')
-plt.axvline(df_clean['price_cleaned'].mean(), color='red', linestyle='--', linewidth=2, label=f"Mean: ${df_clean['price_cleaned'].mean():.0f}")
-plt.axvline(df_clean['price_cleaned'].median(), color='green', linestyle='--', linewidth=2, label=f"Median: ${df_clean['price_cleaned'].median():.0f}")
-plt.xlabel('Price ($)')
-plt.ylabel('Frequency')
-plt.title('Price Distribution', fontsize=14, fontweight='bold')
-plt.legend()
-
-# 2. Price by Room Type
-ax2 = plt.subplot(3, 3, 2)
-room_prices = df_clean.groupby('room_type')['price_cleaned'].mean().sort_values(ascending=True)
-plt.barh(room_prices.index, room_prices.values, color='#e74c3c')
-plt.xlabel('Average Price ($)')
-plt.title('Average Price by Room Type', fontsize=14, fontweight='bold')
-
-# 3. Room Type Distribution
-ax3 = plt.subplot(3, 3, 3)
-room_counts = df_clean['room_type'].value_counts()
-colors_pie = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12']
-plt.pie(room_counts, labels=room_counts.index, autopct='%1.1f%%', colors=colors_pie, startangle=90)
-plt.title('Room Type Distribution', fontsize=14, fontweight='bold')
-
-# 4. Price vs Accommodates
-ax4 = plt.subplot(3, 3, 4)
-accommodates_price = df_clean.groupby('accommodates')['price_cleaned'].mean()
-plt.plot(accommodates_price.index, accommodates_price.values, marker='o', linewidth=2, markersize=8, color='#9b59b6')
-plt.xlabel('Number of Guests')
-plt.ylabel('Average Price ($)')
-plt.title('Price by Guest Capacity', fontsize=14, fontweight='bold')
-plt.grid(True, alpha=0.3)
-
-# 5. Number of Reviews Distribution
-ax5 = plt.subplot(3, 3, 5)
-reviews_with_data = df_clean[df_clean['number_of_reviews'] > 0]['number_of_reviews']
-plt.hist(reviews_with_data, bins=50, color='#1abc9c', alpha=0.7, edgecolor='black')
-plt.xlabel('Number of Reviews')
-plt.ylabel('Frequency')
-plt.title('Review Count Distribution', fontsize=14, fontweight='bold')
-plt.xlim(0, reviews_with_data.quantile(0.95))
-
-# 6. Availability Distribution
-ax6 = plt.subplot(3, 3, 6)
-plt.hist(df_clean['availability_365'], bins=50, color='#f39c12', alpha=0.7, edgecolor='black')
-plt.xlabel('Days Available (per year)')
-plt.ylabel('Frequency')
-plt.title('Availability Distribution', fontsize=14, fontweight='bold')
-
-# 7. Price vs Reviews Scatter
-ax7 = plt.subplot(3, 3, 7)
-sample_data = df_clean[df_clean['number_of_reviews'] > 0].sample(min(500, len(df_clean)))
-plt.scatter(sample_data['number_of_reviews'], sample_data['price_cleaned'], 
-           alpha=0.5, color='#e74c3c', s=30)
-plt.xlabel('Number of Reviews')
-plt.ylabel('Price ($)')
-plt.title('Price vs Number of Reviews', fontsize=14, fontweight='bold')
-plt.grid(True, alpha=0.3)
-
-# 8. Minimum Nights Distribution
-ax8 = plt.subplot(3, 3, 8)
-min_nights_filtered = df_clean[df_clean['minimum_nights'] <= 30]['minimum_nights']
-plt.hist(min_nights_filtered, bins=30, color='#16a085', alpha=0.7, edgecolor='black')
-plt.xlabel('Minimum Nights')
-plt.ylabel('Frequency')
-plt.title('Minimum Stay Requirements', fontsize=14, fontweight='bold')
-
-# 9. Top 10 Neighborhoods by Listings
-ax9 = plt.subplot(3, 3, 9)
-if 'neighbourhood_cleansed' in df_clean.columns:
-    top_neighborhoods = df_clean['neighbourhood_cleansed'].value_counts().head(10)
-    plt.barh(range(len(top_neighborhoods)), top_neighborhoods.values, color='#2980b9')
-    plt.yticks(range(len(top_neighborhoods)), top_neighborhoods.index)
-    plt.xlabel('Number of Listings')
-    plt.title('Top 10 Neighborhoods', fontsize=14, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('airbnb_market_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: airbnb_market_analysis.png")
+def dashboard_panels(df_clean):
+    """Precompute the nine dashboard panels as small binned/aggregated arrays."""
+    price = df_clean['price_cleaned']
+    room_prices = df_clean.groupby('room_type')['price_cleaned'].mean().sort_values(ascending=True)
+    room_counts = df_clean['room_type'].value_counts()
+    accommodates_price = df_clean.groupby('accommodates')['price_cleaned'].mean()
+    reviews_with_data = df_clean[df_clean['number_of_reviews'] > 0]['number_of_reviews']
+    sample_data = df_clean[df_clean['number_of_reviews'] > 0].sample(min(500, len(df_clean)))
+    min_nights_filtered = df_clean[df_clean['minimum_nights'] <= 30]['minimum_nights']
+
+    panels = [
+        Panel('price_distribution', 'hist', 'Price Distribution',
+              dict(binned(price, bins=50), vlines=[(price.mean(), 'red', f"Mean: ${price.mean():.0f}"),
+                                                   (price.median(), 'green', f"Median: ${price.median():.0f}")]),
+              'Price ($)', 'Frequency', {'color': '#3498db', 'edgecolor': 'black'}),
+        Panel('price_by_room_type', 'barh', 'Average Price by Room Type', categories(room_prices),
+              'Average Price ($)', style={'color': '#e74c3c'}),
+        Panel('room_type_distribution', 'pie', 'Room Type Distribution', categories(room_counts),
+              style={'colors': ['#3498db', '#e74c3c', '#2ecc71', '#f39c12']}),
+        Panel('price_by_capacity', 'line', 'Price by Guest Capacity',
+              {'x': accommodates_price.index.to_numpy(), 'y': accommodates_price.to_numpy()},
+              'Number of Guests', 'Average Price ($)', {'color': '#9b59b6'}),
+        Panel('review_counts', 'hist', 'Review Count Distribution',
+              dict(binned(reviews_with_data, bins=50), xlim=(0, reviews_with_data.quantile(0.95))),
+              'Number of Reviews', 'Frequency', {'color': '#1abc9c', 'edgecolor': 'black'}),
+        Panel('availability', 'hist', 'Availability Distribution', binned(df_clean['availability_365'], bins=50),
+              'Days Available (per year)', 'Frequency', {'color': '#f39c12', 'edgecolor': 'black'}),
+        Panel('price_vs_reviews', 'scatter', 'Price vs Number of Reviews',
+              {'x': sample_data['number_of_reviews'].to_numpy(), 'y': sample_data['price_cleaned'].to_numpy()},
+              'Number of Reviews', 'Price ($)', {'color': '#e74c3c'}),
+        Panel('minimum_nights', 'hist', 'Minimum Stay Requirements', binned(min_nights_filtered, bins=30),
+              'Minimum Nights', 'Frequency', {'color': '#16a085', 'edgecolor': 'black'}),
+    ]
+    if 'neighbourhood_cleansed' in df_clean.columns:
+        top_neighborhoods = df_clean['neighbourhood_cleansed'].value_counts().head(10)
+        panels.append(Panel('top_neighbourhoods', 'barh', 'Top 10 Neighborhoods', categories(top_neighborhoods),
+                            'Number of Listings', style={'color': '#2980b9'}))
+    return panels
+
+
+def heatmap_panel(corr_df):
+    """Correlation heatmap panel from a correlation matrix."""
+    return Panel('correlation_heatmap', 'heatmap', 'Correlation Matrix - Key Pricing Factors',
+                 {'matrix': corr_df.to_numpy(), 'labels': list(corr_df.columns)},
+                 style={'title_size': 16, 'title_pad': 20})
+
+
+def plot_figures(df_clean, output_dir='.', dpi=DEFAULT_DPI, fmt='png', layout='dashboard', workers=None, tight=True):
+    """Render the dashboard and the correlation heatmap in parallel.
+
+    Returns the per-panel render timings (see ``render_figures``).
+    """
+    print("\n7. GENERATING VISUALIZATIONS...")
+    print("-" * 80)
+
+    figures = [
+        FigureSpec('airbnb_market_analysis', dashboard_panels(df_clean), grid=(3, 3), figsize=(20, 12)),
+        FigureSpec('airbnb_correlation_heatmap', [heatmap_panel(correlation_matrix(df_clean))], grid=(1, 1), figsize=(10, 8)),
+    ]
+    timings = render_figures(figures, output_dir, dpi=dpi, fmt=fmt, layout=layout, workers=workers, tight=tight)
+    for path in timings['path'].unique():
+        print(f"✓ Saved: {os.path.basename(path)}")
+    print_timings(timings)
+    return timings
+
 
 # ==========================================
 # 8. CORRELATION ANALYSIS
 # ==========================================
-print("\n8. CORRELATION ANALYSIS")
-print("-" * 80)
-
 # Select key numerical features for correlation
-correlation_features = ['price_cleaned', 'accommodates', 'bedrooms', 'beds', 
+CORRELATION_FEATURES = ['price_cleaned', 'accommodates', 'bedrooms', 'beds',
                         'number_of_reviews', 'availability_365', 'minimum_nights']
+CORRELATION_RESAMPLES = 2000
+CORRELATION_SEED = 42
+
+
+def correlation_matrix(df_clean):
+    """Correlation matrix of the key pricing factors present in the data."""
+    return correlate_prices(df_clean, n_resamples=0)[0].correlation()
+
+
+def correlate_prices(df_clean, n_resamples=CORRELATION_RESAMPLES, seed=CORRELATION_SEED):
+    """One pass of the correlation engine over the key pricing factors.
+
+    Returns ``(accumulator, bootstrap)`` from ``analysis_core.correlation``.
+    """
+    # Remove features not in dataset
+    correlation_features = [f for f in CORRELATION_FEATURES if f in df_clean.columns]
+    return correlate([df_clean], 'price_cleaned', correlation_features, n_resamples=n_resamples, seed=seed)
+
+
+def correlation_analysis(df_clean, n_resamples=CORRELATION_RESAMPLES):
+    """Correlation matrix of the key pricing factors and their link to price.
+
+    Correlations with price come with bootstrap confidence intervals.
+    """
+    print("\n8. CORRELATION ANALYSIS")
+    print("-" * 80)
 
-# Remove features not in dataset
-correlation_features = [f for f in correlation_features if f in df_clean.columns]
+    accumulator, bootstrap = correlate_prices(df_clean, n_resamples)
+    corr_df = accumulator.correlation()
+    table = target_correlations(accumulator, bootstrap)
 
-# Get correlation matrix
-corr_df = df_clean[correlation_features].corr()
+    # Top correlations with price
+    print(f"\nTop correlations with Price ({n_resamples} bootstrap resamples):")
+    print_target_correlations(table)
 
-plt.figure(figsize=(10, 8))
-sns.heatmap(corr_df, annot=True, fmt='.2f', cmap='coolwarm', 
-            center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8})
-plt.title('Correlation Matrix - Key Pricing Factors', fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.savefig('airbnb_correlation_heatmap.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: airbnb_correlation_heatmap.png")
+    return {'matrix': corr_df, 'price_correlations': table['abs_corr'], 'price_correlation_ci': table}
 
-# Top correlations with price
-print("\nTop correlations with Price:")
-price_corr = corr_df['price_cleaned'].drop('price_cleaned').abs().sort_values(ascending=False)
-print(price_corr)
 
 # ==========================================
-# 9. KEY FINDINGS & RECOMMENDATIONS
+# 9. HEDONIC PRICE MODEL
 # ==========================================
-print("\n" + "="*80)
-print("KEY FINDINGS & RECOMMENDATIONS")
-print("="*80)
+def price_model(df_clean):
+    """Fit the hedonic log-price model and rank the pricing factors by its coefficients."""
+    print("\n9. HEDONIC PRICE MODEL")
+    print("-" * 80)
+    return price_model_analysis(df_clean)
 
-avg_price = df_clean['price_cleaned'].mean()
-entire_home_pct = (df_clean['room_type'] == 'Entire home/apt').sum() / len(df_clean) * 100
-high_review_pct = (df_clean['number_of_reviews'] >= 10).sum() / len(df_clean) * 100
 
-print(f"""
+# ==========================================
+# 10. KEY FINDINGS & RECOMMENDATIONS
+# ==========================================
+def key_findings(df_clean, model=None):
+    """Print the headline findings and recommendations.
+
+    The pricing-factor ranking and effect sizes come from the hedonic price
+    model, fitted here unless ``model`` is given.
+    """
+    if model is None:
+        model = fit_price_model(df_clean)
+    print("\n" + "="*80)
+    print("KEY FINDINGS & RECOMMENDATIONS")
+    print("="*80)
+
+    avg_price = df_clean['price_cleaned'].mean()
+    entire_home_pct = (df_clean['room_type'] == 'Entire home/apt').sum() / len(df_clean) * 100
+    high_review_pct = (df_clean['number_of_reviews'] >= 10).sum() / len(df_clean) * 100
+
+    print(f"""
 MARKET INSIGHTS:
 1. Average Listing Price: ${avg_price:.2f} per night
 2. Most Common: Entire homes/apartments ({entire_home_pct:.1f}% of listings)
 3. {high_review_pct:.1f}% of listings have 10+ reviews (established properties)
 4. Price increases linearly with guest capacity and number of bedrooms
 5. Superhosts can command higher prices on average
-
-PRICING FACTORS (Strongest to Weakest):
-1. Number of guests accommodated - Primary driver
-2. Room type - Entire homes command premium prices
-3. Number of bedrooms/beds - Direct impact on price
-4. Location/Neighborhood - Significant geographic variation
-5. Host status (Superhost) - Modest premium
-
+""")
+    print_factor_ranking(model)
+    superhost = (f"{model.binary_effect('host_is_superhost'):+.1f}% price difference in this market"
+                 if 'host_is_superhost' in model.offsets else "no host status in this listings file")
+    print(f"""
 RECOMMENDATIONS FOR HOSTS:
-1. Optimize capacity: Listings that accommodate more guests earn significantly more
+1. Optimize capacity: Each additional guest is worth {model.unit_effect('accommodates'):+.1f}% on the nightly price
 2. Consider room type: Converting to entire home can increase revenue if feasible
 3. Build reviews: Focus on guest experience to accumulate positive reviews
 4. Strategic pricing: Research neighborhood averages and price competitively
 5. Maintain availability: Higher availability correlates with more bookings
-6. Work toward Superhost status: Small but meaningful price premium
+6. Work toward Superhost status: {superhost}
 
 RECOMMENDATIONS FOR MARKET ENTRANTS:
 1. Target underserved neighborhoods with lower competition
@@ -314,6 +416,174 @@ RECOMMENDATIONS FOR MARKET ENTRANTS:
 5. Maintain high response rates and guest satisfaction
 """)
 
-print("\n" + "="*80)
-print("Analysis complete! Check the generated PNG files for visualizations.")
-print("="*80)
+    return {
+        'avg_price': avg_price,
+        'entire_home_pct': entire_home_pct,
+        'high_review_pct': high_review_pct,
+        'pricing_factors': model.importance,
+    }
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+# Sections selectable with --sections, in report order. Cleaning always runs
+# first since every other section works on the cleaned frame.
+SECTIONS = ['market', 'pricing', 'reviews', 'hosts', 'availability',
+            'plots', 'correlation', 'model', 'findings']
+
+
+def section_functions(df_clean, output_dir='.', render_options=None, results=None):
+    """Section name -> zero-argument callable running it on ``df_clean``.
+
+    ``results`` is the dict the runner fills in; the findings section reuses
+    the fitted model from it when the model section ran first.
+    """
+    results = {} if results is None else results
+    return {
+        'market': lambda: market_overview(df_clean),
+        'pricing': lambda: pricing_analysis(df_clean),
+        'reviews': lambda: review_analysis(df_clean),
+        'hosts': lambda: host_analysis(df_clean),
+        'availability': lambda: availability_analysis(df_clean),
+        'plots': lambda: plot_figures(df_clean, output_dir, **(render_options or {})),
+        'correlation': lambda: correlation_analysis(df_clean),
+        'model': lambda: price_model(df_clean),
+        'findings': lambda: key_findings(df_clean, results.get('model')),
+    }
+
+
+def section_parameters(name, render_options=None):
+    """What besides the data and the code changes a section's output (part of its cache key)."""
+    if name == 'cleaning':
+        return {'quantiles': PRICE_QUANTILES}
+    if name == 'plots':
+        return {key: value for key, value in (render_options or {}).items() if key != 'workers'}
+    return {}
+
+
+def run_analysis(listings_path='listings.csv', output_dir='.', sections=None, render_options=None,
+                 instrumentation=None, cache=None, workers=1):
+    """Run the selected sections on one listings file.
+
+    Parameters
+    ----------
+    listings_path : str
+        Inside Airbnb ``listings.csv`` to analyse.
+    output_dir : str
+        Where figures are written.
+    sections : list of str, optional
+        Names from ``SECTIONS``; all of them by default. 'plots' renders
+        both the dashboard and the correlation heatmap.
+    render_options : dict, optional
+        Keyword arguments for ``plot_figures`` (dpi, fmt, layout, workers,
+        tight).
+    instrumentation : Instrumentation, optional
+        Records time, memory and rows for loading, cleaning and every
+        section (see ``analysis_core.instrumentation``).
+    cache : ResultCache, optional
+        Replays cleaning and sections already computed for this file,
+        parameters and code (see ``analysis_core.result_cache``). When
+        cleaning is cached the CSV is not read at all.
+    workers : int, optional
+        Sections run at the same time once cleaning is done (see
+        ``analysis_core.scheduler``); None uses every CPU. The report is
+        printed in section order either way.
+
+    Returns
+    -------
+    dict
+        Section name -> the section's results, plus 'cleaning'.
+    """
+    sections = list(SECTIONS if sections is None else sections)
+    unknown = [name for name in sections if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections {unknown}; choose from {SECTIONS}")
+
+    inst = instrumentation or Instrumentation(memory='off')
+    cache = cache or ResultCache(CACHE_DIRNAME, enabled=False)
+    scheduler = SectionScheduler(1 if inst.sequential else workers)
+
+    # Load the data (only the columns used below, via the columnar cache)
+    loading = not cache.contains('cleaning', section_parameters('cleaning'))
+    if loading:
+        scheduler.add('load', lambda: inst.run('load', lambda: load_listings(listings_path)))
+
+    def clean(load=None):
+        return inst.run('cleaning', lambda: cache.run('cleaning', lambda: clean_data(load),
+                                                      section_parameters('cleaning')),
+                        rows=None if load is None else len(load))
+    scheduler.add('cleaning', clean, after=['load'] if loading else [])
+
+    def section(name):
+        def run(cleaning, model=None):
+            df_clean = cleaning[0]
+            function = section_functions(df_clean, output_dir, render_options, {'model': model})[name]
+            files = (lambda timings: timings['path'].unique()) if name == 'plots' else None
+            return inst.run(name, lambda: cache.run(name, function, section_parameters(name, render_options),
+                                                    output_dir, files),
+                            rows=len(df_clean))
+        return run
+
+    for name in SECTIONS:
+        if name in sections:
+            # The findings reuse the fitted model when the model section runs
+            inputs = ['cleaning', 'model'] if name == 'findings' and 'model' in sections else ['cleaning']
+            scheduler.add(name, section(name), after=inputs)
+
+    print("="*80)
+    print("AIRBNB MARKET ANALYSIS")
+    print("="*80)
+    try:
+        steps = scheduler.run()
+    finally:
+        inst.summarize('schedule', scheduler.summary())
+    results = {'cleaning': steps['cleaning'][1]}
+    results.update((name, steps[name]) for name in sections)
+
+    if 'findings' in sections:
+        print("\n" + "="*80)
+        print("Analysis complete! Check the generated PNG files for visualizations.")
+        print("="*80)
+    cache.print_summary()
+    inst.summarize('cache', cache.stats())
+
+    return results
+
+
+def parse_sections(value):
+    """Parse a comma-separated ``--sections`` value."""
+    sections = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in sections if name not in SECTIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown sections {unknown}; choose from {','.join(SECTIONS)}")
+    return sections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Airbnb market analysis.')
+    parser.add_argument('--listings', default='listings.csv', help='Inside Airbnb listings.csv to analyse')
+    parser.add_argument('--output-dir', default='.', help='where figures are written')
+    parser.add_argument('--sections', type=parse_sections, default=None,
+                        help=f"comma-separated sections to run (default: all): {','.join(SECTIONS)}")
+    add_render_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_cache_arguments(parser)
+    add_scheduler_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sections = args.sections or list(SECTIONS)
+    if args.no_plots:
+        sections = [name for name in sections if name != 'plots']
+    os.makedirs(args.output_dir, exist_ok=True)
+    instrumentation = instrumentation_from_args(args)
+    cache = cache_from_args(args, args.listings, CODE_PATHS)
+    try:
+        run_analysis(args.listings, args.output_dir, sections, render_options(args), instrumentation, cache,
+                     args.section_workers)
+    finally:
+        finish_run(instrumentation, args, 'airbnb_analysis', listings=args.listings, sections=sections)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Amenity Features
+================
+Sparse listing x amenity matrix and per-amenity price premiums.
+
+The ``amenities`` column holds a JSON list of strings per listing. Instead of
+``json.loads`` on every row, the whole column is handled as one Arrow string
+array. The outer ``["`` / ``"]`` are sliced off, each string is split on the
+``", "`` separator, and the flattened tokens are dictionary-encoded into
+column ids. The list offsets of the split are then the ``indptr`` of a CSR
+matrix. Only the vocabulary (thousands of strings, not millions of tokens)
+goes through ``json.loads`` to undo escapes such as ``\\u2013``. The rare
+rows with escaped quotes are parsed the slow way.
+
+The matrix is cached as ``.npz`` beside the listings cache, keyed on the same
+content hash as ``ingestion.load_listings``.
+
+Premiums come from sparse matrix products: ``X.T @ price`` gives the price
+sum of every amenity at once, and ``X.T @ G`` / ``X.T @ (G * price)`` with a
+room-type indicator matrix ``G`` gives the per-room-type counts and sums.
+
+Usage:
+    python amenities.py [--listings listings.csv] [--min-count 20] [--top 15]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ingestion import CACHE_DIRNAME, file_hash, load_listings, read_listings_csv
+from prices import clean_price
+
+MIN_COUNT = 20
+SEPARATOR = '", "'
+
+
+# ==========================================
+# PARSING
+# ==========================================
+def _unescape(token):
+    """Decode JSON escapes in one vocabulary entry."""
+    return json.loads(f'"{token}"') if '\\' in token else token
+
+
+def _split_tokens(values):
+    """Split each JSON-list string into its raw (still escaped) tokens.
+
+    Returns ``(offsets, tokens)``: the tokens of row ``i`` are
+    ``tokens[offsets[i]:offsets[i + 1]]``.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        lists = values.fillna('[]').str.slice(2, -2).str.split(SEPARATOR, regex=False)
+        offsets = np.concatenate([[0], np.cumsum(lists.str.len())])
+        return offsets, pd.Series(lists.explode().to_numpy(), dtype=object)
+
+    array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):   # Arrow-backed pandas strings
+        array = array.combine_chunks()
+    array = array.fill_null('[]')
+    inner = pc.utf8_slice_codeunits(array, 2, -2)
+    split = pc.split_pattern(inner, SEPARATOR)
+    return np.asarray(split.offsets), split.values
+
+
+def amenity_matrix(values):
+    """Build the binary CSR listing x amenity matrix from an ``amenities`` column.
+
+    Returns ``(matrix, vocabulary)`` with columns sorted by amenity name.
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    # Escaped quotes could hide a separator; those few rows go through json.loads
+    escaped = values.str.contains('\\"', regex=False).fillna(False).to_numpy()
+    offsets, tokens = _split_tokens(values.where(~escaped))
+
+    codes, raw_vocabulary = pd.factorize(pd.Series(tokens, dtype='str'))
+    rows = np.repeat(np.arange(len(values)), np.diff(offsets))
+    vocabulary = pd.Index([_unescape(token) for token in raw_vocabulary])
+
+    extra_rows, extra_tokens = [], []
+    for row in np.flatnonzero(escaped):
+        for token in json.loads(values[row]):
+            extra_rows.append(row)
+            extra_tokens.append(token)
+    # Map everything onto the sorted, unescaped vocabulary (empty tokens from
+    # "[]" are dropped)
+    names = vocabulary.append(pd.Index(extra_tokens)) if extra_tokens else vocabulary
+    columns = pd.Index(sorted(set(names) - {''}))
+    token_columns = columns.get_indexer(names)
+    all_rows = np.concatenate([rows, np.asarray(extra_rows, dtype=rows.dtype)])
+    all_columns = np.concatenate([token_columns[codes], token_columns[len(vocabulary):]])
+    keep = all_columns >= 0
+
+    matrix = sparse.csr_matrix((np.ones(keep.sum(), dtype=np.float64), (all_rows[keep], all_columns[keep])),
+                               shape=(len(values), len(columns)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0                     # listings repeating an amenity still count once
+    return matrix, columns
+
+
+# ==========================================
+# CACHE
+# ==========================================
+def _matrix_cache_path(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{file_hash(path, cache_dir)}-amenities.npz')
+
+
+def load_amenities(path='listings.csv', cache_dir=None, use_cache=True):
+    """Return ``(ids, matrix, vocabulary)`` for a listings file, through the ``.npz`` cache."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    if use_cache:
+        # The content hash is memoised in the cache directory
+        os.makedirs(cache_dir, exist_ok=True)
+    cache_file = _matrix_cache_path(path, cache_dir) if use_cache else None
+    if cache_file and os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            matrix = sparse.csr_matrix((cached['data'], cached['indices'], cached['indptr']), shape=tuple(cached['shape']))
+            return cached['ids'], matrix, pd.Index(cached['vocabulary'])
+
+    df = read_listings_csv(path, ['id', 'amenities'])
+    matrix, vocabulary = amenity_matrix(df['amenities'])
+    ids = df['id'].to_numpy()
+    if cache_file:
+        tmp_file = cache_file + '.tmp.npz'
+        np.savez(tmp_file, ids=ids, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                 shape=np.array(matrix.shape), vocabulary=np.array(vocabulary, dtype=str))
+        os.replace(tmp_file, cache_file)
+    return ids, matrix, vocabulary
+
+
+# ==========================================
+# PRICE PREMIUMS
+# ==========================================
+def _premium_table(count, price_sum, log_sum, total_n, total_sum, total_log):
+    """Mean price with vs without each amenity, from per-amenity sums."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_with = price_sum / count
+        mean_without = (total_sum - price_sum) / (total_n - count)
+        # Geometric-mean ratio: robust to the few extreme prices
+        log_diff = log_sum / count - (total_log - log_sum) / (total_n - count)
+    return {'count': count, 'share_pct': count / total_n * 100, 'mean_with': mean_with, 'mean_without': mean_without,
+            'premium': mean_with - mean_without, 'premium_pct': np.expm1(log_diff) * 100}
+
+
+def amenity_premiums(matrix, vocabulary, price, room_type=None):
+    """Price premium of every amenity, overall and per room type.
+
+    Parameters
+    ----------
+    matrix : scipy.sparse matrix
+        Binary listing x amenity matrix; rows aligned with ``price``.
+    vocabulary : sequence of str
+        Amenity names, one per column.
+    price : array-like
+        Listing prices; rows with a missing price are ignored.
+    room_type : array-like, optional
+        Room type per listing, for the per-room-type table.
+
+    Returns
+    -------
+    DataFrame
+        One row per amenity (overall), or per (room_type, amenity) when
+        ``room_type`` is given, with the listing count, share, mean price
+        with and without the amenity, the difference (``premium``) and the
+        geometric-mean premium in percent (``premium_pct``).
+    """
+    price = np.asarray(price, dtype=float)
+    keep = ~np.isnan(price) & (price > 0)
+    matrix, price = sparse.csr_matrix(matrix)[keep], price[keep]
+    log_price = np.log(price)
+    xt = matrix.T.tocsr()
+
+    if room_type is None:
+        columns = _premium_table(xt @ np.ones(len(price)), xt @ price, xt @ log_price,
+                                 len(price), price.sum(), log_price.sum())
+        return pd.DataFrame(columns, index=pd.Index(vocabulary, name='amenity'))
+
+    codes, labels = pd.factorize(np.asarray(room_type, dtype=object)[keep])
+    groups = sparse.csr_matrix((np.ones(len(codes)), (np.arange(len(codes)), codes)), shape=(len(codes), len(labels)))
+    group_n = np.asarray(groups.sum(axis=0)).ravel()
+    # (amenities x room types) counts and sums in three sparse products
+    count = (xt @ groups).toarray()
+    price_sum = (xt @ groups.multiply(price[:, None]).tocsr()).toarray()
+    log_sum = (xt @ groups.multiply(log_price[:, None]).tocsr()).toarray()
+    columns = _premium_table(count, price_sum, log_sum, group_n, groups.T @ price, groups.T @ log_price)
+    index = pd.MultiIndex.from_product([vocabulary, labels], names=['amenity', 'room_type'])
+    table = pd.DataFrame({name: np.asarray(values).ravel() for name, values in columns.items()}, index=index)
+    return table.swaplevel().sort_index()
+
+
+def listing_amenity_premiums(df_clean, path='listings.csv', cache_dir=None):
+    """Overall and per-room-type premiums for the cleaned listings of ``path``."""
+    ids, matrix, vocabulary = load_amenities(path, cache_dir)
+    rows = pd.Index(ids).get_indexer(df_clean['id'])
+    if (rows < 0).any():
+        raise ValueError("Some cleaned listings are missing from the amenity matrix")
+    matrix = matrix[rows]
+    price = df_clean['price_cleaned'].to_numpy()
+    return (amenity_premiums(matrix, vocabulary, price),
+            amenity_premiums(matrix, vocabulary, price, df_clean['room_type'].to_numpy()))
+
+
+def print_premiums(overall, by_room, min_count=MIN_COUNT, top=15):
+    columns = ['count', 'share_pct', 'mean_with', 'mean_without', 'premium_pct']
+    common = overall[(overall['count'] >= min_count) & (overall['count'] <= overall['count'].max() - min_count)]
+    print(f"\nAmenities on at least {min_count} listings (and missing from at least {min_count}): {len(common)} "
+          f"of {len(overall)}")
+    print(f"\nTop {top} amenities by price premium (geometric mean, %):")
+    print(common.sort_values('premium_pct', ascending=False)[columns].head(top).round(1).to_string())
+    print(f"\nBottom {top} amenities by price premium:")
+    print(common.sort_values('premium_pct')[columns].head(top).round(1).to_string())
+
+    for room_type, table in by_room.groupby(level='room_type'):
+        table = table.droplevel('room_type')
+        group_n = (table['count'] * 100 / table['share_pct']).max()
+        table = table[(table['count'] >= min_count) & (table['count'] <= group_n - min_count)]
+        if len(table):
+            print(f"\n{room_type}: top 5 premiums")
+            print(table.sort_values('premium_pct', ascending=False)[columns].head(5).round(1).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Amenity price premiums from a sparse amenity matrix.')
+    parser.add_argument('--listings', default='listings.csv')
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT, help='minimum listings with and without an amenity')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    df = load_listings(args.listings, columns=['id', 'price', 'room_type'])
+    df['price_cleaned'] = clean_price(df['price'])
+    # Same 1%/99% trim as the main analysis
+    q1, q99 = df['price_cleaned'].quantile([0.01, 0.99])
+    df_clean = df[df['price_cleaned'].between(q1, q99)]
+
+    print("=" * 80)
+    print("AMENITY PRICE PREMIUMS")
+    print("=" * 80)
+    overall, by_room = listing_amenity_premiums(df_clean, args.listings)
+    print(f"\nListings: {len(df_clean):,}, distinct amenities: {len(overall):,}")
+    print_premiums(overall, by_room, args.min_count, args.top)
+
+
+if __name__ == '__main__':
+    main()
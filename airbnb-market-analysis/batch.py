@@ -0,0 +1,164 @@
+"""
+Multi-City Batch Runner
+=======================
+Runs ``airbnb_analysis.run_analysis`` over many ``listings.csv`` snapshots
+(several cities, several monthly scrapes each) in a process pool.
+
+Every input gets its own output directory with the figures and the console
+report, and one combined cross-city summary table is written at the end.
+A file that fails to load or analyse is recorded as failed in the summary
+instead of stopping the batch.
+
+Usage:
+    python batch.py "data/*/*/listings.csv" --workers 8 --output-dir batch_output [--draft | --no-plots]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import contextlib
+import glob
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from airbnb_analysis import SECTIONS
+from analysis_core.rendering import add_render_arguments, render_options
+
+SUMMARY_FILENAME = 'cross_city_summary.csv'
+REPORT_FILENAME = 'report.txt'
+TOP_NEIGHBOURHOODS = 3
+
+
+def expand_inputs(patterns):
+    """Expand files and glob patterns into a sorted, de-duplicated path list."""
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        paths.extend(matches if matches else [pattern])
+    return sorted(dict.fromkeys(os.path.normpath(path) for path in paths))
+
+
+def city_labels(paths):
+    """Derive a readable, unique label per input from its path.
+
+    ``data/amsterdam/2024-06-25/listings.csv`` becomes
+    ``amsterdam_2024-06-25`` when the inputs share the ``data`` prefix.
+    """
+    if len(paths) == 1:
+        parent = os.path.basename(os.path.dirname(os.path.abspath(paths[0])))
+        return [parent or 'listings']
+
+    common = os.path.commonpath([os.path.abspath(path) for path in paths])
+    labels = []
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), common)
+        stem = relative.split('.')[0]
+        parts = [part for part in stem.split(os.sep) if part != 'listings']
+        labels.append('_'.join(parts) or stem.replace(os.sep, '_'))
+    return labels
+
+
+def _describe(exc):
+    return ' '.join(f'{type(exc).__name__}: {exc}'.split())
+
+
+def analyse_city(label, listings_path, output_dir, sections=None, render_options=None):
+    """Worker: analyse one listings file, capturing its report.
+
+    Returns a row for the cross-city summary. Exceptions are caught here so a
+    single bad file only marks its own row as failed. Figures render inside
+    the worker (``workers=1``) since the batch already uses every core.
+    """
+    from airbnb_analysis import run_analysis
+
+    city_dir = os.path.join(output_dir, label)
+    os.makedirs(city_dir, exist_ok=True)
+    row = {'city': label, 'path': listings_path, 'status': 'ok', 'error': ''}
+
+    with open(os.path.join(city_dir, REPORT_FILENAME), 'w') as report:
+        try:
+            with contextlib.redirect_stdout(report):
+                results = run_analysis(listings_path, city_dir, sections, dict(render_options or {}, workers=1))
+        except Exception as exc:
+            traceback.print_exc(file=report)
+            row.update(status='failed', error=_describe(exc))
+            return row
+
+    cleaning = results['cleaning']
+    row.update(
+        listings=cleaning['listings'],
+        listings_clean=cleaning['listings_clean'],
+        mean_price=cleaning['mean_price'],
+        median_price=cleaning['median_price'],
+    )
+    pricing = results.get('pricing', {})
+    for room_type, stats in pricing.get('price_by_room', pd.DataFrame()).iterrows():
+        row[f'mean_price[{room_type}]'] = stats['mean']
+        row[f'median_price[{room_type}]'] = stats['median']
+    if 'top_neighbourhoods' in pricing:
+        row['top_neighbourhoods'] = '; '.join(pricing['top_neighbourhoods'].index[:TOP_NEIGHBOURHOODS])
+    hosts = results.get('hosts', {})
+    if 'superhost_price' in hosts:
+        row['superhost_price'] = hosts['superhost_price']
+        row['regular_price'] = hosts['regular_price']
+        row['superhost_premium_pct'] = (hosts['superhost_price'] / hosts['regular_price'] - 1) * 100
+    return row
+
+
+def run_batch(paths, output_dir='batch_output', workers=None, sections=None, render_options=None):
+    """Analyse every path in a process pool and return the summary table.
+
+    ``sections`` and ``render_options`` are passed on to ``run_analysis``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    labels = city_labels(paths)
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyse_city, label, path, output_dir, sections, render_options): (label, path)
+                   for label, path in zip(labels, paths)}
+        for future in as_completed(futures):
+            label, path = futures[future]
+            try:
+                row = future.result()
+            except Exception as exc:
+                # The worker process itself died (e.g. out of memory)
+                row = {'city': label, 'path': path, 'status': 'failed', 'error': _describe(exc)}
+            print(f"{'✓' if row['status'] == 'ok' else '✗'} {label}"
+                  + (f" ({row['error']})" if row['error'] else ''))
+            rows.append(row)
+
+    summary = pd.DataFrame(rows).set_index('city').sort_index()
+    summary.to_csv(os.path.join(output_dir, SUMMARY_FILENAME))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the Airbnb analysis over many listings files in parallel.')
+    parser.add_argument('inputs', nargs='+', help='listings.csv paths or glob patterns (quote globs)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='batch_output', help='where per-city outputs and the summary go')
+    add_render_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sections = [name for name in SECTIONS if name != 'plots'] if args.no_plots else None
+    paths = expand_inputs(args.inputs)
+    print("=" * 80)
+    print(f"AIRBNB BATCH ANALYSIS: {len(paths)} listings files")
+    print("=" * 80)
+    summary = run_batch(paths, args.output_dir, args.workers, sections, render_options(args))
+
+    failed = (summary['status'] != 'ok').sum()
+    print("\nCROSS-CITY SUMMARY")
+    print("-" * 80)
+    print(summary.drop(columns=['path', 'error']).round(2).to_string())
+    print(f"\n✓ Saved: {os.path.join(args.output_dir, SUMMARY_FILENAME)}"
+          + (f" ({failed} failed)" if failed else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Amenity Matrix Benchmark
+========================
+Times ``amenities.amenity_matrix`` (parse plus CSR build) and
+``amenities.amenity_premiums`` (overall and per room type) on synthetic
+``amenities`` columns of growing size.
+
+Amenity popularity follows a Zipf-like curve over the vocabulary, and each
+listing has about as many amenities as in The Hague data. The naive approach
+runs ``json.loads`` on every row and builds one boolean mask per amenity. It
+is timed on the smaller sizes, extrapolated linearly for the larger ones, and
+used to check the vectorized results exactly.
+
+Usage:
+    python benchmark_amenities.py [--sizes 10000 100000 500000] [--vocabulary 3000]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from amenities import amenity_matrix, amenity_premiums
+
+ROOM_TYPES = ['Entire home/apt', 'Private room', 'Hotel room', 'Shared room']
+AMENITIES_PER_LISTING = 45
+NAIVE_MAX = 20_000
+
+
+def make_listings(n, vocabulary_size, rng):
+    """``n`` synthetic listings with a JSON ``amenities`` column, price and room type."""
+    names = np.array([f'Amenity {i} – option {i % 7}' for i in range(vocabulary_size)])
+    popularity = 1 / np.arange(1, vocabulary_size + 1) ** 0.8
+    popularity /= popularity.sum()
+    counts = rng.poisson(AMENITIES_PER_LISTING, n)
+    picks = rng.choice(vocabulary_size, size=counts.sum(), p=popularity)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    amenities = [json.dumps(list(dict.fromkeys(names[picks[a:b]])))
+                 for a, b in zip(bounds[:-1], bounds[1:])]
+    price = np.round(rng.lognormal(5, 0.6, n))
+    room_type = np.array(ROOM_TYPES)[rng.choice(4, n, p=[0.75, 0.2, 0.03, 0.02])]
+    return pd.Series(amenities, dtype='str'), price, room_type
+
+
+def naive_premiums(amenities, price):
+    """Per-row ``json.loads`` and one boolean mask per amenity."""
+    lists = [json.loads(value) for value in amenities]
+    vocabulary = sorted({name for names in lists for name in names})
+    rows = {}
+    for name in vocabulary:
+        has = np.array([name in names for names in lists])
+        rows[name] = (has.sum(), price[has].mean() - price[~has].mean())
+    return pd.DataFrame.from_dict(rows, orient='index', columns=['count', 'premium'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the sparse amenity matrix and premiums.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 20_000, 100_000, 300_000, 500_000])
+    parser.add_argument('--vocabulary', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print("=" * 80)
+    print(f"AMENITY MATRIX BENCHMARK ({args.vocabulary:,} amenities, ~{AMENITIES_PER_LISTING} per listing)")
+    print("=" * 80)
+
+    rows = []
+    naive_rate = None
+    for n in args.sizes:
+        amenities, price, room_type = make_listings(n, args.vocabulary, rng)
+        start = time.perf_counter()
+        matrix, vocabulary = amenity_matrix(amenities)
+        parse = time.perf_counter() - start
+        overall = amenity_premiums(matrix, vocabulary, price)
+        amenity_premiums(matrix, vocabulary, price, room_type)
+        total = time.perf_counter() - start
+
+        row = {'listings': n, 'amenities': len(vocabulary), 'nnz': matrix.nnz,
+               'parse_s': parse, 'premiums_s': total - parse, 'total_s': total}
+        if n <= NAIVE_MAX:
+            start = time.perf_counter()
+            naive = naive_premiums(amenities, price)
+            row['naive_s'] = time.perf_counter() - start
+            naive_rate = row['naive_s'] / n
+            row['identical'] = (naive.index.equals(overall.index)
+                                and np.array_equal(naive['count'], overall['count'])
+                                and np.allclose(naive['premium'], overall['premium'], equal_nan=True))
+        elif naive_rate is not None:
+            row['naive_s'] = naive_rate * n
+            row['identical'] = 'n/a (extrapolated)'
+        rows.append(row)
+        print(f"  {n:>9,} listings: {total:7.2f}s")
+
+    results = pd.DataFrame(rows).set_index('listings')
+    print("\nResults:")
+    print(results.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Price Parser Benchmark
+======================
+Times ``prices.parse_prices`` against the original cleaning chain
+``str.replace('$', '').str.replace(',', '').astype(float)``.
+
+The chain only understands US-formatted prices, so the head-to-head runs on
+``$1,234.00`` strings. The parser is also timed on a mixed multi-currency
+sample with nulls and garbage, which the chain cannot handle at all.
+
+Usage:
+    python benchmark_prices.py [--rows 10000000] [--repeat 3]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from prices import clean_price, parse_prices
+
+POOL_SIZE = 100_000
+
+
+def original_chain(price):
+    return price.str.replace('$', '').str.replace(',', '').astype(float)
+
+
+def make_us_prices(rows, rng):
+    """Sample ``rows`` '$1,234.00'-style strings from a pool of distinct prices."""
+    amounts = np.round(rng.lognormal(5, 1, POOL_SIZE), 2)
+    pool = np.array([f'${amount:,.2f}' for amount in amounts], dtype=object)
+    return pd.Series(pool[rng.integers(0, POOL_SIZE, rows)], dtype='str')
+
+
+def make_mixed_prices(rows, rng):
+    """Sample ``rows`` prices in several currencies and formats, with 1% nulls and 1% garbage."""
+    amounts = np.round(rng.lognormal(5, 1, POOL_SIZE), 2)
+    formats = [
+        lambda a: f'${a:,.2f}',
+        lambda a: '€' + f'{a:,.2f}'.replace(',', ' ').replace('.', ',').replace(' ', '.'),
+        lambda a: f'{a:,.2f}'.replace(',', ' ').replace('.', ',') + ' kr',
+        lambda a: f'£{a:.2f}',
+        lambda a: f"CHF {a:,.2f}".replace(',', "'"),
+    ]
+    pool = [formats[i % len(formats)](amount) for i, amount in enumerate(amounts)]
+    pool[:POOL_SIZE // 100] = ['n/a'] * (POOL_SIZE // 100)
+    pool = np.array(pool + [None] * (POOL_SIZE // 100), dtype=object)
+    return pd.Series(pool[rng.integers(0, len(pool), rows)], dtype='str')
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized price parser.')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print("=" * 80)
+    print(f"PRICE PARSER BENCHMARK ({args.rows:,} rows, best of {args.repeat})")
+    print("=" * 80)
+
+    us_prices = make_us_prices(args.rows, rng)
+    chain_time, expected = best_time(lambda: original_chain(us_prices), args.repeat)
+    parser_time, parsed = best_time(lambda: clean_price(us_prices), args.repeat)
+    identical = np.array_equal(expected.to_numpy(), parsed.to_numpy(), equal_nan=True)
+
+    print("\nUS-formatted prices:")
+    print(f"  original str.replace chain: {chain_time:8.2f}s  ({args.rows / chain_time:,.0f} rows/s)")
+    print(f"  parse_prices:               {parser_time:8.2f}s  ({args.rows / parser_time:,.0f} rows/s)")
+    print(f"  speed-up: {chain_time / parser_time:.2f}x, identical results: {identical}")
+
+    mixed = make_mixed_prices(args.rows, rng)
+    mixed_time, result = best_time(lambda: parse_prices(mixed), args.repeat)
+    print("\nMixed currencies, nulls and garbage:")
+    print(f"  parse_prices:               {mixed_time:8.2f}s  ({args.rows / mixed_time:,.0f} rows/s)")
+    print(f"  rejected rows: {result['rejected'].sum():,} ({result['rejected'].mean() * 100:.2f}%)")
+    print("  rows per currency:")
+    print(result['currency'].value_counts().to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Pricing Model Benchmark
+=======================
+Scoring throughput of ``HedonicPriceModel.predict`` on synthetic listings.
+
+The model is fitted once on a synthetic city, then batches of growing size
+are scored in one ``predict`` call each. A per-row Python scorer (dict
+lookups and a dot product per listing) is timed on the smallest batch as the
+naive baseline and used to check the predictions.
+
+Usage:
+    python benchmark_pricing_model.py [--sizes 100000 1000000 5000000] [--neighbourhoods 50]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pricing_model import CATEGORICAL_FEATURES, LOG_FEATURES, NUMERIC_FEATURES, HedonicPriceModel
+
+ROOM_TYPES = ['Entire home/apt', 'Private room', 'Hotel room', 'Shared room']
+FIT_ROWS = 100_000
+NAIVE_ROWS = 100_000
+
+
+def make_listings(n, n_neighbourhoods, rng):
+    """``n`` synthetic listings with the model's columns and a log-linear price."""
+    accommodates = rng.integers(1, 9, n)
+    bedrooms = np.maximum(1, accommodates // 2 + rng.integers(-1, 2, n)).astype(float)
+    bedrooms[rng.random(n) < 0.02] = np.nan
+    df = pd.DataFrame({
+        'accommodates': accommodates,
+        'bedrooms': bedrooms,
+        'beds': bedrooms + rng.integers(0, 2, n),
+        'number_of_reviews': rng.negative_binomial(1, 0.03, n),
+        'review_scores_rating': np.where(rng.random(n) < 0.15, np.nan, np.round(rng.uniform(3.5, 5, n), 2)),
+        'host_is_superhost': pd.Series(np.where(rng.random(n) < 0.25, 't', 'f'), dtype='str'),
+        'room_type': pd.Series(np.array(ROOM_TYPES)[rng.choice(4, n, p=[0.75, 0.2, 0.03, 0.02])], dtype='str'),
+        'neighbourhood_cleansed': pd.Series([f'Neighbourhood {i}' for i in rng.integers(0, n_neighbourhoods, n)],
+                                            dtype='str'),
+    })
+    log_price = (4 + 0.12 * accommodates + 0.3 * (df['room_type'] == 'Entire home/apt')
+                 + 0.1 * (df['host_is_superhost'] == 't') + rng.normal(0, 0.3, n))
+    return df, np.exp(log_price.to_numpy())
+
+
+def naive_predict(model, df):
+    """Score listing by listing in Python."""
+    weights = dict(zip(model.columns, model.coef))
+    predictions = []
+    for row in df.to_dict('records'):
+        total = model.intercept
+        for column in NUMERIC_FEATURES:
+            value = row[column]
+            missing = value != value
+            median, mean, std = model.scaling[column]
+            value = median if missing else (np.log1p(value) if column in LOG_FEATURES else value)
+            total += weights[column] * (value - mean) / std
+            if column in model.missing_flags and missing:
+                total += weights[column + '_missing']
+        if row['host_is_superhost'] == 't':
+            total += weights['host_is_superhost']
+        for column in CATEGORICAL_FEATURES:
+            total += weights.get(f'{column}={row[column]}', 0.0)
+        predictions.append(np.exp(total) * model.smearing)
+    return np.array(predictions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark batch scoring of the hedonic price model.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--neighbourhoods', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print("=" * 80)
+    print("PRICING MODEL SCORING BENCHMARK")
+    print("=" * 80)
+
+    train, price = make_listings(FIT_ROWS, args.neighbourhoods, rng)
+    start = time.perf_counter()
+    model = HedonicPriceModel().fit(train, price)
+    print(f"Fit on {FIT_ROWS:,} listings ({len(model.columns)} columns): {time.perf_counter() - start:.2f}s, "
+          f"R² {model.r2:.3f}")
+
+    rows = []
+    for n in args.sizes:
+        df, _ = make_listings(n, args.neighbourhoods, rng)
+        start = time.perf_counter()
+        predictions = model.predict(df)
+        elapsed = time.perf_counter() - start
+        row = {'listings': n, 'predict_s': elapsed, 'rows_per_s': n / elapsed}
+        if n <= NAIVE_ROWS:
+            start = time.perf_counter()
+            naive = naive_predict(model, df)
+            naive_elapsed = time.perf_counter() - start
+            row['naive_rows_per_s'] = n / naive_elapsed
+            row['identical'] = np.allclose(naive, predictions)
+        rows.append(row)
+        print(f"  {n:>10,} listings: {elapsed:6.2f}s")
+
+    results = pd.DataFrame(rows).set_index('listings')
+    print("\nResults:")
+    print(results.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Section Benchmark Suite
+=======================
+Times and memory-profiles every numbered section of ``airbnb_analysis.py`` on
+synthetic listings files of growing size (10k, 1M and 10M rows by default).
+
+For each size the suite generates (or reuses) a file with
+``synthetic_listings``, then profiles:
+
+- ``load``: CSV parse and cache write, into a fresh cache directory
+- ``load_cached``: the same file through the Arrow cache
+- ``cleaning`` and each section in ``SECTIONS``
+
+Each step is timed and its peak RSS recorded. The results are saved as JSON
+(see ``analysis_core.benchmarking``), and ``--baseline`` compares them with
+an earlier run to flag regressions.
+
+Generated files are kept in ``--data-dir`` between runs. With the free text
+kept, 10M listings take about 23 GB; ``--drop-text`` shrinks that about
+threefold.
+
+Usage:
+    python benchmark_sections.py [--sizes 10k 1M 10M] [--sections pricing,correlation] [--no-plots]
+    python benchmark_sections.py --sizes 10k 100k --baseline benchmark_results/airbnb-20251001-120000.json
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.benchmarking import SectionProfiler, add_benchmark_arguments, finish_suite
+from airbnb_analysis import SECTIONS, clean_data, parse_sections, section_functions
+from ingestion import load_listings
+from synthetic_listings import ensure_listings
+
+SUITE = 'airbnb'
+
+
+def profile_size(profiler, path, rows, sections, output_dir):
+    """Profile loading, cleaning and ``sections`` on one listings file."""
+    labels = {'rows': rows}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        df = profiler.run('load', lambda: load_listings(path, cache_dir=cache_dir), **labels)
+        profiler.run('load_cached', lambda: load_listings(path, cache_dir=cache_dir), **labels)
+    df_clean, _ = profiler.run('cleaning', lambda: clean_data(df), **labels)
+
+    results = {}
+    functions = section_functions(df_clean, output_dir, results=results)
+    for name in SECTIONS:
+        if name in sections:
+            results[name] = profiler.run(name, functions[name], **labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time and memory-profile the Airbnb analysis sections.')
+    add_benchmark_arguments(parser)
+    parser.add_argument('--sections', type=parse_sections, default=None,
+                        help=f"comma-separated sections to profile (default: all): {','.join(SECTIONS)}")
+    parser.add_argument('--no-plots', action='store_true', help="skip the 'plots' section")
+    parser.add_argument('--drop-text', action='store_true', help='generate files without the long free text')
+    args = parser.parse_args(argv)
+
+    sections = args.sections or list(SECTIONS)
+    if args.no_plots:
+        sections = [name for name in sections if name != 'plots']
+
+    print("=" * 80)
+    print("AIRBNB SECTION BENCHMARK")
+    print("=" * 80)
+    profiler = SectionProfiler(memory=not args.no_memory)
+    with tempfile.TemporaryDirectory() as output_dir:
+        for rows in args.sizes:
+            path = ensure_listings(args.data_dir, rows, args.seed, args.drop_text)
+            print(f"  {rows:>11,} listings ({os.path.getsize(path) / 2 ** 20:,.0f} MB) ...", flush=True)
+            profile_size(profiler, path, rows, sections, output_dir)
+    finish_suite(args, SUITE, profiler, sections=sections, drop_text=args.drop_text)
+
+
+if __name__ == '__main__':
+    main()
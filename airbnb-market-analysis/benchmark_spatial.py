@@ -0,0 +1,108 @@
+"""
+Spatial Index Benchmark
+=======================
+Times ``spatial.comp_stats`` (index build plus all-listings radius comps) on
+synthetic cities of growing size, up to 1M listings.
+
+Listing density is held constant as the city grows (about as many comps per
+listing as in The Hague at 500 m), which is how real markets scale. The
+naive approach compares every pair of listings. It is timed on the smaller
+sizes, extrapolated as O(n²) for the larger ones, and used to check the
+index results exactly.
+
+Usage:
+    python benchmark_spatial.py [--sizes 10000 100000 1000000] [--radius 500]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from spatial import SpatialIndex, comp_stats, haversine_m
+
+CENTRE = (52.08, 4.30)
+LISTINGS_PER_KM2 = 50
+ROOM_TYPES = ['Entire home/apt', 'Private room', 'Hotel room', 'Shared room']
+BRUTE_FORCE_MAX = 20_000
+BRUTE_FORCE_BLOCK = 2_000
+
+
+def make_city(n, rng):
+    """``n`` listings spread uniformly at ``LISTINGS_PER_KM2`` around ``CENTRE``."""
+    side_km = np.sqrt(n / LISTINGS_PER_KM2)
+    lat = CENTRE[0] + (rng.random(n) - 0.5) * side_km / 111.2
+    lon = CENTRE[1] + (rng.random(n) - 0.5) * side_km / (111.2 * np.cos(np.radians(CENTRE[0])))
+    price = np.round(rng.lognormal(5, 0.6, n))
+    room_type = np.array(ROOM_TYPES)[rng.choice(4, n, p=[0.75, 0.2, 0.03, 0.02])]
+    return lat, lon, price, room_type
+
+
+def brute_force(lat, lon, price, radius_m):
+    """Naive all-pairs comp count and median comp price, in row blocks."""
+    count = np.empty(len(lat), dtype=np.int64)
+    median = np.full(len(lat), np.nan)
+    for start in range(0, len(lat), BRUTE_FORCE_BLOCK):
+        rows = slice(start, start + BRUTE_FORCE_BLOCK)
+        within = haversine_m(lat[rows, None], lon[rows, None], lat[None], lon[None]) <= radius_m
+        within[np.arange(within.shape[0]), np.arange(start, start + within.shape[0])] = False
+        count[rows] = within.sum(axis=1)
+        for r, mask in enumerate(within):
+            if mask.any():
+                median[start + r] = np.median(price[mask])
+    return count, median
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the spatial comp index.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 30_000, 100_000, 300_000, 1_000_000])
+    parser.add_argument('--radius', type=float, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print("=" * 80)
+    print(f"SPATIAL INDEX BENCHMARK (radius {args.radius:.0f} m, {LISTINGS_PER_KM2} listings/km²)")
+    print("=" * 80)
+
+    rows = []
+    brute_rate = None
+    for n in args.sizes:
+        lat, lon, price, room_type = make_city(n, rng)
+        start = time.perf_counter()
+        index = SpatialIndex(lat, lon)
+        build = time.perf_counter() - start
+        stats = comp_stats(index, price, room_type, radius_m=args.radius)
+        total = time.perf_counter() - start
+
+        row = {'listings': n, 'build_s': build, 'comps_s': total - build, 'total_s': total,
+               'comps_per_listing': stats['comp_count'].mean()}
+        if n <= BRUTE_FORCE_MAX:
+            start = time.perf_counter()
+            count, median = brute_force(lat, lon, price, args.radius)
+            row['naive_s'] = time.perf_counter() - start
+            brute_rate = row['naive_s'] / n ** 2
+            row['identical'] = (np.array_equal(count, stats['comp_count'])
+                                and np.allclose(median, stats['comp_median_price'], equal_nan=True))
+        elif brute_rate is not None:
+            row['naive_s'] = brute_rate * n ** 2
+            row['identical'] = 'n/a (extrapolated)'
+        rows.append(row)
+        print(f"  {n:>9,} listings: {total:7.2f}s")
+
+    results = pd.DataFrame(rows).set_index('listings')
+    print("\nResults:")
+    print(results.round(3).to_string())
+
+    if len(results) > 1:
+        # Slope of log(time) against log(n): 1 is linear, 2 is quadratic
+        slope = np.polyfit(np.log(results.index.to_numpy(float)), np.log(results['total_s'].to_numpy()), 1)[0]
+        print(f"\nEmpirical scaling: time ~ n^{slope:.2f} (naive all-pairs is n^2)")
+
+
+if __name__ == '__main__':
+    main()
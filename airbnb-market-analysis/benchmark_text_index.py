@@ -0,0 +1,99 @@
+"""
+Text Index Benchmark
+====================
+Times building ``text_index.TextIndex`` and answering keyword queries from
+it, against scanning the text with ``str.contains`` for every query, on
+synthetic listings of growing size.
+
+The listings come from ``synthetic_listings.generate_listings`` with their
+free text kept. The scan lowercases the joined text once and runs one
+word-boundary regex per keyword. Its matches are used to check the index
+results exactly. The break-even column shows how many queries it takes
+before building the index has paid for itself.
+
+Usage:
+    python benchmark_text_index.py [--sizes 10000 100000 300000] [--repeat 3]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_listings import generate_listings, load_source
+from text_index import TextIndex, joined_text
+
+# Query -> the same query as a combination of per-keyword scan masks
+QUERIES = {
+    'canal': lambda has: has('canal'),
+    'canal OR parking': lambda has: has('canal') | has('parking'),
+    'beach AND NOT party': lambda has: has('beach') & ~has('party'),
+    '(canal OR harbour) AND view': lambda has: (has('canal') | has('harbour')) & has('view'),
+}
+
+
+def scan_rows(lowered, query):
+    """Rows matching ``query`` by regex-scanning the lowercased text."""
+    def has(word):
+        return lowered.str.contains(rf'\b{re.escape(word)}\b', regex=True).to_numpy(dtype=bool)
+    return np.flatnonzero(QUERIES[query](has))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the inverted text index against str.contains scans.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 300_000])
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each query (best time is kept)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    source = load_source()
+    print("=" * 80)
+    print(f"TEXT INDEX BENCHMARK ({len(QUERIES)} queries)")
+    print("=" * 80)
+
+    rows = []
+    for n in args.sizes:
+        df = generate_listings(source, n, seed=args.seed)
+        texts = joined_text(df)
+        start = time.perf_counter()
+        index = TextIndex.build(df['id'].to_numpy(), texts)
+        build = time.perf_counter() - start
+
+        query_s, scan_s, identical = 0.0, 0.0, True
+        start = time.perf_counter()
+        lowered = texts.str.lower()
+        scan_s += time.perf_counter() - start
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = index.search(query)
+                timings.append(time.perf_counter() - start)
+            query_s += min(timings)
+            start = time.perf_counter()
+            expected = scan_rows(lowered, query)
+            scan_s += time.perf_counter() - start
+            identical &= np.array_equal(found, expected)
+
+        per_query = query_s / len(QUERIES)
+        scan_per_query = scan_s / len(QUERIES)
+        rows.append({'listings': n, 'terms': len(index.vocabulary), 'postings': index.postings.nnz,
+                     'build_s': build, 'query_ms': per_query * 1000, 'scan_ms': scan_per_query * 1000,
+                     'speedup': scan_per_query / per_query,
+                     'break_even_queries': build / max(scan_per_query - per_query, 1e-12),
+                     'identical': identical})
+        print(f"  {n:>9,} listings: build {build:6.2f}s, {per_query * 1000:8.3f} ms/query "
+              f"vs {scan_per_query * 1000:9.1f} ms/query scanned")
+
+    results = pd.DataFrame(rows).set_index('listings')
+    print("\nResults:")
+    print(results.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
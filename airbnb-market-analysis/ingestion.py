@@ -0,0 +1,201 @@
+"""
+Listings Ingestion
+==================
+Column-projected, typed loading of Inside Airbnb ``listings.csv`` files.
+
+Only the columns the analysis actually uses are parsed, each with a declared
+dtype, so the large free-text fields (``description``, ``host_about``,
+``amenities``, ...) are never materialized. The first load of a file writes an
+Arrow IPC (Feather v2, uncompressed) cache keyed on the file's content hash;
+later loads memory-map that cache instead of re-parsing the CSV.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.result_cache import _private_tmp, file_hash  # noqa: F401  (file_hash re-exported for amenities)
+
+# Columns read by the numbered analysis sections
+ANALYSIS_COLUMNS = [
+    'id', 'price', 'room_type', 'property_type', 'neighbourhood_cleansed',
+    'accommodates', 'bedrooms', 'beds', 'number_of_reviews',
+    'review_scores_rating', 'host_is_superhost', 'availability_365',
+    'minimum_nights',
+]
+
+# Declared dtypes for every column we may project. Integer columns that
+# Inside Airbnb leaves empty in some cities are declared as float64.
+LISTINGS_DTYPES = {
+    'id': 'int64',
+    'scrape_id': 'int64',
+    'last_scraped': 'str',
+    'name': 'str',
+    'description': 'str',
+    'neighborhood_overview': 'str',
+    'host_id': 'int64',
+    'host_is_superhost': 'str',
+    'host_listings_count': 'float64',
+    'neighbourhood_cleansed': 'str',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'property_type': 'str',
+    'room_type': 'str',
+    'accommodates': 'int64',
+    'bathrooms': 'float64',
+    'bedrooms': 'float64',
+    'beds': 'float64',
+    'amenities': 'str',
+    'price': 'str',
+    'minimum_nights': 'int64',
+    'maximum_nights': 'int64',
+    'availability_30': 'int64',
+    'availability_365': 'int64',
+    'number_of_reviews': 'int64',
+    'number_of_reviews_ltm': 'int64',
+    'review_scores_rating': 'float64',
+    'review_scores_accuracy': 'float64',
+    'review_scores_cleanliness': 'float64',
+    'review_scores_location': 'float64',
+    'review_scores_value': 'float64',
+    'instant_bookable': 'str',
+    'calculated_host_listings_count': 'int64',
+    'reviews_per_month': 'float64',
+}
+
+# How analysis_core.compaction shrinks the loaded frame (unnamed low-cardinality
+# strings become categoricals and integers are downcast automatically)
+COMPACT_SCHEMA = {
+    'room_type': 'category',
+    'property_type': 'category',
+    'neighbourhood_cleansed': 'category',
+    'host_is_superhost': 'flag',
+    'instant_bookable': 'flag',
+    'bedrooms': 'downcast',
+    'beds': 'downcast',
+    'price': 'keep',                          # parsed into price_cleaned by clean_price
+}
+
+CACHE_DIRNAME = '.listings_cache'
+MANIFEST_FILE = 'manifest.json'             # shared with analysis_core.result_cache.file_hash
+
+
+def read_listings_csv(path, columns=None, **kwargs):
+    """Parse ``path`` reading only ``columns`` with their declared dtypes."""
+    columns = list(columns or ANALYSIS_COLUMNS)
+    dtypes = {col: LISTINGS_DTYPES[col] for col in columns if col in LISTINGS_DTYPES}
+    return pd.read_csv(path, usecols=lambda col: col in columns, dtype=dtypes, **kwargs)
+
+
+def _cache_path(cache_dir, path, content_hash):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{content_hash}.arrow')
+
+
+def _absent_columns(cache_dir, path, content_hash):
+    """Columns already known to be missing from this version of ``path``."""
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path) as f:
+        entry = json.load(f).get(os.path.abspath(path), {})
+    return entry.get('absent_columns', []) if entry.get('hash') == content_hash else []
+
+
+def _record_absent_columns(cache_dir, path, content_hash, absent):
+    """Remember in the manifest entry of ``path`` which requested columns the file does not have."""
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    entry = manifest.get(os.path.abspath(path))
+    if not entry or entry.get('hash') != content_hash or entry.get('absent_columns', []) == absent:
+        return
+    entry['absent_columns'] = absent
+    tmp_path = _private_tmp(manifest_path)
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _read_cache(cache_file, columns, absent=()):
+    """Memory-map an Arrow IPC cache, or return None if it lacks any of ``columns`` not in ``absent``."""
+    import pyarrow as pa
+
+    with pa.memory_map(cache_file, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    present = [col for col in columns if col not in absent]
+    if not set(present) <= set(table.column_names):
+        return None, table.column_names
+    return table.select(present).to_pandas(), table.column_names
+
+
+def _write_cache(cache_file, df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_file = _private_tmp(cache_file)
+    with pa.OSFile(tmp_file, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_file, cache_file)
+
+
+def load_listings(path='listings.csv', columns=None, cache_dir=None, use_cache=True):
+    """Load the projected listings frame, going through the columnar cache.
+
+    Parameters
+    ----------
+    path : str
+        Location of an Inside Airbnb ``listings.csv`` (optionally gzipped).
+    columns : list of str, optional
+        Columns to load. Defaults to ``ANALYSIS_COLUMNS``.
+    cache_dir : str, optional
+        Where cache files live. Defaults to ``.listings_cache`` next to ``path``.
+    use_cache : bool
+        Set to False to always parse the CSV. The cache is also skipped when
+        pyarrow is not installed.
+
+    Requested columns the file does not have (older scrapes lack e.g.
+    ``review_scores_rating`` or ``bedrooms``) are left out of the result.
+    They are recorded in the cache manifest, so later loads still hit the
+    cache instead of parsing the CSV again to look for them.
+    """
+    columns = list(columns or ANALYSIS_COLUMNS)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        use_cache = False
+    if not use_cache:
+        return read_listings_csv(path, columns)
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    content_hash = file_hash(path, cache_dir)
+    cache_file = _cache_path(cache_dir, path, content_hash)
+    absent = _absent_columns(cache_dir, path, content_hash)
+    cached_columns = []
+    if os.path.exists(cache_file):
+        df, cached_columns = _read_cache(cache_file, columns, absent)
+        if df is not None:
+            return df
+
+    # Parse once with the union of cached and requested columns so the cache
+    # keeps growing towards everything the callers need.
+    parse_columns = columns + [col for col in cached_columns if col not in columns]
+    df = read_listings_csv(path, parse_columns)
+    _write_cache(cache_file, df)
+    absent = sorted(set(absent) | {col for col in parse_columns if col not in df.columns})
+    _record_absent_columns(cache_dir, path, content_hash, absent)
+    return df[[col for col in columns if col in df.columns]]
@@ -0,0 +1,370 @@
+"""
+Incremental Snapshots
+=====================
+Update the Airbnb aggregates from one monthly scrape to the next by applying
+only the listings that changed.
+
+A snapshot state holds the tracked fields of every listing (keyed on ``id``)
+and a few materialized aggregate tables. Each table counts listings (and sums
+a few columns) per distinct key, e.g. per ``(room_type, price)``. Every table
+is keyed by price, so the 1%/99% outlier trim of the main analysis can be
+applied when the aggregates are read out. Price bounds that move from one
+month to the next therefore never invalidate the state.
+
+Given a new ``listings.csv``, listings are matched on ``id`` into added,
+removed, changed and unchanged. Removed listings and the old version of
+changed ones are subtracted from the tables, added listings and the new
+version of changed ones are added, and unchanged listings are not touched.
+The tables hold integer counts, so counts, quantiles and medians come out
+exactly as in a full recompute, and means differ only by summation order. Use ``--check`` to verify this against
+``airbnb_analysis``.
+
+Usage:
+    python snapshots.py init 2024-06/listings.csv --state snapshot_state
+    python snapshots.py update 2024-07/listings.csv --state snapshot_state [--check]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ingestion import ANALYSIS_COLUMNS, load_listings
+from prices import clean_price
+
+SNAPSHOT_COLUMNS = ['id', 'scrape_id', 'last_scraped', 'price', 'room_type', 'neighbourhood_cleansed',
+                    'number_of_reviews', 'availability_365']
+# Fields whose change makes a listing "changed"
+TRACKED_FIELDS = ['room_type', 'neighbourhood_cleansed', 'price_cleaned', 'number_of_reviews', 'availability_365']
+TRIM_QUANTILES = (0.01, 0.99)
+HIGH_AVAILABILITY_DAYS = 300
+MIN_NEIGHBOURHOOD_LISTINGS = 5
+
+# Materialized tables: name -> (key columns, summed columns). Every table
+# also counts listings per key.
+AGGREGATE_TABLES = {
+    'room_price': (['room_type', 'price_cleaned'], []),
+    'neighbourhood_price': (['neighbourhood_cleansed', 'price_cleaned'], []),
+    'price_reviews': (['price_cleaned'], ['number_of_reviews', 'has_reviews']),
+    'price_availability': (['price_cleaned', 'availability_365'], []),
+}
+
+STATE_FILE = 'state.json'
+LISTINGS_FILE = 'listings.arrow'
+
+
+def load_snapshot(path):
+    """Load the tracked fields of one scrape, indexed by listing id."""
+    df = load_listings(path, columns=SNAPSHOT_COLUMNS)
+    if df['id'].duplicated().any():
+        raise ValueError(f"{path}: duplicate listing ids")
+    df['price_cleaned'] = clean_price(df['price'])
+    return df.set_index('id')[['scrape_id', 'last_scraped'] + TRACKED_FIELDS]
+
+
+# ==========================================
+# AGGREGATE TABLES
+# ==========================================
+def _contributions(listings, keys, sums, sign=1):
+    """Per-key listing counts and sums of ``listings``, times ``sign``."""
+    priced = listings[listings['price_cleaned'].notna()]
+    priced = priced.assign(count=1, has_reviews=priced['number_of_reviews'] > 0)
+    table = priced[keys + ['count'] + sums].astype({column: 'int64' for column in sums}).groupby(keys, dropna=False).sum()
+    return table * sign
+
+
+def build_tables(listings):
+    """Materialize every aggregate table from scratch."""
+    return {name: _contributions(listings, keys, sums) for name, (keys, sums) in AGGREGATE_TABLES.items()}
+
+
+def apply_delta(tables, removed, added):
+    """Subtract ``removed`` and add ``added`` listings to every table (returns new tables)."""
+    updated = {}
+    for name, (keys, sums) in AGGREGATE_TABLES.items():
+        table = tables[name]
+        for rows, sign in ((removed, -1), (added, 1)):
+            if len(rows):
+                table = table.add(_contributions(rows, keys, sums, sign), fill_value=0)
+        table = table.astype('int64')
+        if (table['count'] < 0).any():
+            raise ValueError(f"Aggregate table {name!r} went negative; the state does not match its listings")
+        updated[name] = table[table['count'] > 0].sort_index()
+    return updated
+
+
+# ==========================================
+# READ-OUT (same definitions as airbnb_analysis)
+# ==========================================
+def _weighted_quantile(values, counts, q):
+    """``np.quantile`` (linear) of ``values`` repeated ``counts`` times, without repeating them."""
+    order = np.argsort(values)
+    values, counts = np.asarray(values, dtype=float)[order], np.asarray(counts)[order]
+    cumulative = np.cumsum(counts)
+    position = (cumulative[-1] - 1) * q
+    below = np.floor(position)
+    low = values[np.searchsorted(cumulative, below, side='right')]
+    high = values[np.searchsorted(cumulative, min(below + 1, cumulative[-1] - 1), side='right')]
+    gamma = position - below
+    return high - (high - low) * (1 - gamma) if gamma >= 0.5 else low + (high - low) * gamma
+
+
+def _weighted_median(values, counts):
+    """Median like ``np.median``: the mean of the two middle values for even counts."""
+    order = np.argsort(values)
+    values, counts = np.asarray(values, dtype=float)[order], np.asarray(counts)[order]
+    cumulative = np.cumsum(counts)
+    n = cumulative[-1]
+    low = values[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+    high = values[np.searchsorted(cumulative, n // 2, side='right')]
+    return np.mean([low, high])
+
+
+def _grouped_price_stats(table, key):
+    rows = []
+    for name, group in table.groupby(level=key):
+        prices = group.index.get_level_values('price_cleaned').to_numpy()
+        counts = group['count'].to_numpy()
+        rows.append({key: name, 'mean': (prices * counts).sum() / counts.sum(),
+                     'median': _weighted_median(prices, counts), 'count': counts.sum()})
+    return pd.DataFrame(rows).set_index(key)
+
+
+def read_aggregates(tables, listings_total):
+    """Trim bounds, room-type price stats, neighbourhood ranking, review and availability totals."""
+    prices = tables['price_reviews']
+    price_values = prices.index.to_numpy(dtype=float)
+    bounds = tuple(_weighted_quantile(price_values, prices['count'].to_numpy(), q) for q in TRIM_QUANTILES)
+
+    def trimmed(table):
+        price = table.index.get_level_values('price_cleaned')
+        return table[(price >= bounds[0]) & (price <= bounds[1])]
+
+    price_by_room = _grouped_price_stats(trimmed(tables['room_price']), 'room_type')
+    neighbourhoods = _grouped_price_stats(trimmed(tables['neighbourhood_price']), 'neighbourhood_cleansed')
+    neighbourhoods = neighbourhoods.rename(columns={'mean': 'price_cleaned'})[['price_cleaned', 'count']]
+    neighbourhoods = neighbourhoods[neighbourhoods['count'] >= MIN_NEIGHBOURHOOD_LISTINGS]
+
+    reviews = trimmed(prices)
+    availability = trimmed(tables['price_availability']).groupby(level='availability_365')['count'].sum()
+    days, counts = availability.index.to_numpy(dtype=float), availability.to_numpy()
+    return {
+        'listings': listings_total,
+        'listings_clean': int(reviews['count'].sum()),
+        'price_bounds': bounds,
+        'price_by_room': price_by_room,
+        'top_neighbourhoods': neighbourhoods.sort_values('price_cleaned', ascending=False).head(10),
+        'total_reviews': int(reviews['number_of_reviews'].sum()),
+        'listings_with_reviews': int(reviews['has_reviews'].sum()),
+        'mean_availability': (days * counts).sum() / counts.sum(),
+        'median_availability': _weighted_median(days, counts),
+        'high_availability': int(counts[days > HIGH_AVAILABILITY_DAYS].sum()),
+    }
+
+
+# ==========================================
+# SNAPSHOT STATE
+# ==========================================
+def _scrape_of(listings):
+    return {'scrape_id': int(listings['scrape_id'].max()), 'last_scraped': str(listings['last_scraped'].max())}
+
+
+def save_state(state_dir, listings, tables, meta):
+    """Write the listings and tables as Arrow IPC (Feather) files plus ``state.json``."""
+    os.makedirs(state_dir, exist_ok=True)
+    listings.reset_index().to_feather(os.path.join(state_dir, LISTINGS_FILE))
+    for name, table in tables.items():
+        table.reset_index().to_feather(os.path.join(state_dir, f'{name}.arrow'))
+    with open(os.path.join(state_dir, STATE_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_state(state_dir):
+    with open(os.path.join(state_dir, STATE_FILE)) as f:
+        meta = json.load(f)
+    listings = pd.read_feather(os.path.join(state_dir, LISTINGS_FILE)).set_index('id')
+    tables = {name: pd.read_feather(os.path.join(state_dir, f'{name}.arrow')).set_index(keys)
+              for name, (keys, _) in AGGREGATE_TABLES.items()}
+    return listings, tables, meta
+
+
+def init_state(listings_path, state_dir):
+    """Build a snapshot state from one scrape (a full computation)."""
+    listings = load_snapshot(listings_path)
+    tables = build_tables(listings)
+    meta = dict(_scrape_of(listings), source=os.path.abspath(listings_path), listings=len(listings))
+    save_state(state_dir, listings, tables, meta)
+    return listings, tables, meta
+
+
+# ==========================================
+# DIFFING
+# ==========================================
+def diff_snapshots(old, new):
+    """Match two snapshots on ``id``.
+
+    Returns a dict of id indexes: 'added', 'removed', 'changed' and
+    'unchanged'. A listing is changed when any of ``TRACKED_FIELDS``
+    differs (missing values compare equal).
+    """
+    common = old.index.intersection(new.index)
+    before, after = old.loc[common, TRACKED_FIELDS], new.loc[common, TRACKED_FIELDS]
+    differs = np.zeros(len(common), dtype=bool)
+    for column in TRACKED_FIELDS:
+        a, b = before[column], after[column]
+        differs |= ~((a == b).fillna(False).to_numpy(dtype=bool) | (a.isna() & b.isna()).to_numpy())
+    return {
+        'added': new.index.difference(old.index),
+        'removed': old.index.difference(new.index),
+        'changed': common[differs],
+        'unchanged': common[~differs],
+    }
+
+
+def change_report(old, new, diff):
+    """Per-neighbourhood listing churn and price moves of the changed listings."""
+    changed = diff['changed']
+    moves = pd.DataFrame({
+        'neighbourhood_cleansed': new.loc[changed, 'neighbourhood_cleansed'],
+        'old_price': old.loc[changed, 'price_cleaned'],
+        'new_price': new.loc[changed, 'price_cleaned'],
+    })
+    moves = moves[moves['old_price'] != moves['new_price']].dropna()
+    moves['change_pct'] = (moves['new_price'] / moves['old_price'] - 1) * 100
+
+    by_neighbourhood = moves.groupby('neighbourhood_cleansed').agg(
+        price_up=('change_pct', lambda s: int((s > 0).sum())),
+        price_down=('change_pct', lambda s: int((s < 0).sum())),
+        median_change_pct=('change_pct', 'median'),
+    )
+    added = new.loc[diff['added']].groupby('neighbourhood_cleansed').size().rename('added')
+    removed = old.loc[diff['removed']].groupby('neighbourhood_cleansed').size().rename('removed')
+    report = pd.concat([added, removed, by_neighbourhood], axis=1)
+    report[['added', 'removed', 'price_up', 'price_down']] = \
+        report[['added', 'removed', 'price_up', 'price_down']].fillna(0).astype('int64')
+    return report.sort_values(['price_up', 'price_down', 'added'], ascending=False), moves
+
+
+def update_state(listings_path, state_dir):
+    """Apply one new scrape to the state by deltas; returns the diff, change report and aggregates."""
+    old, tables, meta = load_state(state_dir)
+    new = load_snapshot(listings_path)
+    scrape = _scrape_of(new)
+    if (scrape['scrape_id'], scrape['last_scraped']) < (meta['scrape_id'], meta['last_scraped']):
+        raise ValueError(f"{listings_path} (scraped {scrape['last_scraped']}) is older than the state "
+                         f"(scraped {meta['last_scraped']})")
+
+    diff = diff_snapshots(old, new)
+    removed = pd.concat([old.loc[diff['removed']], old.loc[diff['changed']]])
+    added = pd.concat([new.loc[diff['added']], new.loc[diff['changed']]])
+    tables = apply_delta(tables, removed, added)
+
+    report, moves = change_report(old, new, diff)
+    meta = dict(scrape, source=os.path.abspath(listings_path), listings=len(new), previous=meta)
+    save_state(state_dir, new, tables, meta)
+    return {'diff': diff, 'report': report, 'moves': moves,
+            'aggregates': read_aggregates(tables, len(new)), 'meta': meta}
+
+
+# ==========================================
+# CHECK AGAINST A FULL RECOMPUTE
+# ==========================================
+def full_recompute(listings_path):
+    """The same aggregates from ``airbnb_analysis`` run on the whole file."""
+    from airbnb_analysis import availability_analysis, clean_data, pricing_analysis, review_analysis
+
+    df = load_listings(listings_path, columns=list(dict.fromkeys(ANALYSIS_COLUMNS + SNAPSHOT_COLUMNS)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_clean, cleaning = clean_data(df)
+        pricing = pricing_analysis(df_clean)
+        reviews = review_analysis(df_clean)
+        availability = availability_analysis(df_clean)
+    return {
+        'listings': cleaning['listings'],
+        'listings_clean': cleaning['listings_clean'],
+        'price_bounds': cleaning['price_bounds'],
+        'price_by_room': pricing['price_by_room'],
+        'top_neighbourhoods': pricing['top_neighbourhoods'],
+        'total_reviews': reviews['total_reviews'],
+        'listings_with_reviews': reviews['listings_with_reviews'],
+        'mean_availability': availability['mean_availability'],
+        'median_availability': availability['median_availability'],
+        'high_availability': availability['high_availability'],
+    }
+
+
+def compare_aggregates(incremental, full):
+    """Compare each aggregate; returns a DataFrame with one row per quantity and a ``match`` column.
+
+    Counts and medians must match exactly. Means may differ in the last bits
+    because they are summed in a different order (``rtol=1e-12``).
+    """
+    rows = []
+    for name, expected in full.items():
+        actual = incremental[name]
+        if isinstance(expected, pd.DataFrame):
+            expected = expected.astype(float)
+            actual = actual.reindex(expected.index)[expected.columns].astype(float)
+            match = actual.index.equals(expected.index) and np.allclose(actual, expected, rtol=1e-12, atol=0)
+        else:
+            match = np.allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float), rtol=1e-12, atol=0)
+        rows.append({'quantity': name, 'match': bool(match)})
+    return pd.DataFrame(rows).set_index('quantity')
+
+
+def print_update(result):
+    diff, aggregates = result['diff'], result['aggregates']
+    print(f"\nListings: {result['meta']['listings']:,} (scraped {result['meta']['last_scraped']}, "
+          f"previous {result['meta']['previous']['last_scraped']})")
+    for kind in ('added', 'removed', 'changed', 'unchanged'):
+        print(f"  {kind:10s} {len(diff[kind]):>8,}")
+
+    print("\nPrice moves and churn by neighbourhood:")
+    print(result['report'].head(15).round(1).to_string())
+
+    print("\nAverage Price by Room Type:")
+    print(aggregates['price_by_room'].round(2))
+    print("\nTop 10 Most Expensive Neighborhoods:")
+    print(aggregates['top_neighbourhoods'].round(2))
+    print(f"\nTotal reviews: {aggregates['total_reviews']:,.0f}")
+    print(f"Average availability (next 365 days): {aggregates['mean_availability']:.0f} days")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Incremental snapshot aggregates for monthly scrapes.')
+    parser.add_argument('command', choices=['init', 'update'])
+    parser.add_argument('listings', help='listings.csv of the scrape to start from / apply')
+    parser.add_argument('--state', default='snapshot_state', help='snapshot state directory')
+    parser.add_argument('--check', action='store_true', help='verify the result against a full recompute')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"INCREMENTAL SNAPSHOTS: {args.command} {args.listings}")
+    print("=" * 80)
+    if args.command == 'init':
+        listings, tables, meta = init_state(args.listings, args.state)
+        aggregates = read_aggregates(tables, len(listings))
+        print(f"\nState built from {meta['listings']:,} listings (scraped {meta['last_scraped']})")
+    else:
+        result = update_state(args.listings, args.state)
+        aggregates = result['aggregates']
+        print_update(result)
+    print(f"\n✓ Saved state: {args.state}")
+
+    if args.check:
+        comparison = compare_aggregates(aggregates, full_recompute(args.listings))
+        print("\nIncremental vs full recompute:")
+        print(comparison.to_string())
+        if not comparison['match'].all():
+            raise SystemExit("Incremental aggregates differ from the full recompute")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Spatial Index
+=============
+Neighbourhood comparables ("comps") from listing coordinates.
+
+Listings are placed on the unit sphere as 3D points and indexed with a
+``scipy.spatial.cKDTree``. The straight-line (chord) distance between two
+points on a sphere is a monotonic function of their great-circle distance,
+so a chord radius gives exact haversine radius queries without any
+projection or latitude-dependent error.
+
+All-listings queries run in chunks. Each chunk of query points is matched
+against the full tree in one C call and returns flat ``(i, j, metres)`` pair
+arrays. Memory therefore grows with the chunk's comp count, not with n², and
+the total cost is O(n log n + pairs).
+
+Usage:
+    python spatial.py [--listings listings.csv] [--radius 500 | --k 20] [--output comps.csv]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from ingestion import load_listings
+from prices import clean_price
+
+EARTH_RADIUS_M = 6_371_008.8
+DEFAULT_RADIUS_M = 500
+CHUNK_SIZE = 20_000
+SPATIAL_COLUMNS = ['id', 'latitude', 'longitude', 'price', 'room_type', 'neighbourhood_cleansed']
+
+
+def to_unit_vectors(latitude, longitude):
+    """Latitude/longitude in degrees -> (n, 3) points on the unit sphere."""
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.radians(np.asarray(longitude, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def metres_to_chord(metres):
+    return 2 * np.sin(np.asarray(metres, dtype=float) / (2 * EARTH_RADIUS_M))
+
+
+def chord_to_metres(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0, 1))
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres (broadcasting); used to check the index."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class SpatialIndex:
+    """KD-tree over listing coordinates with batch radius and k-nearest queries.
+
+    Query results are flat pair arrays ``(i, j, metres)``: listing ``i`` has
+    comp ``j`` at that distance. A listing is never its own comp, but two
+    listings at identical coordinates are comps of each other.
+    """
+
+    def __init__(self, latitude, longitude, leafsize=32):
+        self.points = to_unit_vectors(latitude, longitude)
+        if not np.isfinite(self.points).all():
+            raise ValueError("Coordinates contain missing or non-finite values; drop those listings first")
+        self.tree = cKDTree(self.points, leafsize=leafsize, balanced_tree=False, compact_nodes=False)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _chunks(self, chunk_size):
+        for start in range(0, len(self), chunk_size):
+            yield start, self.points[start:start + chunk_size]
+
+    def radius_pairs(self, radius_m, chunk_size=CHUNK_SIZE):
+        """Yield ``(i, j, metres)`` arrays for every pair within ``radius_m``, chunk by chunk."""
+        chord = float(metres_to_chord(radius_m))
+        for start, points in self._chunks(chunk_size):
+            pairs = cKDTree(points).sparse_distance_matrix(self.tree, chord, output_type='ndarray')
+            i = pairs['i'].astype(np.int64) + start
+            j = pairs['j'].astype(np.int64)
+            keep = i != j
+            yield i[keep], j[keep], chord_to_metres(pairs['v'][keep])
+
+    def knn_pairs(self, k, chunk_size=CHUNK_SIZE):
+        """Yield ``(i, j, metres)`` arrays for each listing's ``k`` nearest other listings."""
+        k = min(k, len(self) - 1)
+        if k < 1:
+            return
+        for start, points in self._chunks(chunk_size):
+            chord, j = self.tree.query(points, k=k + 1)
+            i = np.arange(start, start + len(points))[:, None]
+            # Drop the listing itself; when duplicates hide it from the
+            # result, drop the farthest hit instead so every row keeps k
+            is_self = j == i
+            is_self[~is_self.any(axis=1), -1] = True
+            keep = ~is_self
+            yield np.broadcast_to(i, j.shape)[keep], j[keep], chord_to_metres(chord[keep])
+
+    def nearest(self, latitude, longitude, k=1):
+        """Distances (metres) and indices of the ``k`` nearest listings to arbitrary points."""
+        chord, j = self.tree.query(to_unit_vectors(latitude, longitude), k=k)
+        return chord_to_metres(chord), j
+
+
+# ==========================================
+# COMP STATISTICS
+# ==========================================
+def _group_medians(group, values, n_groups):
+    """Median of ``values`` per ``group`` label (NaN values ignored, NaN for empty groups)."""
+    valid = ~np.isnan(values)
+    group, values = group[valid], values[valid]
+    # One integer sort on (group, rank of value) is several times faster than
+    # np.lexsort on the two keys
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[np.argsort(values)] = np.arange(len(values))
+    order = np.argsort(group * len(values) + ranks)
+    group, values = group[order], values[order]
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    medians = np.full(n_groups, np.nan)
+    has = counts > 0
+    low = starts[has] + (counts[has] - 1) // 2
+    high = starts[has] + counts[has] // 2
+    medians[has] = (values[low] + values[high]) / 2
+    return medians
+
+
+def comp_stats(index, price, room_type, radius_m=DEFAULT_RADIUS_M, k=None, chunk_size=CHUNK_SIZE):
+    """Per-listing comp statistics from a radius (default) or k-nearest query.
+
+    Returns a DataFrame aligned with the indexed listings:
+
+    - ``comp_count``: comps found
+    - ``comp_median_price``: median comp price (comps without a price are skipped)
+    - ``comp_median_price_same_room``: the same, restricted to the listing's room type
+    - ``comp_median_distance_m``: median distance to the comps
+    - ``comps[<room type>]``: comp count per room type
+    """
+    n = len(index)
+    price = np.asarray(price, dtype=float)
+    room_codes, room_labels = pd.factorize(pd.Series(room_type), use_na_sentinel=False)
+    n_rooms = len(room_labels)
+
+    # Pairs from every chunk; chunks cover disjoint listings, so per-listing
+    # statistics can be computed chunk by chunk and concatenated.
+    pairs = index.knn_pairs(k, chunk_size) if k else index.radius_pairs(radius_m, chunk_size)
+    room_counts = np.zeros((n, n_rooms), dtype=np.int64)
+    median_price = np.full(n, np.nan)
+    median_same = np.full(n, np.nan)
+    median_distance = np.full(n, np.nan)
+    for i, j, metres in pairs:
+        if not len(i):
+            continue
+        lo, hi = i.min(), i.max() + 1
+        local = i - lo
+        room_counts[lo:hi] += np.bincount(local * n_rooms + room_codes[j],
+                                          minlength=(hi - lo) * n_rooms).reshape(hi - lo, n_rooms)
+        median_price[lo:hi] = _group_medians(local, price[j], hi - lo)
+        same = room_codes[i] == room_codes[j]
+        median_same[lo:hi] = _group_medians(local[same], price[j][same], hi - lo)
+        median_distance[lo:hi] = _group_medians(local, metres, hi - lo)
+
+    stats = pd.DataFrame({
+        'comp_count': room_counts.sum(axis=1),
+        'comp_median_price': median_price,
+        'comp_median_price_same_room': median_same,
+        'comp_median_distance_m': median_distance,
+    })
+    for code, label in enumerate(room_labels):
+        stats[f'comps[{label}]'] = room_counts[:, code]
+    return stats
+
+
+def listing_comps(df, radius_m=DEFAULT_RADIUS_M, k=None, price_col='price_cleaned'):
+    """Comp statistics for a listings frame with latitude/longitude, indexed like ``df``.
+
+    Listings without coordinates get no comps and are not anyone's comp.
+    """
+    located = df.dropna(subset=['latitude', 'longitude'])
+    index = SpatialIndex(located['latitude'], located['longitude'])
+    stats = comp_stats(index, located[price_col], located['room_type'], radius_m=radius_m, k=k)
+    stats.index = located.index
+    return stats.reindex(df.index)
+
+
+# ==========================================
+# GEO JOINS
+# ==========================================
+def neighbourhood_centroids(df):
+    """Mean coordinates and listing count per ``neighbourhood_cleansed``."""
+    return (df.groupby('neighbourhood_cleansed')
+              .agg(latitude=('latitude', 'mean'), longitude=('longitude', 'mean'), listings=('id', 'size')))
+
+
+def assign_neighbourhoods(df, latitude, longitude, k=5, neighbourhoods_path=None):
+    """Label arbitrary points with the most common neighbourhood of their ``k`` nearest listings.
+
+    ``neighbourhoods_path`` (Inside Airbnb ``neighbourhoods.csv``) adds the
+    ``neighbourhood_group`` of each assigned neighbourhood.
+    """
+    located = df.dropna(subset=['latitude', 'longitude'])
+    index = SpatialIndex(located['latitude'], located['longitude'])
+    k = min(k, len(index))
+    metres, j = index.nearest(latitude, longitude, k=k)
+    metres, j = metres.reshape(len(metres), -1), j.reshape(len(j), -1)
+
+    codes, labels = pd.factorize(located['neighbourhood_cleansed'])
+    votes = codes[j]
+    counts = np.zeros((len(votes), len(labels)), dtype=np.int64)
+    np.add.at(counts, (np.arange(len(votes))[:, None], votes), 1)
+    # Ties go to the neighbourhood of the nearest listing among the tied ones
+    nearest_vote = np.zeros_like(counts)
+    nearest_vote[np.arange(len(votes))[:, None], votes[:, ::-1]] = np.arange(1, k + 1)
+    best = np.argmax(counts * (k + 1) + nearest_vote, axis=1)
+
+    result = pd.DataFrame({'neighbourhood': labels[best], 'nearest_listing_m': metres[:, 0],
+                           'votes': counts[np.arange(len(best)), best]})
+    if neighbourhoods_path:
+        groups = pd.read_csv(neighbourhoods_path).set_index('neighbourhood')['neighbourhood_group']
+        result['neighbourhood_group'] = result['neighbourhood'].map(groups)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-listing neighbourhood comps from a spatial index.')
+    parser.add_argument('--listings', default='listings.csv')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--radius', type=float, default=DEFAULT_RADIUS_M, help='comp radius in metres')
+    group.add_argument('--k', type=int, default=None, help='use the k nearest listings instead of a radius')
+    parser.add_argument('--output', default=None, help='write the per-listing comps to this CSV')
+    args = parser.parse_args(argv)
+
+    df = load_listings(args.listings, columns=SPATIAL_COLUMNS)
+    df['price_cleaned'] = clean_price(df['price'])
+    # Same 1%/99% trim as the main analysis, but trimmed listings stay in the
+    # index: they still count as comps, their price is just not used
+    q1, q99 = df['price_cleaned'].quantile([0.01, 0.99])
+    df['price_cleaned'] = df['price_cleaned'].where(df['price_cleaned'].between(q1, q99))
+    stats = listing_comps(df, radius_m=args.radius, k=args.k)
+    comps = pd.concat([df[['id', 'room_type', 'neighbourhood_cleansed', 'price_cleaned']], stats], axis=1)
+
+    print("=" * 80)
+    print(f"NEIGHBOURHOOD COMPS ({f'{args.k} nearest' if args.k else f'within {args.radius:.0f} m'})")
+    print("=" * 80)
+    print(f"\nListings: {len(comps):,}")
+    print(f"Median comps per listing: {comps['comp_count'].median():.0f}")
+    print(f"Listings without comps: {(comps['comp_count'] == 0).sum():,}")
+    print("\nPrice vs comp median by room type:")
+    premium = (comps['price_cleaned'] / comps['comp_median_price_same_room'] - 1) * 100
+    print(premium.groupby(comps['room_type']).median().round(1).rename('median premium %').to_string())
+    print("\nNeighbourhoods with the most expensive comps:")
+    print(comps.groupby('neighbourhood_cleansed')['comp_median_price'].median()
+               .sort_values(ascending=False).head(10).round(0).to_string())
+
+    neighbourhoods_path = os.path.join(os.path.dirname(os.path.abspath(args.listings)), 'neighbourhoods.csv')
+    if os.path.exists(neighbourhoods_path):
+        centroids = neighbourhood_centroids(df)
+        joined = assign_neighbourhoods(df, centroids['latitude'], centroids['longitude'],
+                                       neighbourhoods_path=neighbourhoods_path)
+        agree = (joined['neighbourhood'].to_numpy() == centroids.index.to_numpy()).mean() * 100
+        print(f"\nNeighbourhood centroids assigned back to their own neighbourhood: {agree:.0f}%")
+
+    if args.output:
+        comps.to_csv(args.output, index=False)
+        print(f"\n✓ Saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,465 @@
+"""
+Streaming Airbnb Analysis
+=========================
+Out-of-core version of sections 1-6 and 8 of ``airbnb_analysis.py``.
+
+Listings files are read in chunks and reduced into mergeable partial
+aggregates: counts and sums per group, plus t-digest sketches for the
+quantiles (outlier trim bounds and medians), and the shared correlation
+engine's co-moments and bootstrap sums. Memory stays bounded by the
+number of distinct groups, not the number of listings, so the same report
+can be produced for multi-GB, multi-city dumps.
+
+Two passes are made over the input: the first sketches the price
+distribution to find the 1%/99% trim bounds, the second aggregates the
+trimmed listings.
+
+Usage:
+    python streaming.py listings.csv [other_city.csv ...] [--chunksize N] [--check]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from airbnb_analysis import CORRELATION_FEATURES, CORRELATION_RESAMPLES, CORRELATION_SEED, dollars
+from analysis_core.correlation import (BootstrapCorrelation, CorrelationAccumulator, print_target_correlations,
+                                       target_correlations)
+from ingestion import ANALYSIS_COLUMNS, read_listings_csv
+from prices import clean_price
+
+DEFAULT_CHUNKSIZE = 200_000
+DEFAULT_COMPRESSION = 500
+TRIM_QUANTILES = (0.01, 0.99)
+
+
+# ==========================================
+# QUANTILE SKETCH
+# ==========================================
+class TDigest:
+    """Mergeable t-digest quantile sketch (merging variant, NumPy-vectorized).
+
+    Centroids are re-clustered in a single sorted pass using the k1 scale
+    function, which keeps clusters small in the tails where the trim bounds
+    live and larger around the median. ``compression`` bounds the number of
+    centroids to roughly ``compression / 2``.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(values, np.ones(len(values)))
+        return self
+
+    def merge(self, other):
+        if len(other.means) == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other.means, other.weights)
+        return self
+
+    def _compress(self, means, weights):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        bucket = np.floor(k - k.min()).astype(np.int64)
+
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(bucket)) + 1])
+        bucket_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(weights * means, starts) / bucket_weights
+        self.weights = bucket_weights
+
+    def quantile(self, q):
+        """Estimate the ``q`` quantile(s) of everything seen so far."""
+        q = np.asarray(q, dtype=float)
+        if len(self.means) == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        result = np.interp(q * total, positions, values)
+        return result if q.ndim else float(result)
+
+    def median(self):
+        return self.quantile(0.5)
+
+
+# ==========================================
+# PARTIAL AGGREGATES
+# ==========================================
+def _add_counts(total, part):
+    return part if total is None else total.add(part, fill_value=0)
+
+
+def _price_stats(frame, key):
+    return frame.groupby(key)['price_cleaned'].agg(['count', 'sum'])
+
+
+class ListingAggregates:
+    """Mergeable partial aggregates for the trimmed listings of sections 1-6.
+
+    Older scrapes lack some columns (e.g. ``review_scores_rating`` or
+    ``bedrooms``); their accumulators are skipped and ``columns`` records
+    the columns seen, so the report leaves those figures out.
+    """
+
+    SCALARS = [
+        'n', 'price_sum', 'reviews_sum', 'reviews_positive', 'reviews_10plus',
+        'rating_n', 'rating_sum', 'availability_sum', 'availability_300plus',
+        'minimum_nights_sum', 'entire_home',
+    ]
+    DIGESTS = ['price', 'rating', 'availability', 'minimum_nights']
+    GROUPS = {
+        'room_type': 'room_type',
+        'bedrooms': 'bedrooms',
+        'accommodates': 'accommodates',
+        'neighbourhood': 'neighbourhood_cleansed',
+        'superhost': 'host_is_superhost',
+    }
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, n_resamples=CORRELATION_RESAMPLES, seed=None):
+        """``seed`` drives the bootstrap weights; give every process its own seed when merging."""
+        self.compression = compression
+        self.n_raw = 0
+        self.n_chunks = 0
+        self.columns = set()
+        self.price_min = np.inf
+        self.price_max = -np.inf
+        self.scalars = dict.fromkeys(self.SCALARS, 0.0)
+        self.digests = {name: TDigest(compression) for name in self.DIGESTS}
+        self.room_digests = {}
+        self.groups = dict.fromkeys(self.GROUPS)
+        self.property_counts = None
+        self.correlation = CorrelationAccumulator(CORRELATION_FEATURES)
+        self.bootstrap = BootstrapCorrelation('price_cleaned', CORRELATION_FEATURES[1:], n_resamples, seed)
+
+    def update(self, chunk, n_raw=None):
+        """Fold one already-cleaned and trimmed chunk into the aggregates."""
+        self.n_raw += len(chunk) if n_raw is None else n_raw
+        self.n_chunks += 1
+        if len(chunk) == 0:
+            return self
+
+        self.columns.update(chunk.columns)
+        price = chunk['price_cleaned'].to_numpy(dtype=float)
+        self.price_min = min(self.price_min, price.min())
+        self.price_max = max(self.price_max, price.max())
+
+        s = self.scalars
+        s['n'] += len(chunk)
+        s['price_sum'] += price.sum()
+        s['entire_home'] += (chunk['room_type'] == 'Entire home/apt').sum()
+        self.digests['price'].update(price)
+        if 'number_of_reviews' in chunk:
+            reviews = chunk['number_of_reviews'].to_numpy(dtype=float)
+            s['reviews_sum'] += np.nansum(reviews)
+            s['reviews_positive'] += (reviews > 0).sum()
+            s['reviews_10plus'] += (reviews >= 10).sum()
+        if 'review_scores_rating' in chunk:
+            rating = chunk['review_scores_rating'].to_numpy(dtype=float)
+            s['rating_n'] += (~np.isnan(rating)).sum()
+            s['rating_sum'] += np.nansum(rating)
+            self.digests['rating'].update(rating)
+        if 'availability_365' in chunk:
+            availability = chunk['availability_365'].to_numpy(dtype=float)
+            s['availability_sum'] += availability.sum()
+            s['availability_300plus'] += (availability > 300).sum()
+            self.digests['availability'].update(availability)
+        if 'minimum_nights' in chunk:
+            minimum_nights = chunk['minimum_nights'].to_numpy(dtype=float)
+            s['minimum_nights_sum'] += minimum_nights.sum()
+            self.digests['minimum_nights'].update(minimum_nights)
+
+        # Absent features enter the correlation engine as missing values, i.e. no pairs
+        correlated = chunk.reindex(columns=CORRELATION_FEATURES)
+        self.correlation.update(correlated)
+        self.bootstrap.update(correlated)
+
+        for room_type, prices in chunk.groupby('room_type')['price_cleaned']:
+            digest = self.room_digests.setdefault(room_type, TDigest(self.compression))
+            digest.update(prices.to_numpy(dtype=float))
+
+        for name, column in self.GROUPS.items():
+            if column in chunk:
+                self.groups[name] = _add_counts(self.groups[name], _price_stats(chunk, column))
+        self.property_counts = _add_counts(self.property_counts, chunk['property_type'].value_counts())
+        return self
+
+    def merge(self, other):
+        """Combine with aggregates built from another chunk, file or process."""
+        self.n_raw += other.n_raw
+        self.n_chunks += other.n_chunks
+        self.columns |= other.columns
+        self.price_min = min(self.price_min, other.price_min)
+        self.price_max = max(self.price_max, other.price_max)
+        for key in self.SCALARS:
+            self.scalars[key] += other.scalars[key]
+        for name in self.DIGESTS:
+            self.digests[name].merge(other.digests[name])
+        for room_type, digest in other.room_digests.items():
+            self.room_digests.setdefault(room_type, TDigest(self.compression)).merge(digest)
+        for name in self.GROUPS:
+            if other.groups[name] is not None:
+                self.groups[name] = _add_counts(self.groups[name], other.groups[name])
+        if other.property_counts is not None:
+            self.property_counts = _add_counts(self.property_counts, other.property_counts)
+        self.correlation.merge(other.correlation)
+        self.bootstrap.merge(other.bootstrap)
+        return self
+
+    def reviews_price_pairs(self):
+        columns = self.correlation.columns
+        return self.correlation.n[columns.index('number_of_reviews'), columns.index('price_cleaned')]
+
+    def reviews_price_corr(self):
+        return self.correlation.correlation().loc['number_of_reviews', 'price_cleaned']
+
+
+# ==========================================
+# STREAMING PASSES
+# ==========================================
+def iter_chunks(paths, columns, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield typed, column-projected chunks from one or more listings files."""
+    for path in paths:
+        for chunk in read_listings_csv(path, columns, chunksize=chunksize):
+            yield chunk
+
+
+def sketch_prices(paths, chunksize=DEFAULT_CHUNKSIZE, compression=DEFAULT_COMPRESSION):
+    """First pass: sketch the raw price distribution across all inputs."""
+    digest = TDigest(compression)
+    for chunk in iter_chunks(paths, ['price'], chunksize):
+        digest.update(clean_price(chunk['price']))
+    return digest
+
+
+def aggregate_listings(paths, bounds, chunksize=DEFAULT_CHUNKSIZE, compression=DEFAULT_COMPRESSION,
+                       seed=CORRELATION_SEED):
+    """Second pass: aggregate the listings whose price lies within ``bounds``."""
+    low, high = bounds
+    aggregates = ListingAggregates(compression, seed=seed)
+    for chunk in iter_chunks(paths, ANALYSIS_COLUMNS, chunksize):
+        chunk['price_cleaned'] = clean_price(chunk['price'])
+        trimmed = chunk[(chunk['price_cleaned'] >= low) & (chunk['price_cleaned'] <= high)]
+        aggregates.update(trimmed, n_raw=len(chunk))
+    return aggregates
+
+
+def run_streaming(paths, chunksize=DEFAULT_CHUNKSIZE, compression=DEFAULT_COMPRESSION):
+    """Run both passes and return ``(bounds, aggregates)``."""
+    if isinstance(paths, str):
+        paths = [paths]
+    bounds = tuple(sketch_prices(paths, chunksize, compression).quantile(list(TRIM_QUANTILES)))
+    return bounds, aggregate_listings(paths, bounds, chunksize, compression)
+
+
+# ==========================================
+# REPORT
+# ==========================================
+def _ranked_counts(counts):
+    return counts.astype(int).sort_values(ascending=False, kind='stable').rename('count')
+
+
+def print_report(aggregates):
+    """Print sections 1-6 and 8 in the same layout as ``airbnb_analysis.py``."""
+    agg = aggregates
+    s = agg.scalars
+    n = s['n']
+
+    print("\n1. DATA CLEANING")
+    print("-" * 80)
+    print(f"Original dataset: {agg.n_raw} listings (streamed in {agg.n_chunks} chunks)")
+    print(f"After cleaning: {n:.0f} listings")
+    print(f"Price range: ${agg.price_min:.2f} - ${agg.price_max:.2f}")
+    print(f"Average price: ${s['price_sum'] / n:.2f}")
+    print(f"Median price: ${agg.digests['price'].median():.2f}")
+
+    print("\n2. MARKET OVERVIEW")
+    print("-" * 80)
+    room_counts = _ranked_counts(agg.groups['room_type']['count'])
+    print("\nRoom Type Distribution:")
+    print(room_counts)
+    print("\nRoom Type Percentages:")
+    print((room_counts / n * 100).round(2))
+    print("\nTop 10 Property Types:")
+    print(_ranked_counts(agg.property_counts).head(10))
+    if agg.groups['neighbourhood'] is not None:
+        print("\nTop 10 Neighborhoods by Listings:")
+        print(_ranked_counts(agg.groups['neighbourhood']['count']).head(10))
+
+    print("\n3. PRICING ANALYSIS")
+    print("-" * 80)
+    room = agg.groups['room_type']
+    price_by_room = pd.DataFrame({
+        'mean': room['sum'] / room['count'],
+        'median': pd.Series({k: d.median() for k, d in agg.room_digests.items()}),
+        'count': room['count'].astype(int),
+    }).rename_axis('room_type')
+    print("\nAverage Price by Room Type:")
+    print(price_by_room.round(2))
+
+    bedrooms = agg.groups['bedrooms']
+    if bedrooms is not None and len(bedrooms):
+        print("\nAverage Price by Number of Bedrooms:")
+        print((bedrooms['sum'] / bedrooms['count']).rename('price_cleaned').sort_index().head(8).round(2))
+
+    accommodates = agg.groups['accommodates']
+    print("\nAverage Price by Guest Capacity:")
+    print((accommodates['sum'] / accommodates['count']).rename('price_cleaned').sort_index().head(10).round(2))
+
+    neighbourhoods = agg.groups['neighbourhood']
+    if neighbourhoods is not None:
+        expensive = pd.DataFrame({
+            'price_cleaned': neighbourhoods['sum'] / neighbourhoods['count'],
+            'count': neighbourhoods['count'].astype(int),
+        })
+        expensive = expensive[expensive['count'] >= 5]
+        print("\nTop 10 Most Expensive Neighborhoods:")
+        print(expensive.sort_values('price_cleaned', ascending=False).head(10).round(2))
+
+    print("\n4. REVIEW & RATING ANALYSIS")
+    print("-" * 80)
+    if 'number_of_reviews' in agg.columns:
+        print(f"\nTotal reviews: {s['reviews_sum']:,.0f}")
+        print(f"Listings with reviews: {s['reviews_positive']:.0f} ({s['reviews_positive'] / n * 100:.1f}%)")
+    if s['rating_n'] > 0:
+        print(f"\nAverage rating: {s['rating_sum'] / s['rating_n']:.2f} / 5.0")
+        print(f"Median rating: {agg.digests['rating'].median():.2f} / 5.0")
+        if agg.reviews_price_pairs() > 10:
+            print(f"\nCorrelation between reviews and price: {agg.reviews_price_corr():.3f}")
+
+    print("\n5. HOST ANALYSIS")
+    print("-" * 80)
+    if agg.groups['superhost'] is not None:
+        # A market may have no superhosts, or only superhosts
+        superhost = agg.groups['superhost'].reindex(['t', 'f'])
+        n_super = superhost['count'].fillna(0)['t']
+        price = superhost['sum'] / superhost['count']
+        print(f"\nSuperhosts: {n_super:.0f} ({n_super / n * 100:.1f}%)")
+        print(f"Superhost average price: {dollars(price['t'])}")
+        print(f"Regular host average price: {dollars(price['f'])}")
+
+    print("\n6. AVAILABILITY ANALYSIS")
+    print("-" * 80)
+    if 'availability_365' in agg.columns:
+        print(f"\nAverage availability (next 365 days): {s['availability_sum'] / n:.0f} days")
+        print(f"Median availability: {agg.digests['availability'].median():.0f} days")
+        print(f"\nListings available >300 days/year: {s['availability_300plus']:.0f} ({s['availability_300plus'] / n * 100:.1f}%)")
+    if 'minimum_nights' in agg.columns:
+        print(f"\nAverage minimum nights: {s['minimum_nights_sum'] / n:.1f}")
+        print(f"Median minimum nights: {agg.digests['minimum_nights'].median():.0f}")
+
+    print("\n8. CORRELATION ANALYSIS")
+    print("-" * 80)
+    print(f"\nTop correlations with Price ({agg.bootstrap.n_resamples} bootstrap resamples):")
+    table = target_correlations(agg.correlation, agg.bootstrap)
+    print_target_correlations(table[table.index.isin(agg.columns)])
+
+
+# ==========================================
+# ACCURACY CHECK
+# ==========================================
+def compare_with_exact(paths, chunksize=DEFAULT_CHUNKSIZE, compression=DEFAULT_COMPRESSION):
+    """Compare the sketched quantiles against exact in-memory pandas results.
+
+    Returns a DataFrame with the approximate and exact value of each
+    quantile, the absolute error and the rank error (the fraction of the data
+    lying between the two values), which is the error t-digest bounds.
+    Only meant for inputs that still fit in memory.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    raw_digest = sketch_prices(paths, chunksize, compression)
+    bounds = tuple(raw_digest.quantile(list(TRIM_QUANTILES)))
+    agg = aggregate_listings(paths, bounds, chunksize, compression)
+
+    df = pd.concat([read_listings_csv(path) for path in paths], ignore_index=True)
+    df['price_cleaned'] = clean_price(df['price'])
+    q_low = df['price_cleaned'].quantile(TRIM_QUANTILES[0])
+    q_high = df['price_cleaned'].quantile(TRIM_QUANTILES[1])
+    df_clean = df[(df['price_cleaned'] >= q_low) & (df['price_cleaned'] <= q_high)]
+
+    checks = [
+        ('price q01 (raw)', bounds[0], q_low, df['price_cleaned']),
+        ('price q99 (raw)', bounds[1], q_high, df['price_cleaned']),
+        ('median price', agg.digests['price'].median(), df_clean['price_cleaned'].median(), df_clean['price_cleaned']),
+    ]
+    for name, column in [('rating', 'review_scores_rating'), ('availability', 'availability_365'),
+                         ('minimum_nights', 'minimum_nights')]:
+        if column in df_clean.columns:
+            checks.append((f"median {name.replace('_', ' ')}", agg.digests[name].median(), df_clean[column].median(),
+                           df_clean[column]))
+    for room_type, prices in df_clean.groupby('room_type')['price_cleaned']:
+        if room_type in agg.room_digests:
+            checks.append((f'median price [{room_type}]', agg.room_digests[room_type].median(), prices.median(), prices))
+
+    rows = []
+    for name, approx, exact, values in checks:
+        values = values.dropna().to_numpy(dtype=float)
+        low, high = sorted([approx, exact])
+        rank_error = ((values > low) & (values < high)).mean() if len(values) else np.nan
+        rows.append({'quantity': name, 'approx': approx, 'exact': exact,
+                     'abs_error': abs(approx - exact), 'rank_error': rank_error})
+
+    # Streamed correlations are exact for the rows they see; any drift comes
+    # from the sketched trim bounds selecting slightly different rows
+    features = [feature for feature in CORRELATION_FEATURES if feature in df_clean.columns]
+    exact_corr = df_clean[features].corr()['price_cleaned']
+    streamed_corr = agg.correlation.correlation()['price_cleaned']
+    for feature in features[1:]:
+        rows.append({'quantity': f'corr({feature}, price)', 'approx': streamed_corr[feature],
+                     'exact': exact_corr[feature], 'abs_error': abs(streamed_corr[feature] - exact_corr[feature]),
+                     'rank_error': np.nan})
+    return pd.DataFrame(rows).set_index('quantity')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Streaming (out-of-core) Airbnb market analysis, sections 1-6 and 8.')
+    parser.add_argument('paths', nargs='+', help='listings.csv files (several cities are merged)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows per chunk')
+    parser.add_argument('--compression', type=int, default=DEFAULT_COMPRESSION, help='t-digest compression')
+    parser.add_argument('--check', action='store_true',
+                        help='also compare the sketched quantiles with exact pandas results (in memory)')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("AIRBNB MARKET ANALYSIS (STREAMING)")
+    print("=" * 80)
+    bounds, aggregates = run_streaming(args.paths, args.chunksize, args.compression)
+    print(f"\nTrim bounds (1%/99%, sketched): ${bounds[0]:.2f} - ${bounds[1]:.2f}")
+    print_report(aggregates)
+
+    if args.check:
+        print("\nQUANTILE SKETCH DRIFT VS EXACT PANDAS")
+        print("-" * 80)
+        print(compare_with_exact(args.paths, args.chunksize, args.compression).round(4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Synthetic Listings
+==================
+Schema-faithful synthetic Inside Airbnb ``listings.csv`` files of any size.
+
+Rows are drawn with replacement from the bundled ``listings.csv``, so every
+column keeps its real format, its joint distribution with the other columns
+(room type vs price vs capacity, ...) and its null pattern. Each drawn row is
+then made into a new listing:
+
+- fresh ``id`` and ``listing_url``
+- a host id that stays shared by the listings drawn from the same host in
+  the same copy of the source
+- coordinates jittered by a few hundred metres
+- price scaled by log-normal noise and re-formatted like the source
+  (``$1,234.00``)
+
+Files are written in chunks, through pyarrow's CSV writer when it is
+installed, so 10M rows need no more memory than one chunk. Each chunk has its
+own seeded generator, so a file depends only on ``(rows, seed)``.
+
+Usage:
+    python synthetic_listings.py --rows 1M [--output benchmark_data/listings-1000000.csv] [--seed 42]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.benchmarking import parse_size
+from prices import clean_price
+
+SOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'listings.csv')
+CHUNK_ROWS = 250_000
+COORDINATE_JITTER = 0.003                     # degrees, about 300 m
+PRICE_NOISE = 0.15                            # sigma of the log-normal price factor
+HOST_COPIES = 1_000_000                       # host ids: source host id * HOST_COPIES + copy number
+# Long free text, blanked by --drop-text to keep big files small
+FREE_TEXT_COLUMNS = ['description', 'neighborhood_overview', 'host_about']
+
+
+def load_source(path=SOURCE_FILE):
+    """The seed listings as raw strings (empty string for a missing value)."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def generate_listings(source, rows, start=0, seed=42, drop_text=False):
+    """Synthetic listings ``start .. start + rows - 1`` drawn from ``source``.
+
+    Parameters
+    ----------
+    source : DataFrame
+        Seed listings from ``load_source``.
+    rows : int
+        Number of listings to generate.
+    start : int
+        Position of the first listing in the whole file; ids are ``start + 1``
+        onwards.
+    seed : int
+        Seed shared by all chunks of one file.
+    drop_text : bool
+        Blank the long free-text columns.
+    """
+    rng = np.random.default_rng([seed, start])
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+
+    position = np.arange(start, start + rows)
+    ids = pd.Series(position + 1).astype(str)
+    df['id'] = ids
+    df['listing_url'] = 'https://www.airbnb.com/rooms/' + ids
+    if 'host_id' in df.columns:
+        copy = position // len(source)
+        host_id = pd.to_numeric(df['host_id']).to_numpy() * HOST_COPIES + copy
+        df['host_id'] = host_id.astype(str)
+        df['host_url'] = 'https://www.airbnb.com/users/show/' + df['host_id']
+
+    for column in ['latitude', 'longitude']:
+        values = pd.to_numeric(df[column]).to_numpy() + rng.normal(0, COORDINATE_JITTER, rows)
+        df[column] = pd.Series(values).map('{:.6f}'.format)
+
+    price = clean_price(df['price'].replace('', None)).to_numpy() * rng.lognormal(0, PRICE_NOISE, rows)
+    df['price'] = pd.Series(np.round(price)).map(lambda value: '' if np.isnan(value) else f'${value:,.2f}')
+
+    if drop_text:
+        for column in FREE_TEXT_COLUMNS:
+            if column in df.columns:
+                df[column] = ''
+    return df
+
+
+def _write_chunks(path, chunks):
+    """Write DataFrame chunks to one CSV, through pyarrow's CSV writer when available."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for number, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=number == 0, lineterminator='\n')
+        return
+
+    # About 15x faster than DataFrame.to_csv. Strings are always quoted, which
+    # parses back to the same frame; missing values are written as empty fields.
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk.replace('', None), preserve_index=False)
+            if writer is None:
+                schema = pa.schema([pa.field(name, pa.string()) for name in table.column_names])
+                writer = pa_csv.CSVWriter(path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_listings(path, rows, seed=42, source_path=SOURCE_FILE, drop_text=False, chunk_rows=CHUNK_ROWS):
+    """Write ``rows`` synthetic listings to ``path`` chunk by chunk."""
+    source = load_source(source_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    chunks = (generate_listings(source, min(chunk_rows, rows - start), start, seed, drop_text)
+              for start in range(0, rows, chunk_rows))
+    _write_chunks(tmp_path, chunks)
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_path(data_dir, rows, seed=42, drop_text=False):
+    suffix = '-notext' if drop_text else ''
+    return os.path.join(data_dir, f'listings-{rows}-s{seed}{suffix}.csv')
+
+
+def ensure_listings(data_dir, rows, seed=42, drop_text=False):
+    """Path of a synthetic file with these parameters, generating it if missing."""
+    path = synthetic_path(data_dir, rows, seed, drop_text)
+    if not os.path.exists(path):
+        write_listings(path, rows, seed, drop_text=drop_text)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Inside Airbnb listings.csv.')
+    parser.add_argument('--rows', type=parse_size, default=parse_size('10k'), help='e.g. 10k, 1M, 10M')
+    parser.add_argument('--output', default=None, help='default: benchmark_data/listings-<rows>-s<seed>.csv')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--drop-text', action='store_true', help='blank description, neighborhood_overview, host_about')
+    args = parser.parse_args(argv)
+
+    output = args.output or synthetic_path('benchmark_data', args.rows, args.seed, args.drop_text)
+    write_listings(output, args.rows, args.seed, drop_text=args.drop_text)
+    print(f"✓ Saved: {output} ({args.rows:,} listings, {os.path.getsize(output) / 2 ** 20:,.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
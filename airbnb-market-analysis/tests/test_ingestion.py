@@ -0,0 +1,28 @@
+"""Loading files that lack optional columns, through the columnar cache."""
+
+import os
+
+import pandas as pd
+
+import ingestion
+from ingestion import ANALYSIS_COLUMNS, load_listings
+
+LISTINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'listings.csv')
+OPTIONAL = ['review_scores_rating', 'neighbourhood_cleansed', 'bedrooms']
+
+
+def test_absent_columns_are_skipped_and_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / 'listings.csv')
+    pd.read_csv(LISTINGS, dtype=str).drop(columns=OPTIONAL).to_csv(path, index=False)
+    parses = []
+    read_csv = ingestion.read_listings_csv
+    monkeypatch.setattr(ingestion, 'read_listings_csv', lambda *args: parses.append(args) or read_csv(*args))
+
+    first = load_listings(path)
+    expected = [column for column in ANALYSIS_COLUMNS if column not in OPTIONAL]
+    assert list(first.columns) == expected
+    assert len(parses) == 1
+
+    second = load_listings(path)
+    assert len(parses) == 1, 'absent columns should not force a re-parse'
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,23 @@
+"""Price cleaning of unlabeled amounts and numeric columns."""
+
+import numpy as np
+import pandas as pd
+
+from prices import clean_price, parse_prices
+
+
+def test_unlabeled_amounts_default_to_dollars():
+    values = pd.Series(['100', '12.5', '5', '$1,200.00', None, 'n/a'], name='price')
+    cleaned = clean_price(values)
+    np.testing.assert_array_equal(cleaned.to_numpy(), [100.0, 12.5, 5.0, 1200.0, np.nan, np.nan])
+    assert cleaned.name == 'price'
+    # parse_prices itself still rejects them unless a currency is given
+    assert parse_prices(values.iloc[:2])['rejected'].all()
+
+
+def test_numeric_prices_pass_through():
+    values = pd.Series([100, 12.5, np.nan, 1000.125], index=[3, 5, 7, 9], name='price')
+    cleaned = clean_price(values)
+    pd.testing.assert_series_equal(cleaned, values.astype(float))
+    converted = clean_price(values, reference_currency='EUR', rates={'USD': 1.0, 'EUR': 1.25})
+    np.testing.assert_allclose(converted.to_numpy(), values.to_numpy() * 0.8)
@@ -0,0 +1,30 @@
+"""The price model fits on the features a listings file has."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from airbnb_analysis import SECTIONS, run_analysis
+from pricing_model import FACTOR_LABELS
+
+LISTINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'listings.csv')
+ABSENT = ['bedrooms', 'review_scores_rating']
+
+
+@pytest.fixture
+def older_scrape(tmp_path):
+    path = tmp_path / 'listings.csv'
+    pd.read_csv(LISTINGS, dtype=str, keep_default_na=False).drop(columns=ABSENT).to_csv(path, index=False)
+    return str(path)
+
+
+def test_model_leaves_out_absent_features(older_scrape, tmp_path):
+    sections = [name for name in SECTIONS if name != 'plots']
+    results = run_analysis(older_scrape, str(tmp_path), sections)
+    model = results['model']
+    assert not set(ABSENT) & set(model.features)
+    assert not set(ABSENT) & set(model.groups)
+    assert set(results['findings']['pricing_factors'].index) == set(FACTOR_LABELS) - set(ABSENT)
+    # Scoring reads only the fitted features
+    assert len(model.predict(pd.read_csv(older_scrape))) > 0
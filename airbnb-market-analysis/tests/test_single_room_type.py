@@ -0,0 +1,27 @@
+"""A market with a single room type and no superhosts keeps those columns and runs every section."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from airbnb_analysis import SECTIONS, run_analysis
+
+LISTINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'listings.csv')
+ROOM_TYPE = 'Entire home/apt'
+
+
+@pytest.fixture
+def single_room_type(tmp_path):
+    path = tmp_path / 'listings.csv'
+    df = pd.read_csv(LISTINGS, dtype=str, keep_default_na=False)
+    df = df[df['room_type'] == ROOM_TYPE].assign(host_is_superhost='f')
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_sections_run_on_single_room_type(single_room_type, tmp_path):
+    sections = [name for name in SECTIONS if name != 'plots']
+    results = run_analysis(single_room_type, str(tmp_path), sections)
+    assert list(results['market']['room_types'].index) == [ROOM_TYPE]
+    assert results['hosts']['superhosts'] == 0
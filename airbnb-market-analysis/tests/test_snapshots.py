@@ -0,0 +1,71 @@
+"""Incremental snapshot updates must reproduce a full recompute of the new scrape."""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from snapshots import compare_aggregates, full_recompute, init_state, update_state
+
+LISTINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'listings.csv')
+
+
+def next_scrape(path, seed=0):
+    """Next month's scrape of ``path``: some listings removed, some added, some re-priced."""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = df.drop(index=rng.choice(df.index, 60, replace=False)).reset_index(drop=True)
+
+    repriced = rng.choice(df.index, 150, replace=False)
+    prices = df.loc[repriced, 'price'].str.replace(r'[$,]', '', regex=True)
+    factor = rng.choice([0.8, 0.95, 1.1, 1.25], len(repriced))
+    df.loc[repriced, 'price'] = [f'${float(price) * f:,.2f}' if price else '' for price, f in zip(prices, factor)]
+    moved = rng.choice(df.index, 40, replace=False)
+    df.loc[moved, 'availability_365'] = rng.integers(0, 366, len(moved)).astype(str)
+    df.loc[moved, 'number_of_reviews'] = (df.loc[moved, 'number_of_reviews'].astype(int) + 3).astype(str)
+
+    added = df.sample(45, random_state=seed).copy()
+    added['id'] = [str(int(df['id'].astype('int64').max()) + i + 1) for i in range(len(added))]
+    added['room_type'] = rng.choice(df['room_type'].unique(), len(added))
+    df = pd.concat([df, added], ignore_index=True)
+
+    df['scrape_id'] = str(int(df['scrape_id'].max()) + 1)
+    df['last_scraped'] = '2024-07-25'
+    return df
+
+
+@pytest.fixture
+def scrapes(tmp_path):
+    first = tmp_path / 'june' / 'listings.csv'
+    second = tmp_path / 'july' / 'listings.csv'
+    first.parent.mkdir()
+    second.parent.mkdir()
+    shutil.copy(LISTINGS, first)
+    next_scrape(LISTINGS).to_csv(second, index=False)
+    return str(first), str(second), str(tmp_path / 'state')
+
+
+def test_update_matches_full_recompute(scrapes):
+    first, second, state = scrapes
+    init_state(first, state)
+    result = update_state(second, state)
+
+    diff = result['diff']
+    assert len(diff['removed']) == 60
+    assert len(diff['added']) == 45
+    assert len(diff['changed']) > 0
+
+    comparison = compare_aggregates(result['aggregates'], full_recompute(second))
+    for quantity in ['price_bounds', 'price_by_room', 'top_neighbourhoods', 'total_reviews',
+                     'listings_with_reviews', 'mean_availability', 'median_availability', 'high_availability']:
+        assert comparison.loc[quantity, 'match'], quantity
+    assert comparison['match'].all()
+
+
+def test_update_rejects_older_scrape(scrapes):
+    first, second, state = scrapes
+    init_state(second, state)
+    with pytest.raises(ValueError, match='older than the state'):
+        update_state(first, state)
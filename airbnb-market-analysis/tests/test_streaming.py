@@ -0,0 +1,101 @@
+"""The t-digest quantiles of the streaming analysis stay within rank- and abs-error bounds of exact pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestion import read_listings_csv
+from prices import clean_price
+from streaming import (TRIM_QUANTILES, TDigest, aggregate_listings, compare_with_exact, print_report, run_streaming,
+                       sketch_prices)
+from synthetic_listings import write_listings
+
+ROWS_PER_CITY = 10_000
+# Fraction of the data allowed between the sketched and the exact value
+BOUND_RANK_ERROR = 0.002
+MEDIAN_RANK_ERROR = 0.005
+# Medians sit where the data is dense, so their values must be close too:
+# within 1%, or within half a step for small integer columns (minimum
+# nights), where the sketch interpolates between neighbouring centroids
+MEDIAN_REL_ERROR = 0.01
+MEDIAN_ABS_ERROR = 0.5
+
+
+@pytest.fixture(scope='module')
+def cities(tmp_path_factory):
+    """Two synthetic cities, streamed together as one market."""
+    folder = tmp_path_factory.mktemp('cities')
+    return [write_listings(str(folder / f'city_{seed}.csv'), ROWS_PER_CITY, seed=seed, drop_text=True)
+            for seed in (1, 2)]
+
+
+def _exact_prices(paths):
+    df = pd.concat([read_listings_csv(path) for path in paths], ignore_index=True)
+    df['price_cleaned'] = clean_price(df['price'])
+    return df
+
+
+def _rank_error(values, approx, exact):
+    values = values[~np.isnan(values)]
+    low, high = sorted([approx, exact])
+    return ((values > low) & (values < high)).mean()
+
+
+@pytest.mark.parametrize('chunksize', [700, 5_000, 100_000])
+def test_quantiles_within_bounds(cities, chunksize):
+    result = compare_with_exact(cities, chunksize=chunksize)
+
+    bounds = result.loc[['price q01 (raw)', 'price q99 (raw)']]
+    assert (bounds['rank_error'] <= BOUND_RANK_ERROR).all(), bounds
+
+    medians = result[result.index.str.startswith('median')]
+    assert (medians['rank_error'] <= MEDIAN_RANK_ERROR).all(), medians
+    allowed = np.maximum(MEDIAN_REL_ERROR * medians['exact'].abs(), MEDIAN_ABS_ERROR)
+    assert (medians['abs_error'] <= allowed).all(), medians
+
+
+def test_merged_digests_within_bounds(cities):
+    """Digests built per chunk and per city, then merged, match exact quantiles as well as one digest."""
+    df = _exact_prices(cities)
+    prices = df['price_cleaned'].to_numpy(dtype=float)
+
+    merged = TDigest()
+    for part in np.array_split(prices, 40):
+        merged.merge(TDigest().update(part))
+    assert merged.count == np.count_nonzero(~np.isnan(prices))
+    for q in TRIM_QUANTILES:
+        exact = np.nanquantile(prices, q)
+        assert _rank_error(prices, merged.quantile(q), exact) <= BOUND_RANK_ERROR
+        assert _rank_error(prices, sketch_prices(cities).quantile(q), exact) <= BOUND_RANK_ERROR
+
+    # Per-city aggregates merged as a multi-process run would merge them
+    low, high = (np.nanquantile(prices, q) for q in TRIM_QUANTILES)
+    per_city = [aggregate_listings([path], (low, high), chunksize=3_000) for path in cities]
+    combined = per_city[0].merge(per_city[1])
+    clean = df[(df['price_cleaned'] >= low) & (df['price_cleaned'] <= high)]
+    assert combined.scalars['n'] == len(clean)
+    for name, column in [('price', 'price_cleaned'), ('availability', 'availability_365'),
+                         ('rating', 'review_scores_rating'), ('minimum_nights', 'minimum_nights')]:
+        values = clean[column].to_numpy(dtype=float)
+        approx, exact = combined.digests[name].median(), np.nanmedian(values)
+        assert _rank_error(values, approx, exact) <= MEDIAN_RANK_ERROR, name
+        assert abs(approx - exact) <= max(MEDIAN_REL_ERROR * abs(exact), MEDIAN_ABS_ERROR), name
+    for room_type, values in clean.groupby('room_type')['price_cleaned']:
+        approx, exact = combined.room_digests[room_type].median(), values.median()
+        assert _rank_error(values.to_numpy(dtype=float), approx, exact) <= MEDIAN_RANK_ERROR, room_type
+
+
+def test_report_without_optional_columns(tmp_path, capsys):
+    """Older scrapes without ratings or availability, and a market without superhosts, still report."""
+    path = str(tmp_path / 'listings.csv')
+    df = pd.read_csv(write_listings(path, 2_000, seed=3, drop_text=True), dtype=str, keep_default_na=False)
+    df = df.drop(columns=['review_scores_rating', 'availability_365', 'bedrooms']).assign(host_is_superhost='f')
+    df.to_csv(path, index=False)
+
+    bounds, agg = run_streaming(path, chunksize=700)
+    print_report(agg)
+    report = capsys.readouterr().out
+    assert 'Superhost average price: n/a' in report
+    assert 'Average rating' not in report and 'Average availability' not in report
+    assert 'Average minimum nights' in report
+    assert agg.digests['rating'].count == 0
@@ -0,0 +1,466 @@
+"""
+Listing Text Index
+==================
+Inverted index over listing ``name``, ``description`` and
+``neighborhood_overview`` for keyword-driven price questions ("price of
+listings mentioning canal or parking").
+
+The three fields are tokenized in one vectorized pass:
+
+- joined per listing and lowercased, with HTML tags (``<br />``) removed
+  (Arrow compute)
+- split into runs of word characters (letters, digits, combining marks)
+  with numpy, over the UTF-8 bytes of the whole column
+
+The distinct tokens are then accent-folded (``café`` -> ``cafe``) and
+dictionary-encoded into term ids. Tokens shorter than ``MIN_TOKEN_LENGTH``
+are dropped. The result is a binary listing x term matrix. Its CSC form is
+the inverted index: the rows stored for term ``t``,
+``indices[indptr[t]:indptr[t + 1]]``, are the sorted posting list of the
+listings mentioning ``t``. The index is built once per snapshot and cached as
+``.npz`` beside the listings cache, keyed on the file's content hash.
+
+Queries are boolean keyword expressions:
+
+- ``canal parking``: implicit AND
+- ``canal OR parking`` and ``beach AND NOT party``
+- ``(canal OR harbour) AND view``, with parentheses
+- ``park*``: prefix match, found by binary search in the sorted vocabulary
+
+Operators are upper case. A quoted phrase matches listings containing all of
+its words; positions are not stored. Posting lists are combined with sorted
+set operations, so a query costs time in proportion to its posting lists,
+not to the amount of text.
+
+``query_prices`` joins the matches to prices and room types. ``term_lift``
+computes the price premium of every term from the same matrix with
+``amenities.amenity_premiums``, without rescanning the text.
+
+Usage:
+    python text_index.py [--listings listings.csv] --query "canal OR parking" [--query "beach AND NOT party"]
+    python text_index.py --top 20 --min-count 20          # term price lift only
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import re
+import unicodedata
+from itertools import groupby
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from amenities import amenity_premiums
+from ingestion import CACHE_DIRNAME, file_hash, load_listings, read_listings_csv
+from prices import clean_price
+
+TEXT_FIELDS = ['name', 'description', 'neighborhood_overview']
+MIN_TOKEN_LENGTH = 2
+MIN_COUNT = 20
+TAG_PATTERN = r'<[^>]*>'
+OPERATORS = {'AND', 'OR', 'NOT', '(', ')'}
+_ASCII_WORD = np.zeros(256, dtype=bool)
+_ASCII_WORD[[ord(char) for char in 'abcdefghijklmnopqrstuvwxyz0123456789']] = True
+
+
+# ==========================================
+# TOKENIZING
+# ==========================================
+def normalize_term(text):
+    """Lowercase and accent-fold ``text`` the way the index does."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _is_word_char(char):
+    """Letters, digits and combining marks (so accented words stay whole)."""
+    return unicodedata.category(char)[0] in 'LNM'
+
+
+def _tokenize(text):
+    """Tokens of one string (query words, and the fallback without pyarrow)."""
+    text = re.sub(TAG_PATTERN, ' ', text.lower())
+    tokens = (normalize_term(''.join(chars)) for is_word, chars in groupby(text, _is_word_char) if is_word)
+    return [token for token in tokens if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def _word_bytes(data):
+    """Mask of the UTF-8 bytes in ``data`` that belong to a word character.
+
+    ASCII bytes go through a lookup table. Multi-byte characters are rare in
+    listing text, so each distinct one is classified once with ``unicodedata``.
+    """
+    word = _ASCII_WORD[data]
+    lead = np.flatnonzero(data >= 0xC0)
+    if len(lead):
+        width = 2 + (data[lead] >= 0xE0) + (data[lead] >= 0xF0)
+        key = np.zeros(len(lead), dtype=np.uint32)
+        for k in range(4):
+            has = k < width
+            key[has] |= data[lead[has] + k].astype(np.uint32) << (8 * (3 - k))
+        chars, inverse = np.unique(key, return_inverse=True)
+        is_word = np.array([_is_word_char(int(char).to_bytes(4, 'big').rstrip(b'\0').decode('utf-8', 'replace'))
+                            for char in chars])
+        positions = np.repeat(lead, width) + np.arange(width.sum()) - np.repeat(np.cumsum(width) - width, width)
+        word[positions] = np.repeat(is_word[inverse], width)
+    return word
+
+
+def _split_tokens(texts):
+    """Tokenize every row of ``texts``.
+
+    Returns ``(rows, tokens)``: the row of every token and the tokens, folded
+    but not yet filtered by length (see ``_encode``).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        lists = texts.fillna('').map(_tokenize)
+        return np.repeat(np.arange(len(lists)), lists.str.len()), list(lists.explode().dropna())
+
+    array = pa.array(texts, type=pa.large_string(), from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):   # Arrow-backed pandas strings
+        array = array.combine_chunks()
+    array = pc.replace_substring_regex(pc.utf8_lower(array.fill_null('')), TAG_PATTERN, ' ')
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    data = np.frombuffer(array.buffers()[2], dtype=np.uint8)[:offsets[-1]]
+
+    # A token is a run of word bytes; runs never cross a row boundary
+    word = _word_bytes(data)
+    row_start = np.zeros(len(data) + 1, dtype=bool)
+    row_start[offsets] = True
+    before = np.concatenate([[False], word[:-1]]) & ~row_start[:-1]
+    after = np.concatenate([word[1:], [False]]) & ~row_start[1:]
+    starts, ends = np.flatnonzero(word & ~before), np.flatnonzero(word & ~after) + 1
+    token_offsets = np.concatenate([[0], np.cumsum(ends - starts)])
+    tokens = pa.LargeStringArray.from_buffers(len(starts), pa.py_buffer(token_offsets),
+                                              pa.py_buffer(np.ascontiguousarray(data[word])))
+    return np.searchsorted(offsets, starts, side='right') - 1, tokens
+
+
+def _encode(tokens):
+    """Term id of every token (-1 when too short) and the sorted vocabulary.
+
+    Accent folding runs on the distinct tokens only, and ``café``/``cafe``
+    then share one term.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    if pa is not None and isinstance(tokens, pa.Array):
+        encoded = tokens.dictionary_encode()
+        codes, distinct = np.asarray(encoded.indices), encoded.dictionary.to_pylist()
+    else:
+        codes, distinct = pd.factorize(pd.Series(tokens, dtype=object))
+    folded = np.array([normalize_term(token) for token in distinct], dtype=object)
+    folded[np.array([len(term) < MIN_TOKEN_LENGTH for term in folded], dtype=bool)] = None
+    term_codes, vocabulary = pd.factorize(folded, sort=True, use_na_sentinel=True)
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.int64), pd.Index(vocabulary, dtype=object)
+    return term_codes[codes], pd.Index(vocabulary, dtype=object)
+
+
+def joined_text(df, fields=TEXT_FIELDS):
+    """The text fields of each listing joined into one string."""
+    fields = [field for field in fields if field in df.columns]
+    text = df[fields[0]].fillna('').astype(str)
+    for field in fields[1:]:
+        text = text + ' ' + df[field].fillna('').astype(str)
+    return text
+
+
+# ==========================================
+# INDEX
+# ==========================================
+class TextIndex:
+    """Listing x term incidence stored by term (CSC), i.e. one posting list per term.
+
+    Parameters
+    ----------
+    ids : array of int
+        Listing id of every row.
+    postings : scipy.sparse.csc_matrix
+        Binary listing x term matrix.
+    vocabulary : Index
+        Sorted terms, one per column.
+    """
+
+    def __init__(self, ids, postings, vocabulary):
+        self.ids = np.asarray(ids)
+        self.postings = sparse.csc_matrix(postings)
+        self.vocabulary = pd.Index(vocabulary)
+
+    @classmethod
+    def build(cls, ids, texts):
+        """Index ``texts`` (one string per listing, see ``joined_text``)."""
+        texts = pd.Series(texts).reset_index(drop=True)
+        rows, tokens = _split_tokens(texts)
+        codes, vocabulary = _encode(tokens)
+        keep = codes >= 0
+        rows, codes = rows[keep], codes[keep]
+        matrix = sparse.csc_matrix((np.ones(len(codes), dtype=np.float64), (rows, codes)),
+                                   shape=(len(texts), len(vocabulary)))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0                     # a term counts once per listing
+        return cls(ids, matrix, vocabulary)
+
+    # Persistence ------------------------------------------------------
+    def save(self, path):
+        tmp_file = path + '.tmp.npz'
+        np.savez(tmp_file, ids=self.ids, indices=self.postings.indices, indptr=self.postings.indptr,
+                 shape=np.array(self.postings.shape), vocabulary=np.array(self.vocabulary, dtype=str))
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as cached:
+            indices = cached['indices']
+            postings = sparse.csc_matrix((np.ones(len(indices)), indices, cached['indptr']),
+                                         shape=tuple(cached['shape']))
+            return cls(cached['ids'], postings, pd.Index(cached['vocabulary']))
+
+    # Lookup -----------------------------------------------------------
+    def posting_list(self, term):
+        """Sorted rows of the listings mentioning ``term`` (empty if unknown)."""
+        column = self.vocabulary.get_indexer([term])[0]
+        if column < 0:
+            return np.empty(0, dtype=self.postings.indices.dtype)
+        return self.postings.indices[self.postings.indptr[column]:self.postings.indptr[column + 1]]
+
+    def prefix_rows(self, prefix):
+        """Rows mentioning any term starting with ``prefix``."""
+        start = self.vocabulary.searchsorted(prefix, side='left')
+        stop = self.vocabulary.searchsorted(prefix + '\U0010ffff', side='left')
+        if start == stop:
+            return np.empty(0, dtype=self.postings.indices.dtype)
+        block = self.postings.indices[self.postings.indptr[start]:self.postings.indptr[stop]]
+        return np.unique(block)
+
+    def document_frequency(self):
+        return pd.Series(np.diff(self.postings.indptr), index=self.vocabulary, name='listings')
+
+    def search(self, query):
+        """Rows matching a boolean keyword query (see the module docstring)."""
+        return _QueryParser(query, self).parse()
+
+    def search_ids(self, query):
+        return self.ids[self.search(query)]
+
+    def matrix(self, rows=None):
+        """Listing x term CSR matrix, optionally restricted to (and ordered by) ``rows``."""
+        matrix = self.postings.tocsr()
+        return matrix if rows is None else matrix[rows]
+
+
+class _QueryParser:
+    """Recursive-descent evaluation of a query over posting lists.
+
+    Grammar: ``or := and ('OR' and)*``, ``and := not (['AND'] not)*``,
+    ``not := 'NOT' not | atom``, ``atom := '(' or ')' | word | prefix*``.
+    """
+
+    def __init__(self, query, index):
+        self.index = index
+        self.tokens = re.findall(r'\(|\)|"[^"]*"|[^\s()"]+', query)
+        self.position = 0
+        self.all_rows = None
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty query")
+        rows = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._peek()!r} in query")
+        return rows
+
+    def _or(self):
+        rows = self._and()
+        while self._peek() == 'OR':
+            self._take()
+            rows = np.union1d(rows, self._and())
+        return rows
+
+    def _and(self):
+        rows = self._not()
+        while self._peek() not in (None, 'OR', ')'):
+            if self._peek() == 'AND':
+                self._take()
+            rows = np.intersect1d(rows, self._not(), assume_unique=True)
+        return rows
+
+    def _not(self):
+        if self._peek() == 'NOT':
+            self._take()
+            if self.all_rows is None:
+                self.all_rows = np.arange(self.index.postings.shape[0])
+            return np.setdiff1d(self.all_rows, self._not(), assume_unique=True)
+        return self._atom()
+
+    def _atom(self):
+        token = self._take()
+        if token is None:
+            raise ValueError("Query ends where a word was expected")
+        if token == '(':
+            rows = self._or()
+            if self._take() != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            return rows
+        if token in OPERATORS:
+            raise ValueError(f"Unexpected {token!r} in query")
+        if token.endswith('*') and len(token) > 1:
+            return self.index.prefix_rows(normalize_term(token[:-1]))
+        words = _tokenize(token.strip('"'))
+        if not words:
+            raise ValueError(f"{token!r} has no indexable word (at least {MIN_TOKEN_LENGTH} letters or digits)")
+        rows = self.index.posting_list(words[0])
+        for word in words[1:]:
+            rows = np.intersect1d(rows, self.index.posting_list(word), assume_unique=True)
+        return rows
+
+
+# ==========================================
+# CACHE
+# ==========================================
+def _index_cache_path(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{file_hash(path, cache_dir)}-text.npz')
+
+
+def load_text_index(path='listings.csv', cache_dir=None, use_cache=True, rebuild=False):
+    """The ``TextIndex`` of a listings file, through the ``.npz`` cache.
+
+    ``rebuild`` ignores a cached index but still saves the new one.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    if use_cache:
+        # The content hash is memoised in the cache directory
+        os.makedirs(cache_dir, exist_ok=True)
+    cache_file = _index_cache_path(path, cache_dir) if use_cache else None
+    if cache_file and not rebuild and os.path.exists(cache_file):
+        return TextIndex.load(cache_file)
+
+    df = read_listings_csv(path, ['id'] + TEXT_FIELDS)
+    index = TextIndex.build(df['id'].to_numpy(), joined_text(df))
+    if cache_file:
+        index.save(cache_file)
+    return index
+
+
+# ==========================================
+# PRICE QUERIES
+# ==========================================
+def _geometric_premium(with_prices, without_prices):
+    with_prices, without_prices = with_prices[with_prices > 0], without_prices[without_prices > 0]
+    if not len(with_prices) or not len(without_prices):
+        return np.nan
+    return np.expm1(np.log(with_prices).mean() - np.log(without_prices).mean()) * 100
+
+
+def query_prices(index, df_clean, query):
+    """Price and room-type aggregates of the cleaned listings matching ``query``.
+
+    Returns a dict with the match count and share, mean/median price with and
+    without a match, the geometric-mean premium in percent and a per-room-type
+    table (``by_room_type``).
+    """
+    matched = df_clean['id'].isin(index.search_ids(query)).to_numpy()
+    price = df_clean['price_cleaned'].to_numpy(dtype=float)
+    with_prices, without_prices = price[matched], price[~matched]
+    by_room = (df_clean.assign(match=np.where(matched, 'match', 'rest'))
+               .groupby(['room_type', 'match'], observed=True)['price_cleaned']
+               .agg(['count', 'mean', 'median']).unstack('match'))
+    by_room['count'] = by_room['count'].fillna(0).astype(int)
+    return {
+        'query': query,
+        'listings': int(matched.sum()),
+        'share_pct': matched.mean() * 100 if len(matched) else np.nan,
+        'mean_price': with_prices.mean() if len(with_prices) else np.nan,
+        'median_price': np.median(with_prices) if len(with_prices) else np.nan,
+        'mean_price_rest': without_prices.mean() if len(without_prices) else np.nan,
+        'median_price_rest': np.median(without_prices) if len(without_prices) else np.nan,
+        'premium_pct': _geometric_premium(with_prices, without_prices),
+        'by_room_type': by_room,
+    }
+
+
+def term_lift(index, df_clean):
+    """Price premium of every indexed term over the cleaned listings.
+
+    Same columns as ``amenities.amenity_premiums`` (count, share, mean price
+    with and without the term, geometric-mean ``premium_pct``), indexed by term.
+    """
+    rows = pd.Index(index.ids).get_indexer(df_clean['id'])
+    if (rows < 0).any():
+        raise ValueError("Some cleaned listings are missing from the text index")
+    table = amenity_premiums(index.matrix(rows), index.vocabulary, df_clean['price_cleaned'].to_numpy())
+    return table.rename_axis('term')
+
+
+def print_query(result):
+    print(f"\nQuery: {result['query']}")
+    print(f"  Matching listings: {result['listings']:,} ({result['share_pct']:.1f}%)")
+    if result['listings']:
+        print(f"  Price: mean ${result['mean_price']:.2f}, median ${result['median_price']:.2f} "
+              f"(other listings: mean ${result['mean_price_rest']:.2f}, median ${result['median_price_rest']:.2f})")
+        print(f"  Premium (geometric mean): {result['premium_pct']:+.1f}%")
+        print(result['by_room_type'].round(1).to_string())
+
+
+def print_term_lift(lift, min_count=MIN_COUNT, top=20):
+    columns = ['count', 'share_pct', 'mean_with', 'mean_without', 'premium_pct']
+    common = lift[(lift['count'] >= min_count) & (lift['count'] <= lift['count'].max() - min_count)]
+    print(f"\nTerms on at least {min_count} listings (and missing from at least {min_count}): {len(common):,} "
+          f"of {len(lift):,}")
+    print(f"\nTop {top} terms by price lift (geometric mean, %):")
+    print(common.sort_values('premium_pct', ascending=False)[columns].head(top).round(1).to_string())
+    print(f"\nBottom {top} terms by price lift:")
+    print(common.sort_values('premium_pct')[columns].head(top).round(1).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Keyword price queries over an inverted index of listing text.')
+    parser.add_argument('--listings', default='listings.csv')
+    parser.add_argument('--query', action='append', default=[], help='boolean keyword query (repeatable)')
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT, help='minimum listings with and without a term')
+    parser.add_argument('--top', type=int, default=20, help='terms listed in the price lift tables')
+    parser.add_argument('--rebuild', action='store_true', help='rebuild the index even if it is cached')
+    args = parser.parse_args(argv)
+
+    df = load_listings(args.listings, columns=['id', 'price', 'room_type'])
+    df['price_cleaned'] = clean_price(df['price'])
+    # Same 1%/99% trim as the main analysis
+    q1, q99 = df['price_cleaned'].quantile([0.01, 0.99])
+    df_clean = df[df['price_cleaned'].between(q1, q99)]
+
+    print("=" * 80)
+    print("LISTING TEXT INDEX")
+    print("=" * 80)
+    index = load_text_index(args.listings, rebuild=args.rebuild)
+    print(f"\nListings: {len(index.ids):,}, distinct terms: {len(index.vocabulary):,}, "
+          f"postings: {index.postings.nnz:,}")
+    for query in args.query:
+        try:
+            result = query_prices(index, df_clean, query)
+        except ValueError as error:
+            parser.error(f"--query {query!r}: {error}")
+        print_query(result)
+    print_term_lift(term_lift(index, df_clean), args.min_count, args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+"""
+Analysis Core
+=============
+Infrastructure shared by the portfolio analyses (rendering, correlation, ...).
+
+The analysis scripts live in hyphenated project folders, so they put the
+repository root on ``sys.path`` before importing this package.
+"""
@@ -0,0 +1,267 @@
+"""
+Association Engine
+==================
+Association of every pair of columns in a mixed-type frame, numeric and
+categorical alike, as one square matrix:
+
+- numeric x numeric: Pearson or Spearman correlation (signed, -1 to 1)
+- numeric x categorical: correlation ratio eta, the share of the numeric
+  column's spread explained by the categories (0 to 1; its square is the
+  R^2 of a one-way ANOVA)
+- categorical x categorical: Cramer's V with Bergsma's bias correction,
+  which keeps the many-level columns of a small sample from looking
+  associated by chance (0 to 1)
+
+Numeric columns are centred once and every correlation comes from matrix
+products of whole column blocks. Categorical columns are integer-coded once
+with ``pd.factorize``. The level counts, sums and sums of squares behind the
+correlation ratio come from one product of the one-hot levels of a block of
+categorical columns with a block of numeric columns. The contingency tables
+are built with ``np.bincount`` over combined integer keys: one call gives
+the tables of a categorical column against a whole block of categorical
+columns. No ``crosstab`` or ``groupby`` runs per pair.
+
+The columns are split into blocks of ``BLOCK_COLUMNS``, and each pair of
+blocks is one job. With ``workers`` the jobs run on a thread pool; the
+threads share the encoded arrays, and NumPy releases the GIL in the matrix
+products and the counting. Missing values are left out per pair, as in
+``DataFrame.corr()``. Spearman ranks each column once over its own values,
+so with missing values it can differ slightly from ``corr('spearman')``,
+which re-ranks the rows of every pair. Categorical columns with more than
+``max_levels`` levels (identifiers, free text) are left out of the matrix.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .significance import split_columns
+
+METHODS = ['pearson', 'spearman']
+DEFAULT_MAX_LEVELS = 100
+BLOCK_COLUMNS = 64                            # columns per block; each pair of blocks is one job
+# Rows per bincount are chosen so the integer keys stay around this many cells
+BLOCK_CELLS = 1 << 22
+MEASURE_LABELS = {'pearson': 'Pearson r', 'spearman': 'Spearman rho', 'eta': 'correlation ratio',
+                  'cramers_v': "Cramer's V"}
+
+
+# ==========================================
+# ENCODING
+# ==========================================
+def _numeric_values(frame):
+    """Centred values with missing entries as 0, the 0/1 presence matrix and whether nothing is missing."""
+    values = frame.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    with np.errstate(invalid='ignore'):
+        centre = np.nan_to_num(np.nanmean(np.where(present, values, np.nan), axis=0))
+    return np.where(present, values - centre, 0.0), present.astype(float), bool(present.all())
+
+
+def _category_codes(frame):
+    """Integer codes (-1 = missing) of each column, rows x columns, and each column's level count."""
+    codes = np.empty(frame.shape, dtype=np.int64)
+    levels = np.empty(frame.shape[1], dtype=np.int64)
+    for position, column in enumerate(frame.columns):
+        codes[:, position], uniques = pd.factorize(frame[column])
+        levels[position] = len(uniques)
+    return codes, levels
+
+
+def _row_chunks(n_rows, width):
+    step = max(1, BLOCK_CELLS // max(width, 1))
+    return [slice(start, min(start + step, n_rows)) for start in range(0, n_rows, step)]
+
+
+# ==========================================
+# MEASURES
+# ==========================================
+def _correlation_block(values, present, complete, a, b):
+    """Pairwise-complete correlations between the numeric column blocks ``a`` and ``b``."""
+    xa, xb = values[:, a], values[:, b]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if complete:
+            scale = np.sqrt(np.outer((xa ** 2).sum(axis=0), (xb ** 2).sum(axis=0)))
+            return np.clip(xa.T @ xb / scale, -1, 1)
+        ma, mb = present[:, a], present[:, b]
+        n = ma.T @ mb
+        sa, sb = xa.T @ mb, ma.T @ xb
+        cov = xa.T @ xb - sa * sb / n
+        var_a = (xa ** 2).T @ mb - sa ** 2 / n
+        var_b = ma.T @ (xb ** 2) - sb ** 2 / n
+        r = np.clip(cov / np.sqrt(var_a * var_b), -1, 1)
+    return np.where(n >= 2, r, np.nan)
+
+
+def _ratio_block(values, present, codes, levels, a, b):
+    """Correlation ratios of the numeric block ``a`` (rows) against the categorical block ``b`` (columns)."""
+    xa, ma = values[:, a], present[:, a]
+    offsets = np.concatenate([[0], np.cumsum(levels[b])])
+    # Level counts, sums and sums of squares of every numeric column, all levels of ``b`` stacked
+    count, total, square = (np.zeros((offsets[-1], len(a))) for _ in range(3))
+    for rows in _row_chunks(len(xa), offsets[-1]):
+        code = codes[rows][:, b]
+        row, column = np.nonzero(code >= 0)
+        onehot = np.zeros((len(code), offsets[-1]))
+        onehot[row, offsets[column] + code[row, column]] = 1.0
+        count += onehot.T @ ma[rows]
+        total += onehot.T @ xa[rows]
+        square += onehot.T @ xa[rows] ** 2
+    result = np.full((len(a), len(b)), np.nan)
+    for position, (first, last) in enumerate(zip(offsets[:-1], offsets[1:])):
+        c, t = count[first:last], total[first:last]
+        n, s = c.sum(axis=0), t.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            between = np.where(c > 0, t ** 2 / c, 0.0).sum(axis=0) - s ** 2 / n
+            spread = square[first:last].sum(axis=0) - s ** 2 / n
+            eta = np.sqrt(np.clip(between / spread, 0, 1))
+        result[:, position] = np.where((n >= 2) & (spread > 0), eta, np.nan)
+    return result
+
+
+def cramers_v(tables, bias_corrected=True):
+    """Cramer's V of a stack of contingency tables (pairs x rows x columns; empty rows/columns ignored).
+
+    With ``bias_corrected`` applies Bergsma (2013): phi^2 is reduced by its
+    expected value under independence and the table dimensions are shrunk
+    accordingly.
+    """
+    tables = np.asarray(tables, dtype=float)
+    n = tables.sum(axis=(1, 2))
+    rows, columns = tables.sum(axis=2), tables.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected = rows[:, :, None] * columns[:, None, :] / n[:, None, None]
+        chi2 = np.where(expected > 0, (tables - expected) ** 2 / expected, 0.0).sum(axis=(1, 2))
+        r, k = (rows > 0).sum(axis=1), (columns > 0).sum(axis=1)
+        phi2 = chi2 / n
+        if bias_corrected:
+            phi2 = np.maximum(0, phi2 - (k - 1) * (r - 1) / (n - 1))
+            r = r - (r - 1) ** 2 / (n - 1)
+            k = k - (k - 1) ** 2 / (n - 1)
+        dof = np.minimum(r, k) - 1
+        v = np.sqrt(np.clip(phi2 / dof, 0, 1))
+    return np.where((dof > 0) & (n >= 2), v, np.nan)
+
+
+def _cramers_block(codes, levels, a, b, bias_corrected=True):
+    """Cramer's V of the categorical block ``a`` (rows) against the categorical block ``b`` (columns)."""
+    width, k = len(b), levels[b].max(initial=1)
+    cb = codes[:, b]
+    result = np.full((len(a), width), np.nan)
+    for position, column in enumerate(a):
+        r = levels[column]
+        size = width * r * k                    # one padded r x k table per column of ``b``
+        counts = np.zeros(size + 1)
+        for rows in _row_chunks(len(cb), width):
+            ca, other = codes[rows, column, None], cb[rows]
+            keys = np.arange(width) * (r * k) + ca * k + other
+            keys = np.where((ca < 0) | (other < 0), size, keys)      # missing either -> spare bin
+            counts += np.bincount(keys.ravel(), minlength=size + 1)
+        result[position] = cramers_v(counts[:-1].reshape(width, r, k), bias_corrected)
+    return result
+
+
+# ==========================================
+# MATRIX
+# ==========================================
+def _blocks(positions):
+    return [positions[start:start + BLOCK_COLUMNS] for start in range(0, len(positions), BLOCK_COLUMNS)]
+
+
+def association_matrix(df, columns=None, method='pearson', categorical=(), max_levels=DEFAULT_MAX_LEVELS,
+                       bias_corrected=True, workers=1):
+    """Association of every pair of columns of ``df``.
+
+    Parameters
+    ----------
+    df : DataFrame
+    columns : list of str, optional
+        Columns to relate (all by default). Strings, categoricals and
+        booleans are categorical, other columns numeric.
+    method : {'pearson', 'spearman'}
+        Correlation of numeric pairs.
+    categorical : iterable of str
+        Numeric columns to treat as categorical (e.g. integer codes).
+    max_levels : int
+        Categorical columns with more levels are left out.
+    bias_corrected : bool
+        Bergsma's correction of Cramer's V.
+    workers : int
+        Threads sharing the column-block jobs; ``0`` or ``1`` runs here.
+
+    Returns
+    -------
+    (DataFrame, Series)
+        The symmetric matrix (1 on the diagonal, NaN where a pair has too
+        few rows or a constant column) and each column's kind,
+        'numeric' or 'categorical'.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    numeric, categories = split_columns(df, columns)
+    forced = set(categorical)
+    categories = [column for column in list(df.columns if columns is None else columns)
+                  if column in categories or column in forced]
+    numeric = [column for column in numeric if column not in categories]
+
+    codes, levels = _category_codes(df[categories])
+    kept = levels <= max_levels
+    codes, levels = codes[:, kept], levels[kept]
+    categories = [column for column, keep in zip(categories, kept) if keep]
+    values, present, complete = _numeric_values(df[numeric])
+    # Spearman correlates the ranks; the correlation ratio always uses the values
+    ranked = _numeric_values(df[numeric].rank())[0] if method == 'spearman' else values
+
+    p, q = len(numeric), len(categories)
+    matrix = np.full((p + q, p + q), np.nan)
+    jobs = []
+    numeric_blocks, category_blocks = _blocks(np.arange(p)), _blocks(np.arange(q))
+    for i, a in enumerate(numeric_blocks):
+        for b in numeric_blocks[i:]:
+            jobs.append((a, b, lambda a=a, b=b: _correlation_block(ranked, present, complete, a, b)))
+        for b in category_blocks:
+            jobs.append((a, p + b, lambda a=a, b=b: _ratio_block(values, present, codes, levels, a, b)))
+    for i, a in enumerate(category_blocks):
+        for b in category_blocks[i:]:
+            jobs.append((p + a, p + b, lambda a=a, b=b: _cramers_block(codes, levels, a, b, bias_corrected)))
+
+    workers = min(workers or 1, len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        blocks = [job() for _, _, job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(lambda job: job[2](), jobs))
+    for (rows, cols, _), block in zip(jobs, blocks):
+        matrix[np.ix_(rows, cols)] = block
+        matrix[np.ix_(cols, rows)] = block.T
+    np.fill_diagonal(matrix, 1.0)
+
+    names = numeric + categories
+    kinds = pd.Series(['numeric'] * p + ['categorical'] * q, index=names, name='kind')
+    return pd.DataFrame(matrix, index=names, columns=names), kinds
+
+
+def measure(kind_a, kind_b, method='pearson'):
+    """Name of the measure relating columns of these kinds ('pearson', 'eta', 'cramers_v', ...)."""
+    if kind_a == kind_b == 'numeric':
+        return method
+    return 'eta' if 'numeric' in (kind_a, kind_b) else 'cramers_v'
+
+
+def target_associations(matrix, kinds, target, method='pearson'):
+    """Every column's association with ``target`` and its measure, strongest first."""
+    values = matrix[target].drop(target)
+    table = pd.DataFrame({'association': values, 'abs_association': values.abs(),
+                          'measure': [measure(kinds[target], kinds[column], method) for column in values.index]})
+    return table.sort_values('abs_association', ascending=False)
+
+
+def print_target_associations(table):
+    print(f"{'':28s} {'assoc':>7s}   measure")
+    for name, row in table.iterrows():
+        print(f"{name:28s} {row['association']:7.3f}   {MEASURE_LABELS[row['measure']]}")
@@ -0,0 +1,166 @@
+"""
+Section Benchmarking
+====================
+Time and memory profiling of analysis sections, saved as JSON.
+
+``SectionProfiler.run`` calls one section and records its wall time, CPU
+time and peak resident memory, measured by ``analysis_core.instrumentation``.
+Memory is sampled from a background thread, which costs far less than
+``tracemalloc`` and also sees Arrow and other native buffers, so the timings
+stay representative. Each project's ``benchmark_sections.py``
+drives the profiler over synthetic datasets of growing size.
+
+Results are saved as JSON with enough environment metadata (git commit,
+library versions, CPU count) to compare runs. ``find_regressions`` lines a
+run up against a saved baseline and flags sections that got slower or
+hungrier.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import contextlib
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .instrumentation import environment, measure
+
+DEFAULT_TOLERANCE = 0.25                      # relative slowdown flagged as a regression
+MIN_SECONDS = 0.05                            # ignore regressions on sections faster than this
+MIN_MEMORY_MB = 16                            # ignore memory growth below this
+
+
+class SectionProfiler:
+    """Runs sections one at a time and collects one result row per call."""
+
+    def __init__(self, memory=True, quiet=True):
+        self.memory = memory
+        self.quiet = quiet
+        self.rows = []
+
+    def run(self, section, function, **labels):
+        """Profile ``function()`` under ``section``; extra ``labels`` (e.g. rows=) go into the row."""
+        # Section reports are not what is being measured
+        output = contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+        with output:
+            result, metrics = measure(function, 'rss' if self.memory else 'off')
+        self.rows.append({**labels, 'section': section, 'seconds': metrics['wall_seconds'],
+                          'cpu_seconds': metrics['cpu_seconds'], 'peak_rss_mb': metrics.get('peak_rss_mb'),
+                          'rss_growth_mb': metrics.get('rss_growth_mb')})
+        return result
+
+    def table(self):
+        return pd.DataFrame(self.rows)
+
+
+# ==========================================
+# RESULTS
+# ==========================================
+def save_results(path, suite, table, **metadata):
+    """Write a run to ``path`` as JSON: suite name, environment, parameters and one record per section."""
+    report = {'suite': suite, 'environment': {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                                              **environment()},
+              'parameters': metadata,
+              'results': json.loads(table.to_json(orient='records'))}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_results(path):
+    """Return ``(report, table)`` for a JSON file written by ``save_results``."""
+    with open(path) as f:
+        report = json.load(f)
+    return report, pd.DataFrame(report['results'])
+
+
+def find_regressions(baseline, current, tolerance=DEFAULT_TOLERANCE, keys=('rows', 'section')):
+    """Sections of ``current`` that are slower or use more memory than in ``baseline``.
+
+    A section counts when its time grows by more than ``tolerance`` (relative)
+    and ``MIN_SECONDS`` (absolute), or its peak RSS grows by more than
+    ``tolerance`` and ``MIN_MEMORY_MB``.
+    """
+    keys = [key for key in keys if key in baseline.columns and key in current.columns]
+    merged = baseline.merge(current, on=keys, suffixes=('_baseline', '_current'))
+    slower = ((merged['seconds_current'] > merged['seconds_baseline'] * (1 + tolerance))
+              & (merged['seconds_current'] - merged['seconds_baseline'] > MIN_SECONDS))
+    peak_baseline = pd.to_numeric(merged['peak_rss_mb_baseline'], errors='coerce')
+    peak_current = pd.to_numeric(merged['peak_rss_mb_current'], errors='coerce')
+    hungrier = ((peak_current > peak_baseline * (1 + tolerance))
+                & (peak_current - peak_baseline > MIN_MEMORY_MB))
+    merged['slower'], merged['hungrier'] = slower, hungrier.fillna(False)
+    columns = keys + ['seconds_baseline', 'seconds_current', 'peak_rss_mb_baseline', 'peak_rss_mb_current',
+                      'slower', 'hungrier']
+    return merged.loc[slower | merged['hungrier'], columns]
+
+
+def print_results(table):
+    """One line per (size, section), then the total time per size."""
+    columns = [c for c in ['rows', 'section', 'seconds', 'peak_rss_mb', 'rss_growth_mb'] if c in table.columns]
+    print(table[columns].to_string(index=False, float_format=lambda value: f'{value:.3f}'))
+    if 'rows' in table.columns:
+        print("\nTotal seconds per size:")
+        print(table.groupby('rows')['seconds'].sum().round(3).to_string())
+
+
+def print_regressions(regressions, baseline_report, tolerance=DEFAULT_TOLERANCE):
+    commit = baseline_report['environment'].get('git_commit') or 'unknown commit'
+    print(f"\nCompared with baseline from {baseline_report['environment']['timestamp']} ({commit}), "
+          f"tolerance {tolerance:.0%}:")
+    if regressions.empty:
+        print("  No regressions.")
+        return
+    print(regressions.to_string(index=False, float_format=lambda value: f'{value:.3f}'))
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+def parse_size(value):
+    """Parse a row count such as ``10000``, ``10k``, ``1M`` or ``10M``."""
+    text = value.strip().lower().replace('_', '').replace(',', '')
+    factor = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    try:
+        return int(float(text.rstrip('km')) * factor)
+    except ValueError:
+        raise ValueError(f"invalid size {value!r}") from None
+
+
+def add_benchmark_arguments(parser, default_sizes=('10k', '1M', '10M')):
+    """The command-line options shared by the project benchmark suites."""
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size(s) for s in default_sizes],
+                        help='dataset sizes in rows, e.g. 10k 1M 10M')
+    parser.add_argument('--data-dir', default='benchmark_data',
+                        help='where synthetic datasets are generated (and reused between runs)')
+    parser.add_argument('--output', default=None, help='JSON results file (default: benchmark_results/<suite>-<time>.json)')
+    parser.add_argument('--baseline', default=None, help='earlier JSON results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--no-memory', action='store_true', help='skip peak RSS sampling')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser
+
+
+def default_output(suite):
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return os.path.join('benchmark_results', f'{suite}-{stamp}.json')
+
+
+def finish_suite(args, suite, profiler, **metadata):
+    """Print, save and (with ``--baseline``) compare a finished run."""
+    table = profiler.table()
+    print("\nResults:")
+    print_results(table)
+    output = args.output or default_output(suite)
+    save_results(output, suite, table, sizes=args.sizes, seed=args.seed, **metadata)
+    print(f"\n✓ Saved: {output}")
+    if args.baseline:
+        baseline_report, baseline = load_results(args.baseline)
+        print_regressions(find_regressions(baseline, table, args.tolerance), baseline_report, args.tolerance)
+    return table
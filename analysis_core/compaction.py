@@ -0,0 +1,197 @@
+"""
+Frame Compaction
+================
+Schema-driven shrinking of the listings and employee frames before analysis.
+
+``compact_frame`` runs four steps, each measured with
+``memory_usage(deep=True)`` so the saving of every step is reported:
+
+1. drop the columns of ``droppable`` that hold a single value, i.e. export
+   bookkeeping such as ``EmployeeCount`` or ``StandardHours``. Callers list
+   them explicitly: a column the analysis reads (``room_type`` of a
+   single-room-type market, ``Department`` of a one-department export) can
+   be constant too and must stay
+2. map 't'/'f' flags to booleans (nullable ``boolean`` when some are missing)
+3. turn low-cardinality string columns into categoricals
+4. downcast integers to the smallest type holding their range, and the
+   float columns a schema marks as ``'downcast'`` to float32 when that is
+   lossless
+
+A schema maps column -> kind and overrides the automatic choice:
+
+- ``'category'``: always categorical
+- ``'flag'``: a 't'/'f' column
+- ``'downcast'``: a float column that may become float32
+- ``'keep'``: left exactly as loaded (never dropped or converted)
+
+String columns the schema does not name become categoricals when at most
+``CATEGORY_RATIO`` of their values are distinct. Categories are kept in
+lexical order, so groupbys and crosstabs report in the same order as on the
+raw strings.
+
+``filter_rows`` applies a boolean mask with one take per column (no extra
+``.copy()``) and drops the categories the kept rows no longer use, so
+``value_counts`` never lists empty levels.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_RATIO = 0.5                          # share of distinct values up to which strings become categories
+FLAG_VALUES = {'t': True, 'f': False}
+SCHEMA_KINDS = ['category', 'flag', 'downcast', 'keep']
+MAX_LISTED = 8                                # column names printed per step
+
+
+def memory_mb(df):
+    """Deep memory footprint of ``df`` in MB (string payloads included)."""
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def _is_string(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def flag_mask(series, value=True):
+    """Rows whose 't'/'f' flag equals ``value``, for raw strings and compacted booleans alike.
+
+    Missing flags match neither value.
+    """
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return (series == value).fillna(False).astype(bool)
+    raw = next(text for text, flag in FLAG_VALUES.items() if flag == value)
+    return (series == raw).fillna(False).astype(bool)
+
+
+# ==========================================
+# STEPS
+# ==========================================
+def drop_constant_columns(df, schema, droppable=()):
+    """Columns of ``droppable`` holding a single value (missing counts as a value), except those the schema keeps."""
+    return [column for column in df.columns
+            if column in droppable and schema.get(column) != 'keep' and df[column].nunique(dropna=False) <= 1]
+
+
+def flag_columns(df, schema):
+    """Convert the schema's 'flag' columns; returns ``(df, converted)``."""
+    converted = []
+    for column in df.columns:
+        if schema.get(column) != 'flag' or pd.api.types.is_bool_dtype(df[column].dtype):
+            continue
+        values = df[column].map(FLAG_VALUES)
+        if values.isna().any():
+            df[column] = values.astype('boolean')
+        else:
+            df[column] = values.astype(bool)
+        converted.append(column)
+    return df, converted
+
+
+def category_columns(df, schema, max_ratio=CATEGORY_RATIO):
+    """Convert low-cardinality string columns to categoricals; returns ``(df, converted)``."""
+    converted = []
+    for column in df.columns:
+        kind = schema.get(column)
+        series = df[column]
+        if kind in ('keep', 'flag') or isinstance(series.dtype, pd.CategoricalDtype) or not _is_string(series):
+            continue
+        if kind == 'category' or series.nunique() <= max_ratio * len(series):
+            df[column] = series.astype('category')
+            converted.append(column)
+    return df, converted
+
+
+def downcast_columns(df, schema):
+    """Shrink integer columns, and lossless float32 for 'downcast' floats; returns ``(df, converted)``."""
+    converted = []
+    for column in df.columns:
+        kind = schema.get(column)
+        series = df[column]
+        if kind == 'keep' or isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            shrunk = pd.to_numeric(series, downcast='integer')
+        elif kind == 'downcast' and series.dtype == np.float64:
+            shrunk = series.astype(np.float32)
+            values, narrowed = series.to_numpy(), shrunk.to_numpy(dtype=np.float64)
+            if not np.array_equal(values, narrowed, equal_nan=True):
+                continue
+        else:
+            continue
+        if shrunk.dtype != series.dtype:
+            df[column] = shrunk
+            converted.append(column)
+    return df, converted
+
+
+# ==========================================
+# COMPACTION
+# ==========================================
+def compact_frame(df, schema=None, max_ratio=CATEGORY_RATIO, droppable=()):
+    """Return ``df`` compacted, with the memory saved by each step.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Frame to compact; it is left unchanged.
+    schema : dict, optional
+        Column -> kind (see the module docstring).
+    max_ratio : float
+        Distinct-value share up to which unnamed string columns become
+        categoricals.
+    droppable : iterable of str
+        Columns removed when they are constant; no other column is ever
+        dropped.
+
+    Returns
+    -------
+    (DataFrame, DataFrame)
+        The compacted frame and one report row per step with ``step``,
+        ``columns``, ``memory_mb`` (after the step) and ``saved_mb``.
+    """
+    schema = dict(schema or {})
+    unknown = {kind for kind in schema.values() if kind not in SCHEMA_KINDS}
+    if unknown:
+        raise ValueError(f"Unknown schema kinds {sorted(unknown)}; choose from {SCHEMA_KINDS}")
+
+    rows = [{'step': 'loaded', 'columns': [], 'memory_mb': memory_mb(df), 'saved_mb': 0.0}]
+
+    def record(step, columns):
+        memory = memory_mb(df)
+        rows.append({'step': step, 'columns': columns, 'memory_mb': memory,
+                     'saved_mb': rows[-1]['memory_mb'] - memory})
+
+    constant = drop_constant_columns(df, schema, set(droppable))
+    df = df.drop(columns=constant)
+    record('drop constant', constant)
+    df, flags = flag_columns(df, schema)
+    record('flags', flags)
+    df, categories = category_columns(df, schema, max_ratio)
+    record('categories', categories)
+    df, downcast = downcast_columns(df, schema)
+    record('downcast', downcast)
+    return df, pd.DataFrame(rows)
+
+
+def filter_rows(df, mask):
+    """``df[mask]`` without a defensive copy, with unused categories dropped."""
+    filtered = df[np.asarray(mask, dtype=bool)]
+    for column in filtered.columns:
+        if isinstance(filtered[column].dtype, pd.CategoricalDtype):
+            filtered[column] = filtered[column].cat.remove_unused_categories()
+    return filtered
+
+
+def print_compaction(report):
+    """Memory before and after compaction, and what each step saved."""
+    before, after = report['memory_mb'].iloc[0], report['memory_mb'].iloc[-1]
+    print(f"Memory: {before:.2f} MB -> {after:.2f} MB ({(1 - after / before) * 100 if before else 0:.0f}% smaller)")
+    for _, row in report.iloc[1:].iterrows():
+        if row['columns']:
+            columns = ', '.join(map(str, row['columns'][:MAX_LISTED]))
+            if len(row['columns']) > MAX_LISTED:
+                columns += f", ... ({len(row['columns'])} columns)"
+            print(f"  {row['step']:<14} {-row['saved_mb']:+8.2f} MB  {columns}")
@@ -0,0 +1,238 @@
+"""
+Correlation Engine
+==================
+One-pass, mergeable Pearson correlations with bootstrap confidence intervals.
+
+``CorrelationAccumulator`` folds chunks of rows into pairwise co-moments. For
+every pair of columns it keeps the count, means, sums of squared deviations
+and co-moment over the rows where *both* are present. This is the same
+pairwise NaN handling as ``DataFrame.corr()``. Chunks, files or whole worker
+processes are combined with the parallel (Chan et al.) update of Welford's
+algorithm, so the result does not depend on how the data was split.
+
+``BootstrapCorrelation`` gives percentile confidence intervals for the
+correlation of one target (price, attrition) with each feature. It uses the
+Poisson bootstrap, where every row gets an independent Poisson(1) weight in
+each resample. This needs no second pass over the data, so it streams and
+merges exactly like the accumulator. All resamples and features are updated
+with one matrix product per block of rows rather than a Python loop over
+resamples.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+# Rows per bootstrap block are chosen so the weight matrix stays around this size
+BOOTSTRAP_BLOCK_CELLS = 1 << 22
+
+
+def _poisson_table(levels=1 << 16):
+    """Inverse CDF of Poisson(1) sampled at ``levels`` evenly spaced probabilities.
+
+    Indexing it with uniform 16-bit integers draws Poisson(1) weights about
+    five times faster than ``Generator.poisson``. Each probability mass is
+    off by at most 1/65536, and values above 8 are folded into 8.
+    """
+    k = np.arange(20)
+    cdf = np.cumsum(np.exp(-1.0) / np.cumprod(np.maximum(k, 1)))
+    return np.searchsorted(cdf, (np.arange(levels) + 0.5) / levels).astype(float)
+
+
+POISSON_WEIGHTS = _poisson_table()
+
+
+def _as_matrix(frame, columns):
+    if isinstance(frame, pd.DataFrame):
+        frame = frame[columns]
+    return np.asarray(frame, dtype=float)
+
+
+class CorrelationAccumulator:
+    """Mergeable pairwise means, variances and covariances of ``columns``."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        # Entry [a, b] describes column a over the rows where a and b are both present
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, frame):
+        """Fold a chunk of rows (DataFrame with ``columns``, or a 2D array) into the moments."""
+        values = _as_matrix(frame, self.columns)
+        if len(values) == 0:
+            return self
+        valid = ~np.isnan(values)
+        # Centre on the chunk means first to keep the sums well conditioned
+        with np.errstate(invalid='ignore'):
+            shift = np.where(valid.any(axis=0), np.nanmean(np.where(valid, values, np.nan), axis=0), 0.0)
+        centred = np.where(valid, values - shift, 0.0)
+        mask = valid.astype(float)
+
+        n = mask.T @ mask
+        sums = centred.T @ mask                  # [a, b]: sum of a over rows where both present
+        squares = (centred ** 2).T @ mask
+        products = centred.T @ centred
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, sums / n, 0.0)
+            m2 = np.where(n > 0, squares - sums ** 2 / n, 0.0)
+            comoment = np.where(n > 0, products - sums * sums.T / n, 0.0)
+        chunk = CorrelationAccumulator(self.columns)
+        chunk.n, chunk.mean, chunk.m2, chunk.comoment = n, mean + shift[:, None], m2, comoment
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Combine with an accumulator over other rows of the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+        n = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where((self.n > 0) & (other.n > 0), other.mean - self.mean, 0.0)
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            mean = np.where(self.n == 0, other.mean,
+                            np.where(other.n == 0, self.mean, self.mean + delta * np.where(n > 0, other.n / n, 0.0)))
+        self.m2 = self.m2 + other.m2 + delta ** 2 * weight
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.n, self.mean = n, mean
+        return self
+
+    def covariance(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = np.where(self.n > ddof, self.comoment / (self.n - ddof), np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix with pairwise-complete observations, like ``DataFrame.corr()``."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr = np.where(self.n > 1, np.clip(corr, -1, 1), np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class BootstrapCorrelation:
+    """Poisson-bootstrap distribution of corr(target, feature) for each feature.
+
+    Each resample keeps six weighted sums per feature. Values are shifted
+    by a fixed centre (taken from the first chunk) to keep them well
+    conditioned, and ``merge`` re-centres the other side when the centres
+    differ.
+    """
+
+    def __init__(self, target, features, n_resamples=DEFAULT_RESAMPLES, seed=None):
+        self.target = target
+        self.features = list(features)
+        self.n_resamples = n_resamples
+        self.rng = np.random.default_rng(seed)
+        self.centre = None                       # (feature centres, target centre)
+        self.sums = np.zeros((6, n_resamples, len(self.features)))  # w, x, y, xx, yy, xy
+
+    def update(self, frame):
+        """Fold a chunk of rows (a DataFrame with the target and features) into every resample."""
+        x = _as_matrix(frame, self.features)
+        y = np.asarray(frame[self.target], dtype=float)
+        if len(x) == 0 or self.n_resamples == 0:
+            return self
+        if self.centre is None:
+            with np.errstate(invalid='ignore'):
+                cx = np.nan_to_num(np.nanmean(x, axis=0)) if (~np.isnan(x)).any() else np.zeros(x.shape[1])
+            self.centre = (cx, float(np.nan_to_num(np.nanmean(y))) if (~np.isnan(y)).any() else 0.0)
+        cx, cy = self.centre
+
+        valid = ~np.isnan(x) & ~np.isnan(y)[:, None]
+        dx = np.where(valid, x - cx, 0.0)
+        dy = np.where(valid, (y - cy)[:, None], 0.0)
+        # Six per-row statistics for every feature, side by side: (rows, 6 * features)
+        stats = np.hstack([valid.astype(float), dx, dy, dx * dx, dy * dy, dx * dy])
+
+        block = max(1, BOOTSTRAP_BLOCK_CELLS // self.n_resamples)
+        k = len(self.features)
+        for start in range(0, len(stats), block):
+            rows = stats[start:start + block]
+            weights = POISSON_WEIGHTS[self.rng.integers(0, len(POISSON_WEIGHTS), size=(self.n_resamples, len(rows)),
+                                                        dtype=np.uint16)]
+            self.sums += (weights @ rows).reshape(self.n_resamples, 6, k).transpose(1, 0, 2)
+        return self
+
+    def merge(self, other):
+        """Combine with a bootstrap over other rows (same target, features and resample count)."""
+        if (other.target, other.features, other.n_resamples) != (self.target, self.features, self.n_resamples):
+            raise ValueError("Cannot merge bootstraps of different correlations or resample counts")
+        if other.centre is None:
+            return self
+        if self.centre is None:
+            self.centre, self.sums = other.centre, other.sums.copy()
+            return self
+        w, sx, sy, sxx, syy, sxy = other.sums
+        # other's values are centred on other.centre; shift them onto ours
+        ax = other.centre[0] - self.centre[0]
+        ay = other.centre[1] - self.centre[1]
+        self.sums += np.stack([
+            w,
+            sx + ax * w,
+            sy + ay * w,
+            sxx + 2 * ax * sx + ax ** 2 * w,
+            syy + 2 * ay * sy + ay ** 2 * w,
+            sxy + ax * sy + ay * sx + ax * ay * w,
+        ])
+        return self
+
+    def resampled(self):
+        """(n_resamples, features) array of bootstrap correlations."""
+        w, sx, sy, sxx, syy, sxy = self.sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sxy - sx * sy / w
+            var_x = sxx - sx ** 2 / w
+            var_y = syy - sy ** 2 / w
+            return np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+
+    def intervals(self, confidence=DEFAULT_CONFIDENCE):
+        """Percentile confidence interval and standard error for each feature."""
+        samples = self.resampled()
+        alpha = (1 - confidence) / 2
+        with np.errstate(invalid='ignore'):
+            low, high = np.nanquantile(samples, [alpha, 1 - alpha], axis=0)
+            std_error = np.nanstd(samples, axis=0, ddof=1)
+        return pd.DataFrame({'ci_low': low, 'ci_high': high, 'std_error': std_error}, index=self.features)
+
+
+# ==========================================
+# CONVENIENCE
+# ==========================================
+def correlate(chunks, target, features, n_resamples=DEFAULT_RESAMPLES, seed=None):
+    """Run both accumulators over an iterable of DataFrame chunks.
+
+    The correlation matrix covers ``features`` in their given order (plus the
+    target, appended if missing). ``n_resamples=0`` skips the bootstrap.
+    Returns ``(accumulator, bootstrap)``.
+    """
+    columns = list(dict.fromkeys(list(features) + [target]))
+    accumulator = CorrelationAccumulator(columns)
+    bootstrap = BootstrapCorrelation(target, [c for c in columns if c != target], n_resamples, seed)
+    for chunk in chunks:
+        accumulator.update(chunk)
+        bootstrap.update(chunk)
+    return accumulator, bootstrap
+
+
+def target_correlations(accumulator, bootstrap, confidence=DEFAULT_CONFIDENCE):
+    """Correlation of each feature with the bootstrap's target plus its confidence interval.
+
+    Sorted by absolute correlation, strongest first.
+    """
+    corr = accumulator.correlation()[bootstrap.target].drop(bootstrap.target)
+    table = pd.concat([corr.rename('corr'), corr.abs().rename('abs_corr'),
+                       bootstrap.intervals(confidence)], axis=1)
+    return table.sort_values('abs_corr', ascending=False)
+
+
+def print_target_correlations(table, confidence=DEFAULT_CONFIDENCE):
+    print(f"{'':28s} {'corr':>7s}   {confidence * 100:.0f}% CI")
+    for name, row in table.iterrows():
+        print(f"{name:28s} {row['corr']:7.3f}   [{row['ci_low']:6.3f}, {row['ci_high']:6.3f}]")
@@ -0,0 +1,302 @@
+"""
+Run Instrumentation
+===================
+Per-section wall time, CPU time, peak memory and row counts, with a JSON run
+report.
+
+The analysis runners pass every step (load, cleaning, each numbered section)
+through ``Instrumentation.run``, which records for that step:
+
+- wall and CPU seconds
+- peak memory, as RSS sampled from a background thread (default; sees
+  native Arrow/NumPy buffers and costs almost nothing), as the Python heap
+  peak from ``tracemalloc`` (exact but slows pandas code noticeably), or
+  not at all
+- the rows going in and, for DataFrame results, the rows coming out
+- whether the step succeeded, and the error if it did not
+
+Chosen sections can also be run under ``cProfile``; their ``.prof`` dumps
+open with ``python -m pstats`` or snakeviz. ``save`` writes the run as one
+JSON document (run metadata, environment and one record per section) for
+monitoring to ingest.
+
+When ``analysis_core.scheduler`` runs sections at the same time, CPU time
+and RSS are process-wide, so a section's figures include whatever ran
+alongside it. Wall time stays per section. tracemalloc peaks and cProfile
+dumps need one section at a time, so ``sequential`` asks the scheduler for
+a single worker in those modes.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import cProfile
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .scheduler import print_schedule
+
+MEMORY_MODES = ['rss', 'tracemalloc', 'off']
+RSS_SAMPLE_INTERVAL = 0.005                   # seconds between memory samples
+REPORT_VERSION = 1
+
+
+# ==========================================
+# MEASUREMENT
+# ==========================================
+def _rss_bytes():
+    """Current resident set size, or None where it cannot be read cheaply."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class PeakRssSampler:
+    """Context manager tracking the peak RSS from a background thread."""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start = self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        if self.start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes())
+
+
+def _row_count(result):
+    """Rows of a DataFrame result (or of the frame leading a tuple result, as from ``clean_data``)."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return len(result) if isinstance(result, (pd.DataFrame, pd.Series)) else None
+
+
+def measure(function, memory='rss', profile_path=None):
+    """Call ``function()`` and return ``(result, metrics)``.
+
+    ``metrics`` holds wall_seconds, cpu_seconds, and depending on
+    ``memory`` either peak_rss_mb/rss_growth_mb or peak_traced_mb (None when
+    unavailable). With ``profile_path`` the call runs under cProfile and the
+    stats are dumped there. If ``function`` raises, the exception carries the
+    metrics gathered so far as ``exc.metrics``.
+    """
+    if memory not in MEMORY_MODES:
+        raise ValueError(f"memory must be one of {MEMORY_MODES}")
+    profiler = cProfile.Profile() if profile_path else None
+    sampler = PeakRssSampler() if memory == 'rss' else None
+    started_tracing = memory == 'tracemalloc' and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory == 'tracemalloc':
+        tracemalloc.reset_peak()
+
+    metrics = {}
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        if sampler:
+            sampler.__enter__()
+        if profiler:
+            profiler.enable()
+        return function(), metrics
+    except BaseException as exc:
+        exc.metrics = metrics
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.__exit__(None, None, None)
+        metrics['wall_seconds'] = time.perf_counter() - wall
+        metrics['cpu_seconds'] = time.process_time() - cpu
+        if sampler:
+            known = sampler.start is not None
+            metrics['peak_rss_mb'] = sampler.peak / 2 ** 20 if known else None
+            metrics['rss_growth_mb'] = (sampler.peak - sampler.start) / 2 ** 20 if known else None
+        elif memory == 'tracemalloc':
+            metrics['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            if started_tracing:
+                tracemalloc.stop()
+        if profiler:
+            os.makedirs(os.path.dirname(os.path.abspath(profile_path)), exist_ok=True)
+            profiler.dump_stats(profile_path)
+            metrics['profile'] = profile_path
+
+
+def environment():
+    """Metadata identifying the code and machine a run was made on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'hostname': platform.node(),
+        'cpu_count': os.cpu_count(),
+        'pid': os.getpid(),
+    }
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+
+
+# ==========================================
+# RUN INSTRUMENTATION
+# ==========================================
+class Instrumentation:
+    """Collects one record per instrumented section of a run.
+
+    Parameters
+    ----------
+    memory : {'rss', 'tracemalloc', 'off'}
+        How peak memory is measured.
+    profile_sections : iterable of str, optional
+        Sections to run under cProfile ('all' profiles every one).
+    profile_dir : str
+        Where the ``<run id>-<section>.prof`` dumps go.
+    """
+
+    def __init__(self, memory='rss', profile_sections=(), profile_dir='profiles'):
+        self.memory = memory
+        self.profile_sections = set(profile_sections or ())
+        self.profile_dir = profile_dir
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = _timestamp()
+        self._started = time.perf_counter()
+        self.records = []
+        self.summaries = {}
+
+    @property
+    def sequential(self):
+        """Whether sections must run one at a time to be measured (tracemalloc peaks, cProfile)."""
+        return self.memory == 'tracemalloc' or bool(self.profile_sections)
+
+    def _profile_path(self, section):
+        if section in self.profile_sections or 'all' in self.profile_sections:
+            return os.path.join(self.profile_dir, f'{self.run_id}-{section}.prof')
+        return None
+
+    def run(self, section, function, rows=None):
+        """Call ``function()`` as ``section``; ``rows`` is the size of its input frame."""
+        record = {'section': section, 'started_at': _timestamp(), 'rows_in': rows}
+        self.records.append(record)
+        try:
+            result, metrics = measure(function, self.memory, self._profile_path(section))
+        except Exception as exc:
+            record.update(getattr(exc, 'metrics', {}), status='error', error=f'{type(exc).__name__}: {exc}')
+            raise
+        record.update(metrics, status='ok', rows_out=_row_count(result))
+        return result
+
+    def summarize(self, name, value):
+        """Attach a run-level summary (e.g. result cache hit/miss counts) to the report."""
+        self.summaries[name] = value
+
+    def table(self):
+        table = pd.DataFrame(self.records)
+        for column in ['rows_in', 'rows_out']:
+            if column in table.columns:
+                table[column] = table[column].astype('Int64')
+        return table
+
+    def report(self, script, **parameters):
+        """The run as a JSON-serialisable dict."""
+        failed = any(record['status'] == 'error' for record in self.records)
+        return {
+            'report_version': REPORT_VERSION,
+            'script': script,
+            'run_id': self.run_id,
+            'status': 'error' if failed else 'ok',
+            'started_at': self.started_at,
+            'finished_at': _timestamp(),
+            'total_wall_seconds': time.perf_counter() - self._started,
+            'memory_mode': self.memory,
+            'environment': environment(),
+            'parameters': parameters,
+            **self.summaries,
+            'sections': json.loads(self.table().to_json(orient='records')),
+        }
+
+    def save(self, path, script, **parameters):
+        """Write the JSON run report to ``path``."""
+        report = self.report(script, **parameters)
+        text = json.dumps(report, indent=2, default=str)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return report
+
+    def print_summary(self):
+        """Time and memory per section, slowest first."""
+        table = self.table()
+        if table.empty:
+            return
+        columns = [c for c in ['section', 'rows_in', 'rows_out', 'wall_seconds', 'cpu_seconds',
+                               'peak_rss_mb', 'peak_traced_mb', 'status'] if c in table.columns]
+        print("\nSection timings (slowest first):")
+        print(table.sort_values('wall_seconds', ascending=False)[columns]
+              .to_string(index=False, float_format=lambda value: f'{value:.3f}'))
+        if 'schedule' in self.summaries:
+            print_schedule(self.summaries['schedule'])
+
+
+def add_instrumentation_arguments(parser):
+    """The ``--report`` / ``--profile`` / ``--memory`` options shared by both analyses."""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--report', default=None, metavar='PATH',
+                       help='write a JSON run report (per-section time, memory, rows) to PATH')
+    group.add_argument('--profile', action='append', default=[], metavar='SECTION',
+                       help="run SECTION under cProfile (repeatable; 'all' for every section)")
+    group.add_argument('--profile-dir', default='profiles', help='where cProfile dumps are written')
+    group.add_argument('--memory', choices=MEMORY_MODES, default='rss',
+                       help='peak memory measurement: sampled RSS, tracemalloc (slower) or off')
+    return parser
+
+
+def instrumentation_from_args(args):
+    return Instrumentation(args.memory, args.profile, args.profile_dir)
+
+
+def finish_run(instrumentation, args, script, **parameters):
+    """Print the timing summary and write the report when ``--report`` was given."""
+    if not args.report:
+        return
+    instrumentation.print_summary()
+    instrumentation.save(args.report, script, **parameters)
+    print(f"✓ Saved: {args.report}")
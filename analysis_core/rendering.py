@@ -0,0 +1,330 @@
+"""
+Figure Rendering
+================
+Parallel rendering of the analysis dashboards from precomputed panel data.
+
+Analyses describe each chart as a ``Panel`` holding small NumPy arrays that
+are already binned or aggregated (histogram counts and edges, bar values, a
+sampled scatter), never the raw columns. ``render_figures`` then draws the
+figures, or every panel on its own in ``layout='panels'``, in a process pool.
+It uses matplotlib's object-oriented API with no pyplot state, so PNG
+output goes through Agg and SVG through the SVG backend in every worker.
+
+Every job reports how long each panel took, so slow charts are easy to spot.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DPI = 300
+DRAFT_DPI = 72
+FORMATS = ('png', 'svg')
+LAYOUTS = ('dashboard', 'panels')
+STYLE = 'seaborn-v0_8-darkgrid'
+
+
+@dataclass
+class Panel:
+    """One chart: its kind, precomputed data and presentation options.
+
+    ``kind`` is one of 'hist', 'bar', 'barh', 'pie', 'line', 'step',
+    'scatter', 'grouped_bar' or 'heatmap'; see the ``_draw_*`` functions for the keys
+    each kind reads from ``data``.
+    """
+    name: str
+    kind: str
+    title: str
+    data: dict
+    xlabel: str = ''
+    ylabel: str = ''
+    style: dict = field(default_factory=dict)
+
+
+@dataclass
+class FigureSpec:
+    """A figure file made of panels laid out on a grid."""
+    filename: str
+    panels: list
+    grid: tuple = (3, 3)
+    figsize: tuple = (20, 12)
+
+
+# ==========================================
+# PANEL DATA HELPERS
+# ==========================================
+def binned(*series, bins=50):
+    """Histogram one or more series on shared edges.
+
+    Returns the ``data`` dict of a 'hist' panel: ``edges`` and one row of
+    ``counts`` per series.
+    """
+    arrays = [np.asarray(pd.Series(s).dropna(), dtype=float) for s in series]
+    values = np.concatenate(arrays) if arrays else np.empty(0)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    counts = np.vstack([np.histogram(a, bins=edges)[0] for a in arrays])
+    return {'edges': edges, 'counts': counts}
+
+
+def categories(series):
+    """Return the ``data`` dict of a bar/pie panel from a labelled Series."""
+    return {'labels': [str(label) for label in series.index], 'values': np.asarray(series.values, dtype=float)}
+
+
+# ==========================================
+# DRAWING
+# ==========================================
+def _draw_hist(ax, panel):
+    edges, counts = panel.data['edges'], panel.data['counts']
+    style = panel.style
+    centers = [edges[:-1]] * len(counts)
+    ax.hist(centers if len(counts) > 1 else centers[0], bins=edges,
+            weights=list(counts) if len(counts) > 1 else counts[0],
+            label=style.get('labels'), color=style.get('color'), alpha=style.get('alpha', 0.7),
+            edgecolor=style.get('edgecolor'))
+    for x, color, label in panel.data.get('vlines', []):
+        ax.axvline(x, color=color, linestyle='--', linewidth=2, label=label)
+    if 'xlim' in panel.data:
+        ax.set_xlim(*panel.data['xlim'])
+    if style.get('labels') or panel.data.get('vlines'):
+        ax.legend()
+
+
+def _draw_bar(ax, panel):
+    ax.bar(panel.data['labels'], panel.data['values'], color=panel.style.get('color'))
+    if 'rotation' in panel.style:
+        ax.tick_params(axis='x', labelrotation=panel.style['rotation'])
+
+
+def _draw_barh(ax, panel):
+    ax.barh(panel.data['labels'], panel.data['values'], color=panel.style.get('color'))
+
+
+def _draw_pie(ax, panel):
+    ax.pie(panel.data['values'], labels=panel.data['labels'], autopct='%1.1f%%',
+           colors=panel.style.get('colors'), startangle=90)
+
+
+def _draw_line(ax, panel):
+    ax.plot(panel.data['x'], panel.data['y'], marker=panel.style.get('marker', 'o'),
+            linewidth=2, markersize=8, color=panel.style.get('color'))
+    if 'xticks' in panel.style:
+        ax.set_xticks(panel.style['xticks'])
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_step(ax, panel):
+    """One step curve per series on a shared x (e.g. Kaplan-Meier curves); NaN ends a curve."""
+    for name, values in panel.data['series'].items():
+        ax.step(panel.data['x'], values, where='post', linewidth=2, label=name)
+    if 'ylim' in panel.style:
+        ax.set_ylim(*panel.style['ylim'])
+    ax.legend(fontsize=panel.style.get('legend_size', 8), title=panel.style.get('legend_title'))
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_scatter(ax, panel):
+    ax.scatter(panel.data['x'], panel.data['y'], alpha=0.5, color=panel.style.get('color'), s=30)
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_grouped_bar(ax, panel):
+    """Side-by-side bars per category, like ``DataFrame.plot(kind='bar')``."""
+    labels, series = panel.data['labels'], panel.data['series']
+    colors = panel.style.get('colors') or [None] * len(series)
+    positions = np.arange(len(labels))
+    width = 0.5 / len(series)
+    for i, ((name, values), color) in enumerate(zip(series.items(), colors)):
+        ax.bar(positions + (i - (len(series) - 1) / 2) * width, values, width, label=name, color=color)
+    ax.set_xticks(positions, labels, rotation=panel.style.get('rotation', 0))
+    ax.legend(title=panel.style.get('legend_title'), labels=panel.style.get('legend_labels'))
+
+
+def _draw_heatmap(ax, panel):
+    """Annotated correlation heatmap centred on zero (matplotlib-only; style: annotation_size)."""
+    matrix, labels = np.asarray(panel.data['matrix'], dtype=float), panel.data['labels']
+    limit = np.nanmax(np.abs(matrix)) if np.isfinite(matrix).any() else 1.0
+    mesh = ax.pcolormesh(matrix, cmap='coolwarm', vmin=-limit, vmax=limit, edgecolors='white', linewidth=1)
+    ax.set_xticks(np.arange(len(labels)) + 0.5, labels, rotation=90)
+    ax.set_yticks(np.arange(len(labels)) + 0.5, labels)
+    ax.invert_yaxis()
+    ax.set_aspect('equal')
+    ax.grid(False)
+    rgba = mesh.cmap(mesh.norm(matrix))
+    luminance = rgba[..., :3] @ np.array([0.299, 0.587, 0.114])
+    for (i, j), value in np.ndenumerate(matrix):
+        ax.text(j + 0.5, i + 0.5, f'{value:.2f}', ha='center', va='center',
+                fontsize=panel.style.get('annotation_size'), color='white' if luminance[i, j] < 0.5 else 'black')
+    ax.figure.colorbar(mesh, ax=ax, shrink=0.8)
+
+
+DRAWERS = {
+    'hist': _draw_hist,
+    'bar': _draw_bar,
+    'barh': _draw_barh,
+    'pie': _draw_pie,
+    'line': _draw_line,
+    'step': _draw_step,
+    'scatter': _draw_scatter,
+    'grouped_bar': _draw_grouped_bar,
+    'heatmap': _draw_heatmap,
+}
+
+
+def draw_panel(ax, panel):
+    """Draw ``panel`` onto ``ax``."""
+    DRAWERS[panel.kind](ax, panel)
+    if panel.xlabel:
+        ax.set_xlabel(panel.xlabel)
+    if panel.ylabel:
+        ax.set_ylabel(panel.ylabel)
+    ax.set_title(panel.title, fontsize=panel.style.get('title_size', 14), fontweight='bold',
+                 pad=panel.style.get('title_pad'))
+
+
+# ==========================================
+# JOBS
+# ==========================================
+def _save(fig, path, dpi, tight):
+    fig.savefig(path, dpi=dpi, bbox_inches='tight' if tight else None)
+
+
+def _render_figure(spec, path, dpi, tight):
+    """Render a whole figure; per-panel build times plus the save time."""
+    import matplotlib.style
+    from matplotlib.figure import Figure
+
+    timings = []
+    with matplotlib.style.context(STYLE):
+        start = time.perf_counter()
+        fig = Figure(figsize=spec.figsize)
+        rows, cols = spec.grid
+        for i, panel in enumerate(spec.panels):
+            panel_start = time.perf_counter()
+            draw_panel(fig.add_subplot(rows, cols, i + 1), panel)
+            timings.append({'figure': spec.filename, 'panel': panel.name, 'seconds': time.perf_counter() - panel_start})
+        fig.tight_layout()
+        save_start = time.perf_counter()
+        _save(fig, path, dpi, tight)
+        timings.append({'figure': spec.filename, 'panel': '(layout + save)', 'seconds': time.perf_counter() - save_start})
+        timings.append({'figure': spec.filename, 'panel': '(total)', 'seconds': time.perf_counter() - start})
+    for row in timings:
+        row['path'] = path
+    return timings
+
+
+def _render_panel(spec, panel, path, dpi, tight):
+    """Render one panel to its own file; the time covers drawing and saving."""
+    import matplotlib.style
+    from matplotlib.figure import Figure
+
+    rows, cols = spec.grid
+    figsize = (spec.figsize[0] / cols, spec.figsize[1] / rows) if len(spec.panels) > 1 else spec.figsize
+    with matplotlib.style.context(STYLE):
+        start = time.perf_counter()
+        fig = Figure(figsize=figsize)
+        draw_panel(fig.add_subplot(1, 1, 1), panel)
+        fig.tight_layout()
+        _save(fig, path, dpi, tight)
+    return [{'figure': spec.filename, 'panel': panel.name, 'seconds': time.perf_counter() - start, 'path': path}]
+
+
+def _run_job(job):
+    kind, args = job
+    return _render_figure(*args) if kind == 'figure' else _render_panel(*args)
+
+
+def render_figures(figures, output_dir='.', dpi=DEFAULT_DPI, fmt='png', layout='dashboard',
+                   workers=None, tight=True):
+    """Render figure specs, in parallel, and return per-panel timings.
+
+    Parameters
+    ----------
+    figures : list of FigureSpec
+    output_dir : str
+    dpi : int
+        Output resolution (ignored by SVG for vector content).
+    fmt : {'png', 'svg'}
+    layout : {'dashboard', 'panels'}
+        'dashboard' writes each figure as one file (one job per figure);
+        'panels' writes every panel to ``<figure>_<panel>.<fmt>`` (one job
+        per panel).
+    workers : int, optional
+        Worker processes. ``0`` or ``1`` renders in this process. Defaults
+        to one per job, capped at the CPU count.
+    tight : bool
+        Use ``bbox_inches='tight'`` (costs an extra layout pass per file).
+
+    Returns
+    -------
+    DataFrame
+        One row per panel (plus save/total rows in 'dashboard' layout) with
+        ``figure``, ``panel``, ``seconds`` and ``path``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {FORMATS}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; choose from {LAYOUTS}")
+
+    jobs = []
+    for spec in figures:
+        stem = os.path.splitext(spec.filename)[0]
+        if layout == 'dashboard':
+            path = os.path.join(output_dir, f'{stem}.{fmt}')
+            jobs.append(('figure', (spec, path, dpi, tight)))
+        else:
+            for panel in spec.panels:
+                path = os.path.join(output_dir, f'{stem}_{panel.name}.{fmt}')
+                jobs.append(('panel', (spec, panel, path, dpi, tight)))
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        results = [_run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_job, jobs))
+
+    return pd.DataFrame([row for result in results for row in result],
+                        columns=['figure', 'panel', 'seconds', 'path'])
+
+
+def print_timings(timings):
+    """Print the per-panel render times."""
+    print("\nRender time per panel:")
+    for _, row in timings.iterrows():
+        print(f"  {row['figure']:32s} {row['panel']:28s} {row['seconds']:7.3f}s")
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+def add_render_arguments(parser):
+    """Add the shared rendering flags to an analysis' argument parser."""
+    group = parser.add_argument_group('rendering')
+    group.add_argument('--no-plots', action='store_true', help='skip rendering entirely')
+    group.add_argument('--dpi', type=int, default=DEFAULT_DPI, help=f'output resolution (default: {DEFAULT_DPI})')
+    group.add_argument('--draft', action='store_true',
+                       help=f'fast preview: {DRAFT_DPI} dpi and no tight bounding box')
+    group.add_argument('--format', choices=FORMATS, default='png', help='figure file format')
+    group.add_argument('--panels', action='store_true', help='write every panel to its own file')
+    group.add_argument('--render-workers', type=int, default=None,
+                       help='rendering processes (default: one per figure or panel; 1 renders in-process)')
+
+
+def render_options(args):
+    """Turn parsed rendering flags into ``render_figures`` keyword arguments."""
+    return {
+        'dpi': DRAFT_DPI if args.draft else args.dpi,
+        'fmt': args.format,
+        'layout': 'panels' if args.panels else 'dashboard',
+        'workers': args.render_workers,
+        'tight': not args.draft,
+    }
@@ -0,0 +1,483 @@
+"""
+Result Cache
+============
+Content-addressed disk cache for the outputs of analysis sections.
+
+A section's entry is keyed on:
+
+- the content hash of the input file
+- the section name
+- the section's parameters (outlier quantiles, render options, ...)
+- a code version stamp hashed from the analysis sources
+
+Editing the data, the parameters or the code therefore misses the cache
+instead of serving stale numbers. An entry holds everything needed to replay
+the section without recomputing it:
+
+- its return value, with DataFrames and Series stored as Parquet (anything
+  Parquet cannot hold, and every other object, is pickled)
+- the report it printed
+- copies of the files it wrote, e.g. rendered figures
+
+A hit prints the stored report again, restores the files into the current
+output directory and returns the stored result. The cache is bounded in size;
+the least recently used entries are evicted first. ``invalidate`` drops
+entries explicitly, by section or wholesale.
+
+Several processes may share one cache. The index is only read, changed and
+written back while holding an exclusive lock on ``index.lock`` (``fcntl``;
+where that is unavailable, only threads of one process are serialised), so
+concurrent stores merge instead of the last writer winning. Each entry also
+keeps its own index record, and entry directories missing from the index
+(e.g. after a crash) are adopted again when the index is read.
+
+Layout::
+
+    .results_cache/
+        index.json              # key -> section, data hash, size, last use
+        index.lock              # held while the index is updated
+        manifest.json           # input file hashes (see ``file_hash``)
+        <key>/entry.json, result.pkl, frame-<n>.parquet, stdout.txt, files/...
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:                            # Windows: the index lock only covers this process
+    fcntl = None
+
+from .scheduler import current_output, redirect_output
+
+CACHE_DIRNAME = '.results_cache'
+DEFAULT_MAX_MB = 1024
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+INDEX_FILE = 'index.json'
+LOCK_FILE = 'index.lock'
+ENTRY_FILE = 'entry.json'
+
+
+# ==========================================
+# HASHING
+# ==========================================
+def _private_tmp(path):
+    """Temporary name next to ``path`` that no other process or thread writes to."""
+    return f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+
+
+def file_hash(path, cache_dir=None):
+    """Return the BLAKE2b content hash of ``path``.
+
+    Hashing a multi-GB dump is not free, so the digest is remembered in a small
+    manifest keyed on (size, mtime) and only recomputed when the file changes.
+    """
+    stat = os.stat(path)
+    manifest_path = os.path.join(cache_dir, 'manifest.json') if cache_dir else None
+    manifest = {}
+    key = os.path.abspath(path)
+
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        entry = manifest.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['hash']
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    content_hash = digest.hexdigest()
+
+    if manifest_path:
+        manifest[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}
+        tmp_path = _private_tmp(manifest_path)
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    return content_hash
+
+
+def code_version(*paths):
+    """Hash of the ``.py`` sources in ``paths`` (files or directories) and the pandas version."""
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, '*.py'))) if os.path.isdir(path) else [path])
+    digest = hashlib.blake2b(pd.__version__.encode(), digest_size=8)
+    for path in files:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _entry_key(data_hash, code, section, parameters):
+    fields = {'data': data_hash, 'code': code, 'section': section, 'parameters': parameters or {}}
+    text = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+# ==========================================
+# SERIALISATION
+# ==========================================
+class _Frame:
+    """Placeholder left in the pickled result for a DataFrame/Series stored as Parquet."""
+
+    def __init__(self, filename, series_name=None, is_series=False):
+        self.filename = filename
+        self.series_name = series_name
+        self.is_series = is_series
+
+
+def _to_parquet(frame, path):
+    """Write ``frame`` to ``path``; False if Parquet cannot represent it faithfully."""
+    columns = frame.columns
+    # Parquet only restores plain string column labels (not categorical or
+    # multi-level ones, as from crosstabs)
+    if isinstance(columns, pd.MultiIndex) or isinstance(columns.dtype, pd.CategoricalDtype) \
+            or not all(isinstance(label, str) for label in columns):
+        return False
+    try:
+        frame.to_parquet(path)
+        return True
+    except Exception:
+        # No pyarrow, or a column it cannot hold (intervals, mixed objects);
+        # pyarrow raises its own error types for these
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+
+
+def _dehydrate(value, entry_dir, counter):
+    """Swap the frames in ``value`` for ``_Frame`` placeholders, writing them as Parquet."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        filename = f'frame-{len(counter)}.parquet'
+        counter.append(filename)
+        is_series = isinstance(value, pd.Series)
+        frame = value.to_frame('value') if is_series else value
+        if _to_parquet(frame, os.path.join(entry_dir, filename)):
+            return _Frame(filename, value.name if is_series else None, is_series)
+        counter.pop()
+        return value
+    if isinstance(value, dict):
+        return {k: _dehydrate(v, entry_dir, counter) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and type(value) in (list, tuple):
+        return type(value)(_dehydrate(v, entry_dir, counter) for v in value)
+    return value
+
+
+def _hydrate(value, entry_dir):
+    if isinstance(value, _Frame):
+        frame = pd.read_parquet(os.path.join(entry_dir, value.filename))
+        if value.is_series:
+            return frame['value'].rename(value.series_name)
+        return frame
+    if isinstance(value, dict):
+        return {k: _hydrate(v, entry_dir) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and type(value) in (list, tuple):
+        return type(value)(_hydrate(v, entry_dir) for v in value)
+    return value
+
+
+class _Tee(io.TextIOBase):
+    """Writes to the current thread's output and keeps a copy for the cache entry."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.copy = io.StringIO()
+
+    def write(self, text):
+        self.copy.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+# ==========================================
+# CACHE
+# ==========================================
+class ResultCache:
+    """Size-bounded LRU cache of section results for one input file.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Where entries live.
+    data_hash : str
+        Content hash of the analysed file (see ``file_hash``).
+    code : str
+        Code version stamp (see ``code_version``).
+    max_mb : float
+        Total size the cache is trimmed back to after each store.
+    enabled : bool
+        When False every section simply runs; nothing is read or written.
+    """
+
+    def __init__(self, cache_dir, data_hash=None, code=None, max_mb=DEFAULT_MAX_MB, enabled=True):
+        self.cache_dir = cache_dir
+        self.data_hash = data_hash
+        self.code = code
+        self.max_bytes = max_mb * 2 ** 20
+        self.enabled = enabled
+        self.hits = self.misses = self.evicted = 0
+        self.outcomes = {}
+        self._lock = threading.RLock()       # sections may finish on several threads at once
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._read_index() if enabled else {}
+
+    @classmethod
+    def for_file(cls, path, code_paths, cache_dir=None, max_mb=DEFAULT_MAX_MB, enabled=True):
+        """Cache for ``path``, in ``.results_cache`` next to it unless ``cache_dir`` is given."""
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+        if not enabled:
+            return cls(cache_dir, enabled=False)
+        os.makedirs(cache_dir, exist_ok=True)
+        return cls(cache_dir, file_hash(path, cache_dir), code_version(*code_paths), max_mb)
+
+    # Index ------------------------------------------------------------
+    def _read_index(self):
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        # Entries whose directory went missing are dropped, and entry
+        # directories the index lost are added back from their own record
+        index = {key: entry for key, entry in index.items() if os.path.isdir(os.path.join(self.cache_dir, key))}
+        for record in glob.glob(os.path.join(self.cache_dir, '*', ENTRY_FILE)):
+            key = os.path.basename(os.path.dirname(record))
+            if key in index or key.endswith('.tmp'):
+                continue
+            try:
+                with open(record) as f:
+                    index[key] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        return index
+
+    @contextlib.contextmanager
+    def _locked_index(self):
+        """Hold the index lock and refresh ``self._index`` from disk; write it back on exit.
+
+        Only called from ``run``, ``_store``, ``invalidate`` and ``clear``,
+        never nested (a second ``flock`` from this process would block).
+        """
+        with self._lock:
+            if fcntl is None:
+                self._index = self._read_index()
+                yield self._index
+                self._write_index()
+                return
+            with open(os.path.join(self.cache_dir, LOCK_FILE), 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._index = self._read_index()
+                    yield self._index
+                    self._write_index()
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_index(self):
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _remove(self, key):
+        self._index.pop(key, None)
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda key: self._index[key]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._remove(key)
+            self.evicted += 1
+
+    # Lookup and store -------------------------------------------------
+    def key(self, section, parameters=None):
+        return _entry_key(self.data_hash, self.code, section, parameters)
+
+    def contains(self, section, parameters=None):
+        return self.enabled and self.key(section, parameters) in self._index
+
+    def _load(self, key, output_dir):
+        entry_dir = os.path.join(self.cache_dir, key)
+        with open(os.path.join(entry_dir, 'result.pkl'), 'rb') as f:
+            result = _hydrate(pickle.load(f), entry_dir)
+        with open(os.path.join(entry_dir, 'stdout.txt')) as f:
+            report = f.read()
+        files_dir = os.path.join(entry_dir, 'files')
+        if os.path.isdir(files_dir):
+            os.makedirs(output_dir, exist_ok=True)
+            for name in os.listdir(files_dir):
+                shutil.copy2(os.path.join(files_dir, name), os.path.join(output_dir, name))
+        return result, report
+
+    def _store(self, key, section, parameters, result, report, files):
+        entry_dir = os.path.join(self.cache_dir, key)
+        # Private to this process and thread: another run may be storing the same entry
+        tmp_dir = _private_tmp(entry_dir)
+        os.makedirs(tmp_dir)
+        try:
+            with open(os.path.join(tmp_dir, 'result.pkl'), 'wb') as f:
+                pickle.dump(_dehydrate(result, tmp_dir, []), f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(os.path.join(tmp_dir, 'stdout.txt'), 'w') as f:
+                f.write(report)
+            if files:
+                os.makedirs(os.path.join(tmp_dir, 'files'))
+                for path in files:
+                    shutil.copy2(path, os.path.join(tmp_dir, 'files', os.path.basename(path)))
+            entry = {'section': section, 'data': self.data_hash, 'parameters': parameters or {},
+                     'size': _directory_size(tmp_dir), 'last_used': time.time()}
+            with open(os.path.join(tmp_dir, ENTRY_FILE), 'w') as f:
+                json.dump(entry, f, default=str)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # An unpicklable result or a full disk only costs the cache entry
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        with self._locked_index() as index:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            index[key] = entry
+            self._evict()
+
+    def run(self, section, function, parameters=None, output_dir='.', files=None):
+        """Return ``function()``'s result for ``section``, from the cache when possible.
+
+        Parameters
+        ----------
+        section : str
+        function : callable
+            Zero-argument callable computing the section.
+        parameters : dict, optional
+            Everything besides the data and code that changes the result.
+        output_dir : str
+            Where the files of a cached section are restored.
+        files : callable, optional
+            Maps the result to the paths of the files the section wrote,
+            which are stored with the entry.
+        """
+        if not self.enabled:
+            return function()
+        key = self.key(section, parameters)
+        with self._locked_index() as index:
+            if key in index:
+                try:
+                    result, report = self._load(key, output_dir)
+                except Exception:
+                    # A damaged or unreadable entry is recomputed
+                    self._remove(key)
+                else:
+                    sys.stdout.write(report)
+                    index[key]['last_used'] = time.time()
+                    self.hits += 1
+                    self.outcomes[section] = 'hit'
+                    return result
+
+        tee = _Tee(current_output())
+        with redirect_output(tee):
+            result = function()
+        with self._lock:
+            self.misses += 1
+            self.outcomes[section] = 'miss'
+        self._store(key, section, parameters, result, tee.copy.getvalue(), files(result) if files else None)
+        return result
+
+    # Invalidation -----------------------------------------------------
+    def invalidate(self, sections=None, data_hash=None):
+        """Drop the entries of ``sections`` (all sections if None), optionally only for one input file."""
+        if not self.enabled:
+            return 0
+        sections = None if sections is None or 'all' in sections else set(sections)
+        removed = 0
+        with self._locked_index() as index:
+            for key, entry in list(index.items()):
+                if sections is not None and entry['section'] not in sections:
+                    continue
+                if data_hash is not None and entry['data'] != data_hash:
+                    continue
+                self._remove(key)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every entry, for any input file."""
+        if not self.enabled:
+            return
+        with self._locked_index() as index:
+            for key in list(index):
+                self._remove(key)
+            for path in glob.glob(os.path.join(self.cache_dir, '*.tmp')):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evicted': self.evicted,
+            'entries': len(self._index),
+            'size_mb': sum(entry['size'] for entry in self._index.values()) / 2 ** 20,
+            'sections': dict(self.outcomes),
+        }
+
+    def print_summary(self):
+        if self.enabled:
+            stats = self.stats()
+            print(f"\nResult cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['entries']} entries, {stats['size_mb']:.1f} MB in {self.cache_dir})")
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+def add_cache_arguments(parser):
+    """The ``--no-cache`` / ``--invalidate`` / ``--clear-cache`` options shared by both analyses."""
+    group = parser.add_argument_group('result cache')
+    group.add_argument('--no-cache', action='store_true', help='recompute every section and store nothing')
+    group.add_argument('--cache-dir', default=None, help=f'default: {CACHE_DIRNAME} next to the input file')
+    group.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                       help='evict least recently used entries beyond this size')
+    group.add_argument('--invalidate', action='append', default=[], metavar='SECTION',
+                       help="recompute SECTION for this file (repeatable; 'all' for every section)")
+    group.add_argument('--clear-cache', action='store_true', help='empty the cache before running')
+    return parser
+
+
+def cache_from_args(args, path, code_paths):
+    """Build the run's cache and apply ``--clear-cache`` / ``--invalidate``."""
+    cache = ResultCache.for_file(path, code_paths, args.cache_dir, args.cache_max_mb, enabled=not args.no_cache)
+    if args.clear_cache:
+        cache.clear()
+    if args.invalidate:
+        cache.invalidate(args.invalidate, data_hash=cache.data_hash)
+    return cache
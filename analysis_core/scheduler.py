@@ -0,0 +1,286 @@
+"""
+Section Scheduler
+=================
+Runs the steps of an analysis as a dependency graph, with independent steps
+running at the same time.
+
+Both analyses register every step with ``SectionScheduler.add``: loading,
+cleaning or compaction, shared precomputation, and each numbered section.
+Each step names the steps whose results it reads. It starts as soon as
+those have finished and receives their results as keyword arguments.
+
+Steps run on a thread pool rather than a process pool. The loaded frame is
+then shared by every section without being pickled or copied, and NumPy,
+pandas and scipy release the GIL inside most of their compiled kernels.
+The sections only read the frame; none of them modifies it.
+
+While steps run in parallel, ``sys.stdout`` is replaced by a proxy that
+sends each thread's output to the buffer of the step it is running. The
+buffers are written out in registration order. Each is written as soon as
+its step and every step registered before it have finished, so the report
+reads exactly as a sequential run prints it. With one worker the steps run
+one after the other on the calling thread and print directly, as before.
+
+``summary`` gives each step's start and end, the overlap achieved and the
+critical path: the chain of dependent steps with the most measured time,
+which no number of workers can shorten.
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+
+# ==========================================
+# THREAD-ROUTED OUTPUT
+# ==========================================
+class _RoutedStdout(io.TextIOBase):
+    """``sys.stdout`` stand-in writing to the stream set for the current thread."""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def stream(self):
+        stream = getattr(self.local, 'stream', None)
+        return self.default if stream is None else stream
+
+    @property
+    def encoding(self):
+        return getattr(self.default, 'encoding', None)
+
+    def write(self, text):
+        return self.stream().write(text)
+
+    def flush(self):
+        self.stream().flush()
+
+
+def current_output():
+    """The stream ``print`` writes to on this thread."""
+    stdout = sys.stdout
+    return stdout.stream() if isinstance(stdout, _RoutedStdout) else stdout
+
+
+@contextlib.contextmanager
+def redirect_output(stream):
+    """``contextlib.redirect_stdout`` that only redirects this thread while steps run in parallel."""
+    stdout = sys.stdout
+    if not isinstance(stdout, _RoutedStdout):
+        with contextlib.redirect_stdout(stream):
+            yield stream
+        return
+    previous = getattr(stdout.local, 'stream', None)
+    stdout.local.stream = stream
+    try:
+        yield stream
+    finally:
+        stdout.local.stream = previous
+
+
+# ==========================================
+# SCHEDULER
+# ==========================================
+@dataclass
+class Step:
+    """A registered step and, once run, its outcome and timing (seconds from the start of the run)."""
+    name: str
+    function: object
+    after: tuple = ()
+    status: str = 'pending'
+    result: object = None
+    error: BaseException = None
+    started: float = None
+    finished: float = None
+    output: io.StringIO = field(default=None, repr=False)
+
+    @property
+    def seconds(self):
+        return None if self.finished is None else self.finished - self.started
+
+
+class SectionScheduler:
+    """Dependency-aware runner for the steps of one analysis.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Steps run at the same time. Defaults to the CPU count; 1 runs every
+        step in registration order on the calling thread.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = max(1, os.cpu_count() or 1) if workers is None else max(1, workers)
+        self.steps = {}
+        self.wall_seconds = None
+        self._start = None
+
+    def add(self, name, function, after=()):
+        """Register ``function`` as step ``name``, run once every step in ``after`` has finished.
+
+        ``function`` is called with the results of ``after`` as keyword
+        arguments named after those steps. Steps must be registered after
+        the steps they depend on, so registration order is a valid
+        sequential order and the graph cannot have cycles.
+        """
+        if name in self.steps:
+            raise ValueError(f"Step {name!r} is already registered")
+        missing = [dependency for dependency in after if dependency not in self.steps]
+        if missing:
+            raise ValueError(f"Step {name!r} depends on {missing}, which are not registered before it")
+        self.steps[name] = Step(name, function, tuple(after))
+
+    def run(self):
+        """Run every step; returns step name -> result.
+
+        If a step raises, no further steps are started, the steps already
+        running finish, every finished step's output is printed and the
+        error of the earliest registered failing step is re-raised.
+        """
+        self._start = time.perf_counter()
+        try:
+            if self.workers == 1 or len(self.steps) <= 1:
+                self._run_inline()
+            else:
+                self._run_parallel()
+        finally:
+            self.wall_seconds = time.perf_counter() - self._start
+            for step in self.steps.values():
+                if step.status == 'pending':
+                    step.status = 'skipped'
+        return {name: step.result for name, step in self.steps.items()}
+
+    def _call(self, step):
+        step.status = 'running'
+        step.started = time.perf_counter() - self._start
+        try:
+            step.result = step.function(**{name: self.steps[name].result for name in step.after})
+            step.status = 'ok'
+        except Exception as exc:
+            step.status, step.error = 'error', exc
+        finally:
+            step.finished = time.perf_counter() - self._start
+
+    def _run_inline(self):
+        for step in self.steps.values():
+            self._call(step)
+            if step.error is not None:
+                raise step.error
+
+    def _run_buffered(self, routed, step):
+        routed.local.stream = step.output
+        try:
+            self._call(step)
+        finally:
+            routed.local.stream = None
+
+    def _ready(self, step):
+        return all(self.steps[name].status == 'ok' for name in step.after)
+
+    def _run_parallel(self):
+        order = list(self.steps.values())
+        pending = list(order)
+        running = set()
+        printed = 0
+        failed = False
+        stdout = sys.stdout
+        routed = _RoutedStdout(stdout)
+        sys.stdout = routed
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix='section') as pool:
+                while True:
+                    # Start every ready step, earliest registered first; the pool queues the excess
+                    for step in [step for step in pending if not failed and self._ready(step)]:
+                        pending.remove(step)
+                        step.output = io.StringIO()
+                        step.status = 'running'
+                        running.add(pool.submit(self._run_buffered, routed, step))
+                    if not running:
+                        break
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    failed = failed or any(step.status == 'error' for step in order)
+                    printed = self._print_finished(order, printed, stdout)
+        finally:
+            sys.stdout = stdout
+            self._print_finished(order, printed, stdout, everything=True)
+        for step in order:
+            if step.error is not None:
+                raise step.error
+
+    @staticmethod
+    def _print_finished(order, printed, stream, everything=False):
+        """Write the buffered output of the finished steps that follow the ones already printed."""
+        while printed < len(order):
+            step = order[printed]
+            if step.status in ('pending', 'running') and not everything:
+                break
+            if step.output is not None:
+                stream.write(step.output.getvalue())
+                step.output = None
+            printed += 1
+        stream.flush()
+        return printed
+
+    # Reporting --------------------------------------------------------
+    def critical_path(self):
+        """The chain of dependent steps with the most measured time: ``(step names, seconds)``."""
+        length, previous = {}, {}
+        for name, step in self.steps.items():
+            if step.seconds is None:
+                continue
+            inputs = [dependency for dependency in step.after if dependency in length]
+            longest = max(inputs, key=length.get, default=None)
+            previous[name] = longest
+            length[name] = step.seconds + (length[longest] if longest else 0.0)
+        if not length:
+            return [], 0.0
+        name = end = max(length, key=length.get)
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], length[end]
+
+    def summary(self):
+        """The run as a JSON-serialisable dict (for the instrumentation report)."""
+        path, path_seconds = self.critical_path()
+        step_seconds = sum(step.seconds or 0.0 for step in self.steps.values())
+        return {
+            'workers': self.workers,
+            'wall_seconds': self.wall_seconds,
+            'step_seconds': step_seconds,
+            'overlap': step_seconds / self.wall_seconds if self.wall_seconds else None,
+            'critical_path': [{'step': name, 'seconds': self.steps[name].seconds} for name in path],
+            'critical_path_seconds': path_seconds,
+            'steps': [{'step': step.name, 'after': list(step.after), 'status': step.status,
+                       'started': step.started, 'finished': step.finished} for step in self.steps.values()],
+        }
+
+
+def print_schedule(summary):
+    """Print the workers, overlap and critical path of a ``SectionScheduler.summary``."""
+    print(f"\nSchedule: {summary['workers']} worker(s), {summary['wall_seconds']:.3f}s wall for "
+          f"{summary['step_seconds']:.3f}s of steps ({summary['overlap'] or 0:.2f}x overlap)")
+    chain = ' -> '.join(f"{item['step']} ({item['seconds']:.3f}s)" for item in summary['critical_path'])
+    print(f"Critical path ({summary['critical_path_seconds']:.3f}s): {chain}")
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+def add_scheduler_arguments(parser):
+    """The ``--section-workers`` option shared by both analyses."""
+    group = parser.add_argument_group('scheduling')
+    group.add_argument('--section-workers', type=int, default=None, metavar='N',
+                       help='steps run at the same time (default: CPU count; 1 runs them in order; '
+                            '--memory tracemalloc and --profile always run them in order)')
+    return parser
+
@@ -0,0 +1,264 @@
+"""
+Attrition Cube
+==============
+Attrition counts and rates for every categorical dimension, and for every
+pair of dimensions, computed in one vectorized pass over the employees.
+
+``Attrition`` is compared with 'Yes' once, into a boolean array. Each
+dimension is encoded once as integer codes: categoricals use their codes,
+and other columns are factorized with sorted levels, so tables come out in
+the same order as ``groupby``.
+
+The single pass over the employees builds the finest cuboid: one
+mixed-radix key per employee over all dimensions, with employees and
+leavers counted per distinct profile. Every coarser table is then derived
+from these profiles rather than from the employees, as in classic data-cube
+computation. Every (dimension, level) and every (pair, level, level) cell
+gets a slot in one flat array, and one weighted ``np.bincount`` per block of
+profiles fills them all. The work after the first pass scales with the
+number of distinct profiles, which stays far below the head count of large
+HRIS exports because the dimensions are low-cardinality and correlated.
+
+Pair tables keep only the cells with at least ``min_support`` employees.
+``pair('OverTime', 'JobRole')``, ``cell(OverTime='Yes', JobRole=...)`` and
+``top_combinations()`` are then lookups, with no groupby over the employees.
+Missing values are left out, as ``groupby`` does, and so are levels no
+employee has.
+
+Usage:
+    python attrition_cube.py [--data WA_Fn-UseC_-HR-Employee-Attrition.csv] [--min-support 20] [--top 15]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+MIN_SUPPORT = 20
+BLOCK_ROWS = 1 << 15
+COUNT_COLUMNS = ['employees', 'left', 'rate_pct']
+
+
+def encode_dimension(series):
+    """Integer codes (-1 for missing) and levels of one dimension, in ``groupby`` order."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64), series.cat.categories
+    codes, levels = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), pd.Index(levels)
+
+
+def _level_label(value):
+    """Display label of a level (survey answers loaded as floats print as integers)."""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _profiles(codes, sizes, left):
+    """Distinct level combinations (the finest cuboid) with their employee and leaver counts.
+
+    Every coarser table is a sum over these profiles, so the per-cell work
+    scales with the number of distinct profiles instead of employees.
+    """
+    key, radix = np.zeros(len(codes), dtype=np.int64), 1
+    for position, size in enumerate(sizes):
+        if radix * int(size) >= 2 ** 62:       # re-number the key before it overflows
+            key, uniques = pd.factorize(key)
+            radix = len(uniques)
+        key = key * size + codes[:, position]
+        radix *= int(size)
+    profile, uniques = pd.factorize(key)
+    first = np.empty(len(uniques), dtype=np.int64)
+    first[profile[::-1]] = np.arange(len(profile))[::-1]
+    return codes[first], np.bincount(profile, minlength=len(uniques)), \
+        np.bincount(profile, weights=left, minlength=len(uniques))
+
+
+def _count_table(employees, left, index):
+    """Employees, leavers and attrition rate per cell (cells already filtered)."""
+    return pd.DataFrame({'employees': employees, 'left': left, 'rate_pct': left / employees * 100}, index=index)
+
+
+class AttritionCube:
+    """Precomputed attrition counts per dimension and per pair of dimensions.
+
+    Build it with ``AttritionCube.build``; the tables are then plain lookups.
+
+    Parameters
+    ----------
+    tables : dict
+        Dimension -> DataFrame (``employees``, ``left``, ``rate_pct``) indexed
+        by its levels.
+    pairs : dict
+        ``(dimension_a, dimension_b)`` -> DataFrame with the same columns,
+        indexed by (level_a, level_b), cells below ``min_support`` removed.
+    employees, left : int
+        Totals over all employees.
+    target, positive : str
+        Target column and the value counted as leaving.
+    min_support : int
+        Minimum employees per pair cell.
+    """
+
+    def __init__(self, tables, pairs, employees, left, target='Attrition', positive='Yes', min_support=MIN_SUPPORT):
+        self.tables = tables
+        self.pairs = pairs
+        self.employees = employees
+        self.left = left
+        self.target = target
+        self.positive = positive
+        self.min_support = min_support
+
+    @classmethod
+    def build(cls, df, dimensions, target='Attrition', positive='Yes', min_support=MIN_SUPPORT,
+              block_rows=BLOCK_ROWS):
+        """Count every dimension and every pair of ``dimensions`` in one pass over ``df``."""
+        left = (df[target] == positive).fillna(False).to_numpy(dtype=bool)
+        encoded = [encode_dimension(df[dimension]) for dimension in dimensions]
+        # Missing values get one extra level per dimension, dropped at the end
+        sizes = np.array([len(levels) + 1 for _, levels in encoded], dtype=np.int64)
+        codes = np.empty((len(df), len(dimensions)), dtype=np.int64)
+        for position, (code, _) in enumerate(encoded):
+            codes[:, position] = np.where(code < 0, sizes[position] - 1, code)
+        codes, employees_per, leavers_per = _profiles(codes, sizes, left)
+
+        # Flat slot layout: the levels of every dimension, then the level
+        # grid of every pair
+        pair_index = list(combinations(range(len(dimensions)), 2))
+        first = np.array([a for a, _ in pair_index], dtype=np.int64)
+        second = np.array([b for _, b in pair_index], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(np.concatenate([sizes, sizes[first] * sizes[second]]))])
+
+        employees = np.zeros(starts[-1])
+        leavers = np.zeros(starts[-1])
+        for start in range(0, len(codes), block_rows):
+            block = codes[start:start + block_rows]
+            slots = np.concatenate([block, block[:, first] * sizes[second] + block[:, second]], axis=1) + starts[:-1]
+            employees += np.bincount(slots.ravel(), np.repeat(employees_per[start:start + block_rows], slots.shape[1]),
+                                     minlength=starts[-1])
+            leavers += np.bincount(slots.ravel(), np.repeat(leavers_per[start:start + block_rows], slots.shape[1]),
+                                   minlength=starts[-1])
+        employees, leavers = np.rint(employees).astype(np.int64), np.rint(leavers).astype(np.int64)
+
+        def cells(position, shape, min_employees):
+            """Kept cells of one table (missing levels dropped) as (positions, employees, leavers)."""
+            grid = (slice(None, -1),) * len(shape)
+            counts = [values[starts[position]:starts[position + 1]].reshape(shape)[grid]
+                      for values in (employees, leavers)]
+            kept = np.nonzero(counts[0] >= min_employees)
+            return kept, counts[0][kept], counts[1][kept]
+
+        tables = {}
+        for position, (dimension, (_, levels)) in enumerate(zip(dimensions, encoded)):
+            (kept,), counts, lefts = cells(position, (sizes[position],), 1)
+            tables[dimension] = _count_table(counts, lefts, levels[kept].rename(dimension))
+        pairs = {}
+        for position, (a, b) in enumerate(pair_index, start=len(dimensions)):
+            kept, counts, lefts = cells(position, (sizes[a], sizes[b]), max(min_support, 1))
+            index = pd.MultiIndex(levels=[encoded[a][1], encoded[b][1]], codes=kept,
+                                  names=[dimensions[a], dimensions[b]], verify_integrity=False)
+            pairs[dimensions[a], dimensions[b]] = _count_table(counts, lefts, index)
+        return cls(tables, pairs, len(df), int(left.sum()), target, positive, min_support)
+
+    # Lookups ----------------------------------------------------------
+    @property
+    def dimensions(self):
+        return list(self.tables)
+
+    @property
+    def rate_pct(self):
+        return self.left / self.employees * 100 if self.employees else np.nan
+
+    def table(self, dimension):
+        """Employees, leavers and attrition rate per level of ``dimension``."""
+        return self.tables[dimension]
+
+    def rate(self, dimension):
+        """Attrition rate (%) per level, like ``groupby(dimension)[target].apply(share of positive)``."""
+        return self.tables[dimension]['rate_pct'].rename(self.target)
+
+    def shares(self, dimension, negative='No'):
+        """Percentage staying and leaving per level, like ``crosstab(..., normalize='index') * 100``."""
+        table = self.tables[dimension]
+        shares = pd.DataFrame({negative: (table['employees'] - table['left']) / table['employees'] * 100,
+                               self.positive: table['left'] / table['employees'] * 100})
+        shares.columns.name = self.target
+        return shares
+
+    def pair(self, a, b):
+        """Cells of the ``a`` x ``b`` drill-down with at least ``min_support`` employees."""
+        if (a, b) in self.pairs:
+            return self.pairs[a, b]
+        if (b, a) in self.pairs:
+            return self.pairs[b, a].swaplevel().sort_index()
+        raise KeyError(f"No pair table for {a!r} x {b!r}; dimensions are {self.dimensions}")
+
+    def cell(self, **levels):
+        """Counts of one level (one keyword) or one pair of levels (two keywords).
+
+        Returns ``None`` when the cell is empty or below ``min_support``.
+        """
+        if len(levels) == 1:
+            (dimension, level), = levels.items()
+            table = self.tables[dimension]
+            return table.loc[level].to_dict() if level in table.index else None
+        if len(levels) == 2:
+            (a, level_a), (b, level_b) = levels.items()
+            table = self.pair(a, b)
+            return table.loc[(level_a, level_b)].to_dict() if (level_a, level_b) in table.index else None
+        raise ValueError("cell() takes one or two dimension=level keywords")
+
+    def combinations(self):
+        """All pair cells in long form, with the lift over the overall rate."""
+        frames = []
+        for (a, b), table in self.pairs.items():
+            if len(table):
+                frames.append(pd.DataFrame({
+                    'dimension_a': a, 'level_a': [_level_label(level) for level in table.index.get_level_values(0)],
+                    'dimension_b': b, 'level_b': [_level_label(level) for level in table.index.get_level_values(1)],
+                    **{column: table[column].to_numpy() for column in COUNT_COLUMNS}}))
+        columns = ['dimension_a', 'level_a', 'dimension_b', 'level_b'] + COUNT_COLUMNS
+        long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        long['lift'] = long['rate_pct'] / self.rate_pct
+        return long
+
+    def top_combinations(self, n=10, ascending=False):
+        """The ``n`` pair cells with the highest (or lowest) attrition rate."""
+        return (self.combinations().sort_values(['rate_pct', 'employees'], ascending=[ascending, False], kind='stable')
+                .head(n).reset_index(drop=True))
+
+
+def print_combinations(table, title):
+    print(f"\n{title}")
+    shown = table.assign(combination=table['dimension_a'] + '=' + table['level_a'] + ' & '
+                         + table['dimension_b'] + '=' + table['level_b'])
+    print(shown.set_index('combination')[COUNT_COLUMNS + ['lift']].round(2).to_string())
+
+
+def main(argv=None):
+    from hr_attrition_analysis import CUBE_DIMENSIONS, DATA_FILE, load_data
+
+    parser = argparse.ArgumentParser(description='Attrition rates per dimension and per pair of dimensions.')
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--min-support', type=int, default=MIN_SUPPORT, help='minimum employees per pair cell')
+    parser.add_argument('--top', type=int, default=15, help='combinations listed')
+    args = parser.parse_args(argv)
+
+    cube = AttritionCube.build(load_data(args.data), CUBE_DIMENSIONS, min_support=args.min_support)
+    print("=" * 80)
+    print("ATTRITION CUBE")
+    print("=" * 80)
+    cells = sum(len(table) for table in cube.pairs.values())
+    print(f"\nEmployees: {cube.employees:,}, attrition rate: {cube.rate_pct:.2f}%")
+    print(f"Dimensions: {len(cube.dimensions)}, pairs: {len(cube.pairs)}, "
+          f"pair cells with at least {cube.min_support} employees: {cells:,}")
+    print_combinations(cube.top_combinations(args.top), f"Highest attrition ({args.top} combinations):")
+    print_combinations(cube.top_combinations(args.top, ascending=True), f"Lowest attrition ({args.top} combinations):")
+
+
+if __name__ == '__main__':
+    main()
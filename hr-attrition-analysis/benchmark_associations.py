@@ -0,0 +1,128 @@
+"""
+Association Matrix Benchmark
+============================
+Times ``analysis_core.association.association_matrix`` on exports of
+growing width. The baseline is the pair-by-pair loop: ``Series.corr`` for
+numeric pairs, a ``groupby`` per numeric x categorical pair for the
+correlation ratio, and ``pd.crosstab`` plus ``scipy.stats.chi2_contingency``
+per categorical pair for the bias-corrected Cramer's V.
+
+Wide exports are built from synthetic employees by adding row-shuffled
+copies of the HR columns (``<column>_<copy>``), so every width keeps the
+export's mix of numeric and categorical columns. The loop is timed up to
+``NAIVE_MAX_PAIRS`` column pairs and extrapolated per pair beyond that.
+Where it runs, every entry is checked against it (``identical``: largest
+absolute difference below 1e-9).
+
+Usage:
+    python benchmark_associations.py [--rows 10000] [--columns 32 100 300] [--workers 1]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from hr_attrition_analysis import ASSOCIATION_EXCLUDE, COMPACT_SCHEMA, CONSTANT_COLUMNS
+from analysis_core.association import association_matrix
+from analysis_core.compaction import compact_frame
+from analysis_core.significance import split_columns
+from synthetic_employees import generate_employees, load_source
+
+NAIVE_MAX_PAIRS = 6_000
+TOLERANCE = 1e-9
+
+
+def make_wide_employees(n, width, seed):
+    """``n`` synthetic employees, compacted, widened to ``width`` columns with row-shuffled copies."""
+    df = generate_employees(load_source(), n, seed=seed)
+    df['AgeGroup'] = pd.cut(df['Age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
+    df = compact_frame(df, COMPACT_SCHEMA, droppable=CONSTANT_COLUMNS)[0]
+    df = df.drop(columns=[column for column in ASSOCIATION_EXCLUDE if column in df.columns])
+    base = list(df.columns)
+    rng = np.random.default_rng(seed)
+    copies = {}
+    for position in range(max(width - len(base), 0)):
+        column = base[position % len(base)]
+        copies[f'{column}_{position // len(base) + 1}'] = df[column].to_numpy()[rng.permutation(n)]
+    return pd.concat([df[base[:width]], pd.DataFrame(copies, index=df.index)], axis=1)
+
+
+def naive_associations(df):
+    """Pair-by-pair Pearson, groupby correlation ratio and crosstab Cramer's V."""
+    numeric, categorical = split_columns(df)
+    names = numeric + categorical
+    matrix = pd.DataFrame(np.eye(len(names)), index=names, columns=names)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            if a in numeric and b in numeric:
+                value = df[a].corr(df[b])
+            elif a in numeric or b in numeric:
+                x, group = (a, b) if a in numeric else (b, a)
+                pair = df[[x, group]].dropna()
+                mean = pair[x].mean()
+                levels = pair.groupby(group, observed=True)[x].agg(['mean', 'size'])
+                between = (levels['size'] * (levels['mean'] - mean) ** 2).sum()
+                value = np.sqrt(between / ((pair[x] - mean) ** 2).sum())
+            else:
+                table = pd.crosstab(df[a], df[b]).to_numpy()
+                chi2 = stats.chi2_contingency(table, correction=False)[0]
+                n, (r, k) = table.sum(), table.shape
+                phi2 = max(0.0, chi2 / n - (k - 1) * (r - 1) / (n - 1))
+                r, k = r - (r - 1) ** 2 / (n - 1), k - (k - 1) ** 2 / (n - 1)
+                value = np.sqrt(phi2 / min(r - 1, k - 1))
+            matrix.loc[a, b] = matrix.loc[b, a] = value
+    return matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the association matrix against a pair-by-pair loop.')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--columns', type=int, nargs='+', default=[32, 100, 300])
+    parser.add_argument('--workers', type=int, default=1, help='threads sharing the column-block jobs')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"ASSOCIATION MATRIX BENCHMARK ({args.rows:,} employees)")
+    print("=" * 80)
+
+    rows = []
+    naive_rate = None
+    for width in args.columns:
+        df = make_wide_employees(args.rows, width, args.seed)
+        start = time.perf_counter()
+        matrix, kinds = association_matrix(df, workers=args.workers)
+        elapsed = time.perf_counter() - start
+
+        pairs = len(kinds) * (len(kinds) - 1) // 2
+        row = {'columns': len(kinds), 'categorical': int((kinds == 'categorical').sum()), 'pairs': pairs,
+               'engine_s': elapsed}
+        if pairs <= NAIVE_MAX_PAIRS:
+            start = time.perf_counter()
+            naive = naive_associations(df)
+            row['naive_s'] = time.perf_counter() - start
+            naive_rate = row['naive_s'] / pairs
+            difference = np.abs(matrix.loc[naive.index, naive.columns].to_numpy() - naive.to_numpy())
+            row['max_abs_diff'] = float(np.nanmax(difference))
+            row['identical'] = row['max_abs_diff'] < TOLERANCE
+        elif naive_rate is not None:
+            row['naive_s'] = naive_rate * pairs
+            row['identical'] = 'n/a (extrapolated)'
+        if 'naive_s' in row:
+            row['speedup'] = row['naive_s'] / elapsed
+        rows.append(row)
+        print(f"  {len(kinds):>5} columns ({pairs:,} pairs): engine {elapsed:7.3f}s")
+
+    results = pd.DataFrame(rows).set_index('columns')
+    print("\nResults:")
+    print(results.to_string(float_format=lambda value: f'{value:.3g}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Attrition Cube Benchmark
+========================
+Times ``attrition_cube.AttritionCube.build`` on synthetic employee exports of
+growing size. The baseline is the per-feature approach it replaces:
+``groupby(feature)['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)``
+for every dimension, and ``groupby([a, b])`` with the same lambda for every
+pair.
+
+Both run on the compacted frame, as in the analysis. The baseline is timed
+on the smaller sizes and extrapolated linearly for the larger ones. Where it
+runs, every rate and every pair cell above the minimum support is checked
+against the cube.
+
+Usage:
+    python benchmark_attrition_cube.py [--sizes 10000 100000 1000000 3000000] [--min-support 20]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from attrition_cube import MIN_SUPPORT, AttritionCube
+from hr_attrition_analysis import COMPACT_SCHEMA, CONSTANT_COLUMNS, CUBE_DIMENSIONS
+from analysis_core.compaction import compact_frame
+from synthetic_employees import generate_employees, load_source
+
+NAIVE_MAX = 100_000
+
+
+def make_employees(n, seed):
+    """``n`` synthetic employees with the derived columns of ``load_data``, compacted."""
+    df = generate_employees(load_source(), n, seed=seed)
+    df['AgeGroup'] = pd.cut(df['Age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
+    return compact_frame(df, COMPACT_SCHEMA, droppable=CONSTANT_COLUMNS)[0]
+
+
+def naive_rates(df, min_support):
+    """Per-dimension and per-pair ``groupby.apply`` rates, as the analysis computed them."""
+    def rate(x):
+        return (x == 'Yes').sum() / len(x) * 100
+
+    rates = {dimension: df.groupby(dimension)['Attrition'].apply(rate) for dimension in CUBE_DIMENSIONS}
+    pairs = {}
+    for position, a in enumerate(CUBE_DIMENSIONS):
+        for b in CUBE_DIMENSIONS[position + 1:]:
+            grouped = df.groupby([a, b])['Attrition']
+            pair = grouped.apply(rate)
+            pairs[a, b] = pair[grouped.size().reindex(pair.index) >= min_support]
+    return rates, pairs
+
+
+def matches(cube, rates, pairs):
+    """Whether the cube reproduces every naive rate and pair cell."""
+    for dimension, expected in rates.items():
+        got = cube.rate(dimension)
+        if not (got.index.equals(expected.index) and np.allclose(got, expected)):
+            return False
+    for key, expected in pairs.items():
+        got = cube.pairs[key]['rate_pct']
+        if not (got.index.equals(expected.index) and np.allclose(got, expected)):
+            return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the attrition cube against groupby.apply.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 3_000_000])
+    parser.add_argument('--min-support', type=int, default=MIN_SUPPORT)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    n_pairs = len(CUBE_DIMENSIONS) * (len(CUBE_DIMENSIONS) - 1) // 2
+    print("=" * 80)
+    print(f"ATTRITION CUBE BENCHMARK ({len(CUBE_DIMENSIONS)} dimensions, {n_pairs} pairs)")
+    print("=" * 80)
+
+    rows = []
+    naive_rate = None
+    for n in args.sizes:
+        df = make_employees(n, args.seed)
+        start = time.perf_counter()
+        cube = AttritionCube.build(df, CUBE_DIMENSIONS, min_support=args.min_support)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for a, b in cube.pairs:
+            cube.pair(b, a)
+        lookup = (time.perf_counter() - start) / len(cube.pairs)
+
+        row = {'employees': n, 'pair_cells': sum(len(table) for table in cube.pairs.values()),
+               'cube_s': build, 'lookup_ms': lookup * 1000}
+        if n <= NAIVE_MAX:
+            start = time.perf_counter()
+            rates, pairs = naive_rates(df, args.min_support)
+            row['naive_s'] = time.perf_counter() - start
+            naive_rate = row['naive_s'] / n
+            row['identical'] = matches(cube, rates, pairs)
+        elif naive_rate is not None:
+            row['naive_s'] = naive_rate * n
+            row['identical'] = 'n/a (extrapolated)'
+        if 'naive_s' in row:
+            row['speedup'] = row['naive_s'] / build
+        rows.append(row)
+        print(f"  {n:>11,} employees: cube {build:7.3f}s")
+
+    results = pd.DataFrame(rows).set_index('employees')
+    print("\nResults:")
+    print(results.round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
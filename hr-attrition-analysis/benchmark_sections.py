@@ -0,0 +1,84 @@
+"""
+Section Benchmark Suite
+=======================
+Times and memory-profiles every numbered section of
+``hr_attrition_analysis.py`` on synthetic employee exports of growing size
+(10k, 1M and 10M rows by default).
+
+For each size the suite generates (or reuses) a file with
+``synthetic_employees``, then profiles ``load`` (CSV parse plus derived
+columns), ``compact``, the shared steps the selected sections read (see
+``SECTION_INPUTS``: ``cube``, the attrition cube; ``survival_counts``, the
+tenure survival counts; ``associations``, the association matrix of the
+correlation and plots sections) and each section in ``SECTIONS``. Each step
+is timed and its peak RSS recorded. The results are saved as JSON (see
+``analysis_core.benchmarking``), and ``--baseline`` compares them with an
+earlier run to flag regressions.
+
+Usage:
+    python benchmark_sections.py [--sizes 10k 1M 10M] [--sections numerical,categorical] [--no-plots]
+    python benchmark_sections.py --sizes 10k 100k --baseline benchmark_results/hr-20251001-120000.json
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.benchmarking import SectionProfiler, add_benchmark_arguments, finish_suite
+from hr_attrition_analysis import (SECTION_INPUTS, SECTIONS, build_associations, build_cube, build_survival,
+                                   compact_data, load_data, parse_sections, section_functions)
+from synthetic_employees import DEFAULT_NULL_RATE, ensure_employees
+
+SUITE = 'hr'
+# How each shared step of ``SECTION_INPUTS`` is built, in run order
+SHARED_STEPS = {'cube': build_cube, 'survival_counts': build_survival, 'associations': build_associations}
+
+
+def profile_size(profiler, path, rows, sections, output_dir):
+    """Profile loading and ``sections`` on one employee export."""
+    labels = {'rows': rows}
+    df = profiler.run('load', lambda: load_data(path), **labels)
+    df, compaction = profiler.run('compact', lambda: compact_data(df), **labels)
+    needed = {step for name in sections for step in SECTION_INPUTS.get(name, [])}
+    shared = {step: profiler.run(step, lambda build=build: build(df), **labels)
+              for step, build in SHARED_STEPS.items() if step in needed}
+    functions = section_functions(df, output_dir, cube=shared.get('cube'), survival=shared.get('survival_counts'),
+                                  associations=shared.get('associations'), compaction=compaction)
+    for name in SECTIONS:
+        if name in sections:
+            profiler.run(name, functions[name], **labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time and memory-profile the HR attrition sections.')
+    add_benchmark_arguments(parser)
+    parser.add_argument('--sections', type=parse_sections, default=None,
+                        help=f"comma-separated sections to profile (default: all): {','.join(SECTIONS)}")
+    parser.add_argument('--no-plots', action='store_true', help="skip the 'plots' section")
+    parser.add_argument('--null-rate', type=float, default=DEFAULT_NULL_RATE, help='share of blank survey answers')
+    args = parser.parse_args(argv)
+
+    sections = args.sections or list(SECTIONS)
+    if args.no_plots:
+        sections = [name for name in sections if name != 'plots']
+
+    print("=" * 80)
+    print("HR ATTRITION SECTION BENCHMARK")
+    print("=" * 80)
+    profiler = SectionProfiler(memory=not args.no_memory)
+    with tempfile.TemporaryDirectory() as output_dir:
+        for rows in args.sizes:
+            path = ensure_employees(args.data_dir, rows, args.seed, args.null_rate)
+            print(f"  {rows:>11,} employees ({os.path.getsize(path) / 2 ** 20:,.0f} MB) ...", flush=True)
+            profile_size(profiler, path, rows, sections, output_dir)
+    finish_suite(args, SUITE, profiler, sections=sections, null_rate=args.null_rate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Significance Engine Benchmark
+=============================
+Times ``analysis_core.significance.significance_tests`` against a loop of
+per-column scipy calls, testing every column of the export against attrition
+on the bundled data and on synthetic exports of growing size.
+
+The loop re-filters the groups for every column and calls
+``scipy.stats.ttest_ind(equal_var=False)``, ``mannwhitneyu`` or
+``chi2_contingency`` per column. Its permutation test reshuffles the labels
+and re-runs those calls for every shuffle. The loop's permutations are timed
+on ``--naive-permutations`` shuffles and scaled up to ``--permutations``.
+``identical`` checks the engine's Welch, Mann-Whitney and chi-square p-values
+against the loop's (relative difference below 1e-9).
+
+Usage:
+    python benchmark_significance.py [--sizes 1470 10000 100000] [--permutations 2000] [--workers 1]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.compaction import compact_frame
+from analysis_core.significance import significance_tests, split_columns
+from hr_attrition_analysis import COMPACT_SCHEMA, CONSTANT_COLUMNS, test_columns
+from synthetic_employees import generate_employees, load_source
+
+TOLERANCE = 1e-9
+
+
+def make_employees(n, seed):
+    """The bundled export for its own size, else ``n`` synthetic employees; compacted."""
+    source = load_source()
+    df = source if n == len(source) else generate_employees(source, n, seed=seed)
+    return compact_frame(df, COMPACT_SCHEMA, droppable=CONSTANT_COLUMNS)[0]
+
+
+def naive_tests(df, columns):
+    """Per-column scipy tests, re-filtering the groups for every column."""
+    numeric, categorical = split_columns(df, columns)
+    p_values = {}
+    for column in numeric:
+        left = df[df['Attrition'] == 'Yes'][column].dropna()
+        stayed = df[df['Attrition'] == 'No'][column].dropna()
+        p_values[column] = (stats.ttest_ind(left, stayed, equal_var=False).pvalue,
+                            stats.mannwhitneyu(left, stayed, method='asymptotic').pvalue)
+    for column in categorical:
+        p_values[column] = (stats.chi2_contingency(pd.crosstab(df[column], df['Attrition'])).pvalue, np.nan)
+    return pd.DataFrame.from_dict(p_values, orient='index', columns=['p_value', 'mw_p'])
+
+
+def naive_permutations(df, columns, n_permutations, seed):
+    """Reshuffle the labels and rerun the per-column statistics for every shuffle."""
+    numeric, categorical = split_columns(df, columns)
+    rng = np.random.default_rng(seed)
+    labels = df['Attrition'].to_numpy()
+    for _ in range(n_permutations):
+        shuffled = rng.permutation(labels)
+        for column in numeric:
+            values = df[column].to_numpy(dtype=float)
+            stats.ttest_ind(values[shuffled == 'Yes'], values[shuffled == 'No'], equal_var=False, nan_policy='omit')
+        for column in categorical:
+            stats.chi2_contingency(pd.crosstab(df[column].to_numpy(), shuffled), correction=False)
+
+
+def relative_difference(a, b):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    both = ~np.isnan(a) & ~np.isnan(b)
+    if (np.isnan(a) != np.isnan(b)).any():
+        return np.inf
+    return float(np.max(np.abs(a[both] - b[both]) / np.maximum(np.abs(b[both]), 1e-300), initial=0.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the batched significance engine against per-column scipy.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1470, 10_000, 100_000])
+    parser.add_argument('--permutations', type=int, default=2000)
+    parser.add_argument('--naive-permutations', type=int, default=20, help='shuffles timed for the loop')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes for the engine')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(f"SIGNIFICANCE ENGINE BENCHMARK ({args.permutations} permutations, {args.workers} worker(s))")
+    print("=" * 80)
+
+    rows = []
+    for n in args.sizes:
+        df = make_employees(n, args.seed)
+        columns = test_columns(df)
+        group = (df['Attrition'] == 'Yes').to_numpy()
+
+        start = time.perf_counter()
+        significance_tests(df, group, columns, n_permutations=0)
+        tests_s = time.perf_counter() - start
+        start = time.perf_counter()
+        engine = significance_tests(df, group, columns, args.permutations, args.seed, args.workers)
+        engine_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        naive = naive_tests(df, columns)
+        naive_tests_s = time.perf_counter() - start
+        start = time.perf_counter()
+        naive_permutations(df, columns, args.naive_permutations, args.seed)
+        naive_perm_s = (time.perf_counter() - start) * args.permutations / args.naive_permutations
+
+        difference = max(relative_difference(engine.loc[naive.index, 'p_value'], naive['p_value']),
+                         relative_difference(engine.loc[naive.index, 'mw_p'], naive['mw_p']))
+        rows.append({'employees': n, 'columns': len(columns), 'tests_s': tests_s, 'engine_s': engine_s,
+                     'naive_tests_s': naive_tests_s, 'naive_total_s': naive_tests_s + naive_perm_s,
+                     'speedup': (naive_tests_s + naive_perm_s) / engine_s,
+                     'max_rel_diff': difference, 'identical': difference < TOLERANCE})
+        print(f"  {n:>9,} employees: engine {engine_s:7.2f}s (with {args.permutations} permutations)")
+
+    results = pd.DataFrame(rows).set_index('employees')
+    print("\nResults (naive permutations extrapolated from "
+          f"{args.naive_permutations} shuffles):")
+    print(results.to_string(float_format=lambda value: f'{value:.3g}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,232 +3,404 @@ HR Employee Attrition Analysis
 ===============================
 Analyzing factors that influence employee attrition to help HR make data-driven decisions.
 
+Each numbered section is an importable function that prints its part of the
+report and returns its results as DataFrames or dicts. matplotlib and scipy
+are only imported by the sections that need them, so runs that only want the
+attrition numbers start fast. Figures are rendered in parallel from
+precomputed panel data by ``analysis_core.rendering``. ``--report`` writes
+per-section wall/CPU time, peak memory and row counts as JSON (see
+``analysis_core.instrumentation``). Sections that do not depend on each other
+run at the same time (see ``analysis_core.scheduler``); the report is still
+printed in section order.
+
+Usage:
+    python hr_attrition_analysis.py [--data WA_Fn-UseC_-HR-Employee-Attrition.csv] [--sections breakdown,categorical]
+    python hr_attrition_analysis.py --draft            # 72 dpi previews
+    python hr_attrition_analysis.py --no-plots         # numbers only
+    python hr_attrition_analysis.py --panels --format svg
+    python hr_attrition_analysis.py --report run.json --profile categorical   # timings + cProfile dump
+    python hr_attrition_analysis.py --section-workers 1   # sections one after the other
+
 Author: [Your Name]
 Date: October 2025
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
+import argparse
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style for better-looking plots
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+import pandas as pd
 
-# Load the data
-df = pd.read_csv('WA_Fn-UseC_-HR-Employee-Attrition.csv')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from analysis_core.association import association_matrix, print_target_associations, target_associations
+from analysis_core.compaction import compact_frame, print_compaction
+from analysis_core.correlation import correlate, print_target_correlations, target_correlations
+from analysis_core.instrumentation import (Instrumentation, add_instrumentation_arguments, finish_run,
+                                          instrumentation_from_args)
+from analysis_core.rendering import (DEFAULT_DPI, FigureSpec, Panel, add_render_arguments, binned,
+                                     categories, print_timings, render_figures, render_options)
+from analysis_core.result_cache import CACHE_DIRNAME, ResultCache, add_cache_arguments, cache_from_args
+from analysis_core.scheduler import SectionScheduler, add_scheduler_arguments
+from analysis_core.significance import print_significance, significance_tests
+from attrition_cube import MIN_SUPPORT, AttritionCube, print_combinations
+from survival import TenureSurvival, print_survival, survival_panels
+
+DATA_FILE = 'WA_Fn-UseC_-HR-Employee-Attrition.csv'
+# Sources whose hash versions the result cache
+CODE_PATHS = [os.path.dirname(os.path.abspath(__file__)),
+              os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'analysis_core')]
+# Columns added by load_data on top of the source file
+DERIVED_COLUMNS = ['AgeGroup', 'Attrition_Binary']
+# Bookkeeping columns of the export that compaction drops when constant (the
+# same in every IBM extract); constant analysis columns are kept
+CONSTANT_COLUMNS = ['EmployeeCount', 'Over18', 'StandardHours']
+# Survey answers are whole numbers but load as floats when some are blank;
+# they fit float32 exactly. Unnamed columns are compacted automatically.
+COMPACT_SCHEMA = {column: 'downcast' for column in ['EnvironmentSatisfaction', 'JobSatisfaction',
+                                                    'RelationshipSatisfaction', 'WorkLifeBalance',
+                                                    'JobInvolvement']}
+
+
+def load_data(path=DATA_FILE):
+    """Load the employee export and add the derived analysis columns."""
+    df = pd.read_csv(path)
+    df['AgeGroup'] = pd.cut(df['Age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
+    # Create binary attrition column
+    df['Attrition_Binary'] = (df['Attrition'] == 'Yes').astype(int)
+    return df
+
+
+def compact_data(df, cache=None):
+    """Drop constant columns, categorise and downcast (see ``analysis_core.compaction``).
+
+    Prints the memory saved by each step and returns ``(df, report)``. With
+    a ``cache`` the printed report is stored as the 'compaction' entry, so a
+    run whose sections are all cached can replay it without loading the data.
+    """
+    df, report = compact_frame(df, COMPACT_SCHEMA, droppable=CONSTANT_COLUMNS)
+    cache = cache or ResultCache(CACHE_DIRNAME, enabled=False)
+    cache.run('compaction', lambda: print_compaction(report) or report)
+    return df, report
+
+
+# Dimensions counted by the attrition cube; every pair is precomputed too
+CUBE_DIMENSIONS = ['Department', 'JobRole', 'AgeGroup', 'OverTime', 'JobSatisfaction', 'WorkLifeBalance',
+                   'EnvironmentSatisfaction', 'JobInvolvement', 'BusinessTravel', 'MaritalStatus', 'Gender',
+                   'EducationField', 'JobLevel', 'StockOptionLevel']
+
+
+def build_cube(df, min_support=MIN_SUPPORT):
+    """Attrition counts for every dimension and pair of dimensions (see ``attrition_cube``)."""
+    return AttritionCube.build(df, CUBE_DIMENSIONS, min_support=min_support)
+
+
+# Segments whose tenure is compared with Kaplan-Meier curves and log-rank tests
+SURVIVAL_DIMENSIONS = ['Department', 'JobRole', 'OverTime', 'AgeGroup']
+SURVIVAL_MAX_YEARS = 20                        # retention curves are drawn up to this tenure
+
+
+def build_survival(df):
+    """Tenure survival counts for every segment of ``SURVIVAL_DIMENSIONS`` (see ``survival``)."""
+    return TenureSurvival.build(df, SURVIVAL_DIMENSIONS)
 
-print("="*80)
-print("HR EMPLOYEE ATTRITION ANALYSIS")
-print("="*80)
 
 # ==========================================
 # 1. DATA OVERVIEW
 # ==========================================
-print("\n1. DATA OVERVIEW")
-print("-" * 80)
-print(f"Dataset shape: {df.shape[0]} employees, {df.shape[1]} features")
-print(f"Attrition rate: {(df['Attrition']=='Yes').sum() / len(df) * 100:.2f}%")
-print(f"Missing values: {df.isnull().sum().sum()}")
+def data_overview(df, compaction=None):
+    """Dataset size, overall attrition rate and missing values.
+
+    ``features`` counts the columns of the export as loaded; with the
+    ``compaction`` report of ``compact_data``, the constant columns it
+    dropped are counted in and listed separately.
+    """
+    print("\n1. DATA OVERVIEW")
+    print("-" * 80)
+    constant = [] if compaction is None else \
+        list(compaction.loc[compaction['step'] == 'drop constant', 'columns'].iloc[0])
+    result = {
+        'employees': df.shape[0],
+        'features': df.shape[1] - len(DERIVED_COLUMNS) + len(constant),
+        'constant_columns': constant,
+        'attrition_rate': (df['Attrition']=='Yes').sum() / len(df) * 100,
+        'missing_values': df.drop(columns=DERIVED_COLUMNS).isnull().sum().sum(),
+    }
+    print(f"Dataset shape: {result['employees']} employees, {result['features']} features")
+    if constant:
+        print(f"Constant columns dropped: {len(constant)} ({', '.join(constant)})")
+    print(f"Attrition rate: {result['attrition_rate']:.2f}%")
+    print(f"Missing values: {result['missing_values']}")
+    return result
+
 
 # ==========================================
 # 2. EXPLORATORY DATA ANALYSIS
 # ==========================================
-print("\n2. ATTRITION BREAKDOWN")
-print("-" * 80)
+def attrition_breakdown(df, cube=None):
+    """Attrition by department, job role and age group."""
+    print("\n2. ATTRITION BREAKDOWN")
+    print("-" * 80)
+    cube = cube or build_cube(df)
+    result = {}
+
+    # Attrition by Department
+    print("\nAttrition by Department:")
+    result['department'] = cube.shares('Department')
+    print(result['department'].round(2))
 
-# Attrition by Department
-print("\nAttrition by Department:")
-attrition_dept = pd.crosstab(df['Department'], df['Attrition'], normalize='index') * 100
-print(attrition_dept.round(2))
+    # Attrition by Job Role
+    print("\nAttrition by Job Role:")
+    result['job_role'] = cube.rate('JobRole').sort_values(ascending=False)
+    print(result['job_role'].round(2))
 
-# Attrition by Job Role
-print("\nAttrition by Job Role:")
-attrition_role = df.groupby('JobRole')['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100).sort_values(ascending=False)
-print(attrition_role.round(2))
+    # Attrition by Age Group
+    print("\nAttrition by Age Group:")
+    result['age_group'] = cube.rate('AgeGroup')
+    print(result['age_group'].round(2))
+
+    return result
 
-# Attrition by Age Group
-df['AgeGroup'] = pd.cut(df['Age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
-print("\nAttrition by Age Group:")
-attrition_age = df.groupby('AgeGroup')['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)
-print(attrition_age.round(2))
 
 # ==========================================
 # 3. KEY INSIGHTS - NUMERICAL FEATURES
 # ==========================================
-print("\n3. NUMERICAL ANALYSIS")
-print("-" * 80)
-
 # Compare key metrics between employees who left vs stayed
-numerical_cols = ['MonthlyIncome', 'Age', 'YearsAtCompany', 'DistanceFromHome', 
+NUMERICAL_COLS = ['MonthlyIncome', 'Age', 'YearsAtCompany', 'DistanceFromHome',
                   'TotalWorkingYears', 'YearsSinceLastPromotion']
+PERMUTATIONS = 2000
+PERMUTATION_SEED = 42
+
+
+def test_columns(df):
+    """Every source column except the target (constant ones are dropped by compaction)."""
+    return [column for column in df.columns if column not in DERIVED_COLUMNS + ['Attrition']]
 
-comparison = df.groupby('Attrition')[numerical_cols].mean()
-print("\nAverage values by Attrition status:")
-print(comparison.round(2))
 
-# Statistical significance testing
-print("\n\nStatistical Significance (t-test p-values):")
-for col in numerical_cols:
-    left = df[df['Attrition'] == 'Yes'][col]
-    stayed = df[df['Attrition'] == 'No'][col]
-    t_stat, p_value = stats.ttest_ind(left, stayed)
-    significance = "***" if p_value < 0.001 else "**" if p_value < 0.01 else "*" if p_value < 0.05 else "ns"
-    print(f"{col:30s}: p={p_value:.4f} {significance}")
+def numerical_analysis(df, n_permutations=PERMUTATIONS):
+    """Mean of key metrics by attrition status, and every column tested against attrition.
+
+    Numeric columns get Welch t and Mann-Whitney tests, categorical ones a
+    chi-square test, all with permutation p-values and Benjamini-Hochberg
+    q-values (see ``analysis_core.significance``).
+    """
+    print("\n3. NUMERICAL ANALYSIS")
+    print("-" * 80)
+
+    comparison = df.groupby('Attrition')[NUMERICAL_COLS].mean()
+    print("\nAverage values by Attrition status:")
+    print(comparison.round(2))
+
+    # Statistical significance testing, all columns at once
+    columns = test_columns(df)
+    print(f"\n\nStatistical Significance vs Attrition ({len(columns)} columns, {n_permutations} permutations, "
+          f"q = Benjamini-Hochberg):")
+    tests = significance_tests(df, df['Attrition'] == 'Yes', columns, n_permutations, PERMUTATION_SEED)
+    print_significance(tests)
+
+    return {'comparison': comparison, 'p_values': tests.loc[NUMERICAL_COLS, 'p_value'], 'tests': tests}
+
 
 # ==========================================
 # 4. CATEGORICAL FEATURES ANALYSIS
 # ==========================================
-print("\n4. CATEGORICAL FEATURES IMPACT")
-print("-" * 80)
+CATEGORICAL_FEATURES = ['OverTime', 'JobSatisfaction', 'WorkLifeBalance',
+                        'EnvironmentSatisfaction', 'JobInvolvement']
+TOP_COMBINATIONS = 10                          # riskiest level pairs listed from the cube
+
+
+def categorical_analysis(df, cube=None):
+    """Attrition rate for each level of the key categorical features.
+
+    Also lists the riskiest pairs of levels across all cube dimensions
+    (e.g. OverTime x JobRole) with enough employees to trust the rate.
+    """
+    print("\n4. CATEGORICAL FEATURES IMPACT")
+    print("-" * 80)
+    cube = cube or build_cube(df)
+    result = {}
+
+    for feature in CATEGORICAL_FEATURES:
+        attrition_rate = cube.rate(feature)
+        result[feature] = attrition_rate
+        print(f"\n{feature}:")
+        print(attrition_rate.round(2))
 
-categorical_features = ['OverTime', 'JobSatisfaction', 'WorkLifeBalance', 
-                       'EnvironmentSatisfaction', 'JobInvolvement']
+    result['combinations'] = cube.top_combinations(TOP_COMBINATIONS)
+    print_combinations(result['combinations'], f"Highest-attrition combinations "
+                                                f"(at least {cube.min_support} employees):")
+    return result
 
-for feature in categorical_features:
-    attrition_rate = df.groupby(feature)['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)
-    print(f"\n{feature}:")
-    print(attrition_rate.round(2))
 
 # ==========================================
 # 5. VISUALIZATIONS
 # ==========================================
-print("\n5. GENERATING VISUALIZATIONS...")
-print("-" * 80)
-
-# Create a figure with multiple subplots
-fig = plt.figure(figsize=(20, 12))
-
-# 1. Attrition Overview
-ax1 = plt.subplot(3, 3, 1)
-attrition_counts = df['Attrition'].value_counts()
-colors = ['#2ecc71', '#e74c3c']
-plt.pie(attrition_counts, labels=['Stayed', 'Left'], autopct='%1.1f%%', 
-        colors=colors, startangle=90)
-plt.title('Overall Attrition Rate', fontsize=14, fontweight='bold')
-
-# 2. Attrition by Department
-ax2 = plt.subplot(3, 3, 2)
-dept_attrition = df[df['Attrition']=='Yes']['Department'].value_counts()
-plt.barh(dept_attrition.index, dept_attrition.values, color='#e74c3c')
-plt.xlabel('Number of Employees Left')
-plt.title('Attrition by Department', fontsize=14, fontweight='bold')
-plt.tight_layout()
-
-# 3. Attrition by Age Group
-ax3 = plt.subplot(3, 3, 3)
-age_data = df.groupby('AgeGroup')['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)
-plt.bar(age_data.index, age_data.values, color='#3498db')
-plt.ylabel('Attrition Rate (%)')
-plt.title('Attrition Rate by Age Group', fontsize=14, fontweight='bold')
-plt.xticks(rotation=45)
-
-# 4. Monthly Income Distribution
-ax4 = plt.subplot(3, 3, 4)
-plt.hist([df[df['Attrition']=='No']['MonthlyIncome'], 
-          df[df['Attrition']=='Yes']['MonthlyIncome']], 
-         label=['Stayed', 'Left'], bins=30, alpha=0.7, color=['#2ecc71', '#e74c3c'])
-plt.xlabel('Monthly Income')
-plt.ylabel('Frequency')
-plt.title('Income Distribution by Attrition', fontsize=14, fontweight='bold')
-plt.legend()
-
-# 5. Years at Company
-ax5 = plt.subplot(3, 3, 5)
-plt.hist([df[df['Attrition']=='No']['YearsAtCompany'], 
-          df[df['Attrition']=='Yes']['YearsAtCompany']], 
-         label=['Stayed', 'Left'], bins=20, alpha=0.7, color=['#2ecc71', '#e74c3c'])
-plt.xlabel('Years at Company')
-plt.ylabel('Frequency')
-plt.title('Tenure Distribution by Attrition', fontsize=14, fontweight='bold')
-plt.legend()
-
-# 6. Distance from Home
-ax6 = plt.subplot(3, 3, 6)
-plt.hist([df[df['Attrition']=='No']['DistanceFromHome'], 
-          df[df['Attrition']=='Yes']['DistanceFromHome']], 
-         label=['Stayed', 'Left'], bins=20, alpha=0.7, color=['#2ecc71', '#e74c3c'])
-plt.xlabel('Distance from Home (km)')
-plt.ylabel('Frequency')
-plt.title('Distance from Home by Attrition', fontsize=14, fontweight='bold')
-plt.legend()
-
-# 7. Overtime Impact
-ax7 = plt.subplot(3, 3, 7)
-overtime_data = pd.crosstab(df['OverTime'], df['Attrition'], normalize='index') * 100
-overtime_data.plot(kind='bar', ax=ax7, color=['#2ecc71', '#e74c3c'])
-plt.ylabel('Percentage (%)')
-plt.title('Attrition by Overtime Status', fontsize=14, fontweight='bold')
-plt.xticks(rotation=0)
-plt.legend(title='Attrition', labels=['Stayed', 'Left'])
-
-# 8. Job Satisfaction
-ax8 = plt.subplot(3, 3, 8)
-satisfaction_data = df.groupby('JobSatisfaction')['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)
-plt.plot(satisfaction_data.index, satisfaction_data.values, marker='o', linewidth=2, markersize=8, color='#e74c3c')
-plt.xlabel('Job Satisfaction Level (1-4)')
-plt.ylabel('Attrition Rate (%)')
-plt.title('Attrition Rate by Job Satisfaction', fontsize=14, fontweight='bold')
-plt.xticks([1, 2, 3, 4])
-plt.grid(True, alpha=0.3)
-
-# 9. Work-Life Balance
-ax9 = plt.subplot(3, 3, 9)
-balance_data = df.groupby('WorkLifeBalance')['Attrition'].apply(lambda x: (x=='Yes').sum() / len(x) * 100)
-plt.plot(balance_data.index, balance_data.values, marker='s', linewidth=2, markersize=8, color='#9b59b6')
-plt.xlabel('Work-Life Balance (1-4)')
-plt.ylabel('Attrition Rate (%)')
-plt.title('Attrition Rate by Work-Life Balance', fontsize=14, fontweight='bold')
-plt.xticks([1, 2, 3, 4])
-plt.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('hr_attrition_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: hr_attrition_analysis.png")
+ATTRITION_COLORS = ['#2ecc71', '#e74c3c']
+
+
+def dashboard_panels(df, cube=None):
+    """Precompute the nine dashboard panels as small binned/aggregated arrays."""
+    cube = cube or build_cube(df)
+    stayed, left = df[df['Attrition']=='No'], df[df['Attrition']=='Yes']
+    hist_style = {'labels': ['Stayed', 'Left'], 'color': ATTRITION_COLORS}
+    overtime_data = cube.shares('OverTime')
+    satisfaction_data = cube.rate('JobSatisfaction')
+    balance_data = cube.rate('WorkLifeBalance')
+    department_left = cube.table('Department')['left'].sort_values(ascending=False, kind='stable')
+
+    return [
+        Panel('attrition_overview', 'pie', 'Overall Attrition Rate',
+              {'labels': ['Stayed', 'Left'], 'values': df['Attrition'].value_counts().to_numpy()},
+              style={'colors': ATTRITION_COLORS}),
+        Panel('attrition_by_department', 'barh', 'Attrition by Department',
+              categories(department_left), 'Number of Employees Left', style={'color': '#e74c3c'}),
+        Panel('attrition_by_age_group', 'bar', 'Attrition Rate by Age Group', categories(cube.rate('AgeGroup')),
+              ylabel='Attrition Rate (%)', style={'color': '#3498db', 'rotation': 45}),
+        Panel('monthly_income', 'hist', 'Income Distribution by Attrition',
+              binned(stayed['MonthlyIncome'], left['MonthlyIncome'], bins=30), 'Monthly Income', 'Frequency', hist_style),
+        Panel('years_at_company', 'hist', 'Tenure Distribution by Attrition',
+              binned(stayed['YearsAtCompany'], left['YearsAtCompany'], bins=20), 'Years at Company', 'Frequency', hist_style),
+        Panel('distance_from_home', 'hist', 'Distance from Home by Attrition',
+              binned(stayed['DistanceFromHome'], left['DistanceFromHome'], bins=20),
+              'Distance from Home (km)', 'Frequency', hist_style),
+        Panel('overtime', 'grouped_bar', 'Attrition by Overtime Status',
+              {'labels': [str(label) for label in overtime_data.index],
+               'series': {name: overtime_data[name].to_numpy() for name in overtime_data.columns}},
+              ylabel='Percentage (%)',
+              style={'colors': ATTRITION_COLORS, 'legend_title': 'Attrition', 'legend_labels': ['Stayed', 'Left']}),
+        Panel('job_satisfaction', 'line', 'Attrition Rate by Job Satisfaction',
+              {'x': satisfaction_data.index.to_numpy(), 'y': satisfaction_data.to_numpy()},
+              'Job Satisfaction Level (1-4)', 'Attrition Rate (%)', {'color': '#e74c3c', 'xticks': [1, 2, 3, 4]}),
+        Panel('work_life_balance', 'line', 'Attrition Rate by Work-Life Balance',
+              {'x': balance_data.index.to_numpy(), 'y': balance_data.to_numpy()},
+              'Work-Life Balance (1-4)', 'Attrition Rate (%)', {'color': '#9b59b6', 'marker': 's', 'xticks': [1, 2, 3, 4]}),
+    ]
+
+
+def heatmap_panel(matrix):
+    """Heatmap panel of an association matrix (numeric columns first, then categorical ones)."""
+    return Panel('correlation_heatmap', 'heatmap',
+                 "Association Matrix - All Columns (Pearson r, correlation ratio, bias-corrected Cramer's V)",
+                 {'matrix': matrix.to_numpy(), 'labels': list(matrix.columns)},
+                 style={'title_size': 16, 'title_pad': 20, 'annotation_size': 6})
+
+
+def plot_figures(df, output_dir='.', dpi=DEFAULT_DPI, fmt='png', layout='dashboard', workers=None, tight=True,
+                 cube=None, survival=None, associations=None):
+    """Render the dashboard, the association heatmap and the tenure survival curves in parallel.
+
+    Returns the per-panel render timings (see ``render_figures``).
+    """
+    print("\n5. GENERATING VISUALIZATIONS...")
+    print("-" * 80)
+
+    figures = [
+        FigureSpec('hr_attrition_analysis', dashboard_panels(df, cube), grid=(3, 3), figsize=(20, 12)),
+        FigureSpec('correlation_heatmap', [heatmap_panel((associations or build_associations(df))[0])],
+                   grid=(1, 1), figsize=(20, 17)),
+        FigureSpec('tenure_survival', survival_panels(survival or build_survival(df), SURVIVAL_MAX_YEARS),
+                   grid=(2, 2), figsize=(16, 11)),
+    ]
+    timings = render_figures(figures, output_dir, dpi=dpi, fmt=fmt, layout=layout, workers=workers, tight=tight)
+    for path in timings['path'].unique():
+        print(f"✓ Saved: {os.path.basename(path)}")
+    print_timings(timings)
+    return timings
+
 
 # ==========================================
 # 6. CORRELATION ANALYSIS
 # ==========================================
-print("\n6. CORRELATION ANALYSIS")
-print("-" * 80)
+# Select numerical columns for correlation
+CORRELATION_FEATURES = ['Age', 'MonthlyIncome', 'DistanceFromHome', 'TotalWorkingYears',
+                        'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
+                        'JobSatisfaction', 'WorkLifeBalance', 'EnvironmentSatisfaction',
+                        'JobInvolvement', 'Attrition_Binary']
+CORRELATION_RESAMPLES = 2000
+CORRELATION_SEED = 42
+# Every other column is related to every other one; the ID and the 0/1 copy of Attrition are left out
+ASSOCIATION_EXCLUDE = ['EmployeeNumber', 'Attrition_Binary']
+ASSOCIATION_METHOD = 'pearson'
+TOP_ASSOCIATIONS = 10
 
-# Create binary attrition column
-df['Attrition_Binary'] = (df['Attrition'] == 'Yes').astype(int)
 
-# Select numerical columns for correlation
-numerical_features = ['Age', 'MonthlyIncome', 'DistanceFromHome', 'TotalWorkingYears',
-                     'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
-                     'JobSatisfaction', 'WorkLifeBalance', 'EnvironmentSatisfaction',
-                     'JobInvolvement', 'Attrition_Binary']
+def build_associations(df):
+    """Association matrix of every analysed column and each column's kind (see ``analysis_core.association``)."""
+    columns = [column for column in df.columns if column not in ASSOCIATION_EXCLUDE]
+    return association_matrix(df, columns, method=ASSOCIATION_METHOD)
+
+
+def correlate_attrition(df, n_resamples=CORRELATION_RESAMPLES, seed=CORRELATION_SEED):
+    """One pass of the correlation engine over the key features and attrition.
+
+    Returns ``(accumulator, bootstrap)`` from ``analysis_core.correlation``.
+    """
+    return correlate([df], 'Attrition_Binary', CORRELATION_FEATURES, n_resamples=n_resamples, seed=seed)
+
+
+def correlation_analysis(df, n_resamples=CORRELATION_RESAMPLES, associations=None):
+    """Correlation matrix of the key features and their link to attrition.
+
+    Correlations with attrition come with bootstrap confidence intervals.
+    ``associations`` is the shared ``build_associations(df)``, which relates
+    every column, categoricals included, to attrition.
+    """
+    print("\n6. CORRELATION ANALYSIS")
+    print("-" * 80)
 
-correlation_matrix = df[numerical_features].corr()
+    accumulator, bootstrap = correlate_attrition(df, n_resamples)
+    matrix = accumulator.correlation()
+    table = target_correlations(accumulator, bootstrap)
 
-# Plot correlation heatmap
-plt.figure(figsize=(14, 10))
-sns.heatmap(correlation_matrix, annot=True, fmt='.2f', cmap='coolwarm', 
-            center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8})
-plt.title('Correlation Matrix - Key Features', fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: correlation_heatmap.png")
+    # Top correlations with attrition
+    print(f"\nTop correlations with Attrition ({n_resamples} bootstrap resamples):")
+    print_target_correlations(table.head(10))
+
+    # Every column, categorical ones included
+    association, kinds = associations or build_associations(df)
+    strongest = target_associations(association, kinds, 'Attrition', ASSOCIATION_METHOD)
+    print(f"\nStrongest associations with Attrition (all {len(kinds) - 1} columns):")
+    print_target_associations(strongest.head(TOP_ASSOCIATIONS))
+
+    return {'matrix': matrix, 'attrition_correlations': table['abs_corr'], 'attrition_correlation_ci': table,
+            'associations': association, 'attrition_associations': strongest}
 
-# Top correlations with attrition
-print("\nTop correlations with Attrition:")
-attrition_corr = correlation_matrix['Attrition_Binary'].drop('Attrition_Binary').abs().sort_values(ascending=False)
-print(attrition_corr.head(10))
 
 # ==========================================
-# 7. KEY FINDINGS & RECOMMENDATIONS
+# 7. TENURE SURVIVAL ANALYSIS
 # ==========================================
-print("\n" + "="*80)
-print("KEY FINDINGS & RECOMMENDATIONS")
-print("="*80)
+def survival_analysis(df, survival=None):
+    """Kaplan-Meier retention, yearly hazards and log-rank tests of tenure per segment.
+
+    Every segment of ``SURVIVAL_DIMENSIONS`` is estimated from one set of
+    (segment, tenure) counts; the curves are drawn by the plots section.
+    """
+    print("\n7. TENURE SURVIVAL ANALYSIS")
+    print("-" * 80)
+    survival = survival or build_survival(df)
+    overall = survival.retention()['All employees']
+    print(f"Still employed after 1 year: {overall[1]:.1f}%, 2 years: {overall[2]:.1f}%, "
+          f"5 years: {overall[5]:.1f}% (Kaplan-Meier; q = Benjamini-Hochberg over all segments)")
+    for dimension in survival.dimensions:
+        print_survival(survival, dimension)
+
+    return {'retention': {dimension: survival.retention(dimension) for dimension in survival.dimensions},
+            'hazard': {dimension: survival.hazard(dimension) for dimension in survival.dimensions},
+            'summary': {dimension: survival.summary(dimension) for dimension in survival.dimensions},
+            'logrank': pd.DataFrame(survival.tests, index=['chi2', 'df', 'p_value']).T}
+
 
-print("""
+# ==========================================
+# 8. KEY FINDINGS & RECOMMENDATIONS
+# ==========================================
+def key_findings(df):
+    """Print the headline findings and recommendations."""
+    print("\n" + "="*80)
+    print("KEY FINDINGS & RECOMMENDATIONS")
+    print("="*80)
+
+    print("""
 TOP ATTRITION DRIVERS:
 1. Overtime: Employees working overtime have significantly higher attrition
 2. Job Satisfaction: Lower satisfaction correlates with higher turnover
@@ -245,7 +417,192 @@ RECOMMENDATIONS:
 6. Focus retention efforts on Sales Representatives and Laboratory Technicians
 7. Monitor younger employees (<30) more closely for early warning signs
 """)
+    return {}
+
 
-print("\n" + "="*80)
-print("Analysis complete! Check the generated PNG files for visualizations.")
-print("="*80)
+# ==========================================
+# RUNNER
+# ==========================================
+# Sections selectable with --sections, in report order
+SECTIONS = ['overview', 'breakdown', 'numerical', 'categorical', 'plots',
+            'correlation', 'survival', 'findings']
+# Shared steps each section reads besides the compacted frame
+SECTION_INPUTS = {'breakdown': ['cube'], 'categorical': ['cube'], 'plots': ['cube', 'survival_counts', 'associations'],
+                  'correlation': ['associations'], 'survival': ['survival_counts']}
+# Sections that use the shared tenure survival counts
+SURVIVAL_SECTIONS = [name for name, inputs in SECTION_INPUTS.items() if 'survival_counts' in inputs]
+
+
+def section_functions(df, output_dir='.', render_options=None, cube=None, survival=None, associations=None,
+                      compaction=None):
+    """Section name -> zero-argument callable running it on ``df``.
+
+    ``cube``, ``survival`` and ``associations`` are the shared
+    ``build_cube(df)``, ``build_survival(df)`` and ``build_associations(df)``;
+    sections needing them build their own when they are not given.
+    ``compaction`` is the report of ``compact_data``, from which the
+    overview counts the columns as loaded.
+    """
+    return {
+        'overview': lambda: data_overview(df, compaction),
+        'breakdown': lambda: attrition_breakdown(df, cube),
+        'numerical': lambda: numerical_analysis(df),
+        'categorical': lambda: categorical_analysis(df, cube),
+        'plots': lambda: plot_figures(df, output_dir, cube=cube, survival=survival, associations=associations,
+                                      **(render_options or {})),
+        'correlation': lambda: correlation_analysis(df, associations=associations),
+        'survival': lambda: survival_analysis(df, survival),
+        'findings': lambda: key_findings(df),
+    }
+
+
+def section_parameters(name, render_options=None):
+    """What besides the data and the code changes a section's output (part of its cache key)."""
+    if name == 'plots':
+        return {key: value for key, value in (render_options or {}).items() if key != 'workers'}
+    return {}
+
+
+def run_analysis(data_path=DATA_FILE, output_dir='.', sections=None, render_options=None, instrumentation=None,
+                 cache=None, workers=1):
+    """Run the selected sections on one employee export.
+
+    Parameters
+    ----------
+    data_path : str
+        IBM HR attrition CSV (or an export with the same schema).
+    output_dir : str
+        Where figures are written.
+    sections : list of str, optional
+        Names from ``SECTIONS``; all of them by default. 'plots' renders
+        the dashboard, the correlation heatmap and the tenure survival
+        curves.
+    render_options : dict, optional
+        Keyword arguments for ``plot_figures`` (dpi, fmt, layout, workers,
+        tight).
+    instrumentation : Instrumentation, optional
+        Records time, memory and rows for loading and every section (see
+        ``analysis_core.instrumentation``).
+    cache : ResultCache, optional
+        Replays sections already computed for this file, parameters and
+        code (see ``analysis_core.result_cache``). The CSV is only read when
+        some section misses.
+    workers : int, optional
+        Steps run at the same time once their inputs are ready (see
+        ``analysis_core.scheduler``); None uses every CPU. The report is
+        printed in section order either way.
+
+    Returns
+    -------
+    dict
+        Section name -> the section's results.
+    """
+    sections = list(SECTIONS if sections is None else sections)
+    unknown = [name for name in sections if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections {unknown}; choose from {SECTIONS}")
+
+    inst = instrumentation or Instrumentation(memory='off')
+    cache = cache or ResultCache(CACHE_DIRNAME, enabled=False)
+    scheduler = SectionScheduler(1 if inst.sequential else workers)
+
+    # Load the data and build the shared counts the sections need, unless every section (and the
+    # compaction report) is cached
+    loading = not all(cache.contains(name, section_parameters(name, render_options)) for name in sections) \
+        or not cache.contains('compaction')
+    if loading:
+        shared = {step for name in sections for step in SECTION_INPUTS.get(name, [])}
+        scheduler.add('load', lambda: inst.run('load', lambda: load_data(data_path)))
+        # 'compact' gives the compacted frame and the compaction report
+        scheduler.add('compact', lambda load: inst.run('compact', lambda: compact_data(load, cache), rows=len(load)),
+                      after=['load'])
+        if 'cube' in shared:
+            scheduler.add('cube', lambda compact: inst.run('cube', lambda: build_cube(compact[0]),
+                                                           rows=len(compact[0])),
+                          after=['compact'])
+        if 'survival_counts' in shared:
+            scheduler.add('survival_counts', lambda compact: inst.run('survival_counts',
+                                                                      lambda: build_survival(compact[0]),
+                                                                      rows=len(compact[0])),
+                          after=['compact'])
+        if 'associations' in shared:
+            scheduler.add('associations', lambda compact: inst.run('associations',
+                                                                   lambda: build_associations(compact[0]),
+                                                                   rows=len(compact[0])),
+                          after=['compact'])
+    else:
+        # Replays the stored report; only loads the data if the entry vanished since ``contains``
+        scheduler.add('compact', lambda: inst.run('compact', lambda: cache.run(
+            'compaction', lambda: compact_data(load_data(data_path))[1])))
+
+    def section(name):
+        def run(compact=(None, None), cube=None, survival_counts=None, associations=None):
+            df, compaction = compact
+            function = section_functions(df, output_dir, render_options, cube, survival_counts, associations,
+                                         compaction)[name]
+            files = (lambda timings: timings['path'].unique()) if name == 'plots' else None
+            return inst.run(name, lambda: cache.run(name, function, section_parameters(name, render_options),
+                                                    output_dir, files),
+                            rows=None if df is None else len(df))
+        return run
+
+    for name in SECTIONS:
+        if name in sections:
+            inputs = ['compact'] + SECTION_INPUTS.get(name, []) if loading else []
+            scheduler.add(name, section(name), after=inputs)
+
+    print("="*80)
+    print("HR EMPLOYEE ATTRITION ANALYSIS")
+    print("="*80)
+    try:
+        steps = scheduler.run()
+    finally:
+        inst.summarize('schedule', scheduler.summary())
+    results = {name: steps[name] for name in sections}
+
+    if 'findings' in sections:
+        print("\n" + "="*80)
+        print("Analysis complete! Check the generated PNG files for visualizations.")
+        print("="*80)
+    cache.print_summary()
+    inst.summarize('cache', cache.stats())
+
+    return results
+
+
+def parse_sections(value):
+    """Parse a comma-separated ``--sections`` value."""
+    sections = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in sections if name not in SECTIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown sections {unknown}; choose from {','.join(SECTIONS)}")
+    return sections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='HR employee attrition analysis.')
+    parser.add_argument('--data', default=DATA_FILE, help='employee attrition CSV to analyse')
+    parser.add_argument('--output-dir', default='.', help='where figures are written')
+    parser.add_argument('--sections', type=parse_sections, default=None,
+                        help=f"comma-separated sections to run (default: all): {','.join(SECTIONS)}")
+    add_render_arguments(parser)
+    add_instrumentation_arguments(parser)
+    add_cache_arguments(parser)
+    add_scheduler_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sections = args.sections or list(SECTIONS)
+    if args.no_plots:
+        sections = [name for name in sections if name != 'plots']
+    os.makedirs(args.output_dir, exist_ok=True)
+    instrumentation = instrumentation_from_args(args)
+    cache = cache_from_args(args, args.data, CODE_PATHS)
+    try:
+        run_analysis(args.data, args.output_dir, sections, render_options(args), instrumentation, cache,
+                     args.section_workers)
+    finally:
+        finish_run(instrumentation, args, 'hr_attrition_analysis', data=args.data, sections=sections)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Scoring Service Load Test
+=========================
+Latency and throughput of ``scoring_service.py`` under concurrent clients.
+
+Without ``--url``, a local instance is started for every ``--max-batch``
+value in turn (by default 1, i.e. no batching, and 64), so the effect of
+micro-batching is measured on the same machine. The model is fitted on the
+bundled export first if ``--model`` does not exist. With ``--url``, the
+given instance is tested as it is.
+
+Each client thread keeps one HTTP/1.1 connection open and sends its share
+of ``--requests`` back to back, each with ``--employees-per-request``
+employees drawn from the bundled export. Latency is measured per request,
+from send to parsed response. The report gives throughput, p50/p90/p99/max
+latency, the server's mean batch size, and whether every returned score
+matches ``predict_proba`` on the same employees (``identical``, needs
+``--model``). Clients and server share the CPUs, so the numbers are a lower
+bound on what a dedicated host would serve.
+
+Usage:
+    python load_test.py [--max-batch 1 64] [--concurrency 32] [--requests 4000] [--employees-per-request 1]
+    python load_test.py --url http://127.0.0.1:8765 --concurrency 64
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from risk_model import FEATURES, ID_COLUMN, MODEL_FILE, TARGET, AttritionRiskModel, fit_risk_model
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+SERVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_service.py')
+STARTUP_TIMEOUT = 30.0
+TOLERANCE = 1e-12
+PERCENTILES = [50, 90, 99]
+
+
+def make_payloads(n_requests, per_request, seed):
+    """Request bodies of employees drawn from the bundled export, and the rows behind each."""
+    source = pd.read_csv(DATA_FILE, usecols=[ID_COLUMN] + FEATURES)
+    rows = np.random.default_rng(seed).integers(0, len(source), (n_requests, per_request))
+    records = source.to_dict(orient='records')
+    bodies = [json.dumps({'employees': [records[row] for row in request]}).encode() for request in rows]
+    return bodies, source, rows
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def get_json(address, path):
+    connection = http.client.HTTPConnection(*address, timeout=5)
+    try:
+        connection.request('GET', path)
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def start_service(model_path, max_batch, max_wait_ms):
+    """Start a local instance on a free port; returns the process and its (host, port)."""
+    address = ('127.0.0.1', free_port())
+    process = subprocess.Popen([sys.executable, SERVICE, '--model', model_path, '--port', str(address[1]),
+                                '--max-batch', str(max_batch), '--max-wait-ms', str(max_wait_ms)],
+                               stdout=subprocess.DEVNULL)
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while True:
+        try:
+            get_json(address, '/health')
+            return process, address
+        except OSError:
+            if process.poll() is not None or time.perf_counter() > deadline:
+                process.kill()
+                raise RuntimeError(f"Scoring service did not start on port {address[1]}")
+            time.sleep(0.1)
+
+
+def run_clients(address, bodies, concurrency):
+    """Send ``bodies`` from ``concurrency`` threads; returns latencies (s), responses and wall time."""
+    latencies = np.full(len(bodies), np.nan)
+    responses = [None] * len(bodies)
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(first):
+        connection = http.client.HTTPConnection(*address, timeout=60)
+        barrier.wait()
+        for position in range(first, len(bodies), concurrency):
+            start = time.perf_counter()
+            try:
+                connection.request('POST', '/score', bodies[position], {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(*address, timeout=60)
+                continue
+            latencies[position] = time.perf_counter() - start
+            if response.status == 200:
+                responses[position] = json.loads(body)['scores']
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(first,)) for first in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return latencies, responses, time.perf_counter() - start
+
+
+def check_scores(responses, expected, rows):
+    """Whether every returned score equals the batch prediction for the same employee."""
+    for response, request in zip(responses, rows):
+        if response is None:
+            continue
+        got = np.array([score['risk_score'] for score in response])
+        if np.abs(got - expected[request]).max() > TOLERANCE:
+            return False
+    return True
+
+
+def load_test(address, warmup, bodies, concurrency):
+    """Send the ``warmup`` bodies, then measure ``bodies``; returns the result row and the responses."""
+    if warmup:
+        run_clients(address, warmup, min(concurrency, len(warmup)))
+    before = get_json(address, '/stats')
+    latencies, responses, wall = run_clients(address, bodies, concurrency)
+    after = get_json(address, '/stats')
+    served = latencies[[response is not None for response in responses]] * 1000
+    employees = after['employees'] - before['employees']
+    batches = after['batches'] - before['batches']
+    row = {'requests': len(bodies), 'errors': len(bodies) - len(served), 'requests_per_s': len(served) / wall,
+           'employees_per_s': employees / wall, 'mean_batch': employees / batches if batches else np.nan}
+    for percentile in PERCENTILES:
+        row[f'p{percentile}_ms'] = np.percentile(served, percentile) if len(served) else np.nan
+    row['max_ms'] = served.max() if len(served) else np.nan
+    return row, responses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the attrition risk scoring service.')
+    parser.add_argument('--url', help='test a running instance instead of starting local ones')
+    parser.add_argument('--model', default=MODEL_FILE, help='model served (fitted first if missing)')
+    parser.add_argument('--max-batch', type=int, nargs='+', default=[1, 64],
+                        help='micro-batch sizes of the local instances')
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--concurrency', type=int, default=32, help='client threads')
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--employees-per-request', type=int, default=1)
+    parser.add_argument('--warmup', type=int, default=200, help='requests sent before measuring')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if not args.url and not os.path.exists(args.model):
+        print(f"Fitting the risk model on {os.path.basename(DATA_FILE)} -> {args.model}")
+        fit_risk_model(pd.read_csv(DATA_FILE, usecols=FEATURES + [TARGET])).save(args.model)
+    model = AttritionRiskModel.load(args.model) if os.path.exists(args.model) else None
+
+    bodies, source, rows = make_payloads(args.requests + args.warmup, args.employees_per_request, args.seed)
+    warmup, bodies, rows = bodies[:args.warmup], bodies[args.warmup:], rows[args.warmup:]
+    expected = model.predict_proba(source) if model is not None else None
+
+    print("=" * 80)
+    print(f"SCORING SERVICE LOAD TEST ({args.concurrency} clients, {args.requests} requests of "
+          f"{args.employees_per_request} employee(s))")
+    print("=" * 80)
+
+    targets = [(None, urlsplit(args.url))] if args.url else [(size, None) for size in args.max_batch]
+    results = []
+    for max_batch, url in targets:
+        process = None
+        if url is None:
+            process, address = start_service(args.model, max_batch, args.max_wait_ms)
+        else:
+            address = (url.hostname, url.port or 80)
+        try:
+            row, responses = load_test(address, warmup, bodies, args.concurrency)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        row = {'max_batch': max_batch if max_batch is not None else 'remote', **row}
+        row['identical'] = check_scores(responses, expected, rows) if expected is not None else 'n/a'
+        results.append(row)
+        print(f"  max batch {row['max_batch']!s:>6}: {row['requests_per_s']:8,.0f} requests/s, "
+              f"p50 {row['p50_ms']:6.2f} ms, p99 {row['p99_ms']:6.2f} ms")
+
+    print("\nResults:")
+    print(pd.DataFrame(results).set_index('max_batch').to_string(float_format=lambda value: f'{value:.3g}'))
+
+
+if __name__ == '__main__':
+    main()
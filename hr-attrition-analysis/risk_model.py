@@ -0,0 +1,485 @@
+"""
+Attrition Risk Model
+====================
+Per-employee probability of leaving, from a logistic regression on the
+features the analysis examines.
+
+The model is fitted on ``Attrition == 'Yes'`` with:
+
+- the numeric metrics compared in section 3 (income, age, tenure, distance
+  from home, working years, years since promotion), with missing values
+  imputed by the training median plus a missing flag, and the columns then
+  standardised
+- overtime, the survey answers of section 4, department, job role, job and
+  stock option level, business travel and marital status, one-hot encoded
+
+As in the Airbnb pricing model, every employee has the same number of
+non-zeros in its design row, so the sparse CSR design matrix is built from
+column arrays without a Python loop over rows. The fit is ridge-penalised
+Newton (IRLS) on that matrix, and ``predict_proba`` scores any number of
+employees with one sparse matrix-vector product. Missing survey answers and
+levels not seen in training fall back to the reference level.
+
+Nightly scoring reads the export in chunks, so the whole workforce never
+has to be in memory at once. ``scoring_service.py`` serves the same model
+over HTTP.
+
+Usage:
+    python risk_model.py fit [--data WA_Fn-UseC_-HR-Employee-Attrition.csv] [--model risk_model.json]
+    python risk_model.py score employees.csv [--model risk_model.json] [--output risk_scores.csv]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.special import expit, xlogy
+from scipy.stats import rankdata
+
+NUMERIC_FEATURES = ['MonthlyIncome', 'Age', 'YearsAtCompany', 'DistanceFromHome',
+                    'TotalWorkingYears', 'YearsSinceLastPromotion']
+LOG_FEATURES = ['MonthlyIncome']              # modelled as log(1 + x)
+CATEGORICAL_FEATURES = ['OverTime', 'JobSatisfaction', 'WorkLifeBalance', 'EnvironmentSatisfaction',
+                        'JobInvolvement', 'Department', 'JobRole', 'JobLevel', 'StockOptionLevel',
+                        'BusinessTravel', 'MaritalStatus']
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+TARGET, POSITIVE = 'Attrition', 'Yes'
+ID_COLUMN = 'EmployeeNumber'
+
+DEFAULT_RIDGE = 1.0
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-8
+HOLDOUT = 0.2                                 # share of employees held out to measure the fit
+SEED = 42
+CHUNK_ROWS = 500_000
+ROW_BYTES = 256                               # rough size of one export row, for pyarrow's byte blocks
+MODEL_FILE = 'risk_model.json'
+# Lower probability bound of each band, highest first
+RISK_BANDS = [('High', 0.5), ('Medium', 0.2), ('Low', 0.0)]
+
+# Feature group -> label used in the driver ranking
+FACTOR_LABELS = {
+    'MonthlyIncome': 'Monthly income',
+    'Age': 'Age',
+    'YearsAtCompany': 'Years at company',
+    'DistanceFromHome': 'Distance from home',
+    'TotalWorkingYears': 'Total working years',
+    'YearsSinceLastPromotion': 'Years since last promotion',
+    'OverTime': 'Overtime',
+    'JobSatisfaction': 'Job satisfaction',
+    'WorkLifeBalance': 'Work-life balance',
+    'EnvironmentSatisfaction': 'Environment satisfaction',
+    'JobInvolvement': 'Job involvement',
+    'Department': 'Department',
+    'JobRole': 'Job role',
+    'JobLevel': 'Job level',
+    'StockOptionLevel': 'Stock option level',
+    'BusinessTravel': 'Business travel',
+    'MaritalStatus': 'Marital status',
+}
+
+
+def _numbers(values):
+    """Float array of a column (None/NA become NaN; non-numeric text raises ``ValueError``)."""
+    values = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    return pd.to_numeric(values).to_numpy(dtype=float, na_value=np.nan)
+
+
+def auc_score(y, score):
+    """Area under the ROC curve (the Mann-Whitney U of the scores, ties averaged)."""
+    y = np.asarray(y, dtype=bool)
+    positives, negatives = y.sum(), (~y).sum()
+    if not positives or not negatives:
+        return np.nan
+    ranks = rankdata(score)
+    return (ranks[y].sum() - positives * (positives + 1) / 2) / (positives * negatives)
+
+
+def risk_bands(probability):
+    """'High', 'Medium' or 'Low' per probability (see ``RISK_BANDS``)."""
+    probability = np.asarray(probability, dtype=float)
+    labels = [label for label, _ in RISK_BANDS]
+    conditions = [probability >= bound for _, bound in RISK_BANDS[:-1]]
+    return np.select(conditions, labels[:-1], default=labels[-1])
+
+
+class AttritionRiskModel:
+    """Ridge-penalised logistic regression with a sparse one-hot design matrix."""
+
+    def __init__(self, ridge=DEFAULT_RIDGE):
+        self.ridge = ridge
+        self.fitted = False
+
+    # ------------------------------------------
+    # Design matrix
+    # ------------------------------------------
+    def _numeric(self, df, column):
+        values = _numbers(df[column])
+        return np.log1p(values) if column in LOG_FEATURES else values
+
+    def _codes(self, df, column):
+        """Position of every value in ``self.levels[column]`` (-1 for missing or unseen)."""
+        levels = self.levels[column]
+        if column not in self.numeric_levels:
+            # Match the distinct values only, then broadcast through the codes
+            values = df[column] if isinstance(df[column], pd.Series) else np.asarray(df[column], dtype=object)
+            codes, uniques = pd.factorize(values)
+            positions = pd.Index(levels).get_indexer(uniques)
+            return np.where(codes < 0, -1, positions[codes]).astype(np.int32)
+        # Survey answers and levels are matched as numbers, so 3, 3.0 and '3' agree
+        values = _numbers(df[column])
+        order = np.argsort(levels)
+        ordered = np.asarray(levels, dtype=float)[order]
+        position = np.minimum(np.searchsorted(ordered, values), len(ordered) - 1)
+        return np.where(ordered[position] == values, order[position], -1).astype(np.int32)
+
+    def design_matrix(self, df):
+        """Sparse (employees x columns) design matrix of ``df``, in ``self.columns`` order.
+
+        ``df`` is a DataFrame or a dict of column -> values with every
+        name in ``FEATURES``.
+        """
+        absent = [column for column in FEATURES if column not in df]
+        if absent:
+            raise ValueError(f"Missing feature columns {absent}")
+        n = len(df[FEATURES[0]])
+        width = len(NUMERIC_FEATURES) + len(self.missing_flags) + len(CATEGORICAL_FEATURES)
+        # Fixed number of entries per row, filled column by column in column order
+        indices = np.empty((n, width), dtype=np.int32)
+        data = np.empty((n, width))
+        slot = 0
+        for column in NUMERIC_FEATURES:
+            values = self._numeric(df, column)
+            missing = np.isnan(values)
+            median, mean, std = self.scaling[column]
+            indices[:, slot] = self.offsets[column]
+            data[:, slot] = (np.where(missing, median, values) - mean) / std
+            slot += 1
+            if column in self.missing_flags:
+                indices[:, slot] = self.offsets[column + '_missing']
+                data[:, slot] = missing
+                slot += 1
+        for column in CATEGORICAL_FEATURES:
+            # Level 0 is the reference; it, missing and unseen levels get a zero entry
+            codes = self._codes(df, column)
+            indices[:, slot] = self.offsets[column] + np.maximum(codes - 1, 0)
+            data[:, slot] = codes > 0
+            slot += 1
+
+        return sparse.csr_matrix((data.ravel(), indices.ravel(), np.arange(0, n * width + 1, width)),
+                                 shape=(n, len(self.columns)))
+
+    def _layout(self, df):
+        """Learn imputation, scaling and category levels, and lay out the columns."""
+        self.scaling, self.missing_flags, self.levels, self.numeric_levels = {}, [], {}, []
+        self.columns, self.groups, self.offsets = [], [], {}
+
+        def add(name, group):
+            self.offsets[name] = len(self.columns)
+            self.columns.append(name)
+            self.groups.append(group)
+
+        for column in NUMERIC_FEATURES:
+            values = self._numeric(df, column)
+            median = np.nanmedian(values) if (~np.isnan(values)).any() else 0.0
+            filled = np.where(np.isnan(values), median, values)
+            self.scaling[column] = (float(median), float(filled.mean()), float(filled.std() or 1.0))
+            add(column, column)
+            if np.isnan(values).any():
+                self.missing_flags.append(column)
+                add(column + '_missing', column)
+        for column in CATEGORICAL_FEATURES:
+            # Most common level is the reference (absorbed by the intercept)
+            counts = df[column].value_counts()
+            counts = counts[counts > 0]
+            if pd.api.types.is_numeric_dtype(counts.index.dtype):
+                self.numeric_levels.append(column)
+                self.levels[column] = [float(level) for level in counts.index]
+            else:
+                self.levels[column] = [str(level) for level in counts.index]
+            self.offsets[column] = len(self.columns)
+            for level in self.levels[column][1:]:
+                self.columns.append(f'{column}={_level_label(level)}')
+                self.groups.append(column)
+
+    # ------------------------------------------
+    # Fit / predict
+    # ------------------------------------------
+    def fit(self, df, left):
+        """Fit on the employees in ``df`` and whether each one left (boolean array)."""
+        y = np.asarray(left, dtype=float)
+        if len(y) < 2 or y.min() == y.max():
+            raise ValueError("Need employees who left and employees who stayed to fit the model")
+
+        self._layout(df)
+        x = self.design_matrix(df)
+        n, p = x.shape
+        penalty = np.full(p + 1, float(self.ridge))
+        penalty[0] = 0.0                           # unpenalised intercept
+        beta = np.zeros(p + 1)
+        beta[0] = np.log(y.mean() / (1 - y.mean()))
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            probability = expit(beta[0] + x @ beta[1:])
+            weights = probability * (1 - probability)
+            residual = y - probability
+            gradient = np.concatenate([[residual.sum()], x.T @ residual]) - penalty * beta
+            weighted_sums = x.T @ weights
+            hessian = np.block([[np.array([[weights.sum()]]), weighted_sums[None, :]],
+                                [weighted_sums[:, None], (x.T @ x.multiply(weights[:, None])).toarray()]])
+            step = np.linalg.solve(hessian + np.diag(penalty), gradient)
+            beta += step
+            if np.abs(step).max() < TOLERANCE:
+                break
+        self.intercept, self.coef = beta[0], beta[1:]
+        self.iterations = iteration
+
+        probability = expit(self.intercept + x @ self.coef)
+        self.n_employees = n
+        self.base_rate = y.mean()
+        self.train_auc = auc_score(y, probability)
+        self.log_loss = -np.mean(xlogy(y, probability) + xlogy(1 - y, 1 - probability))
+        self.importance = self._importance(x)
+        self.fitted = True
+        return self
+
+    def predict_log_odds(self, df):
+        """Log-odds of leaving for every employee in ``df``."""
+        if not self.fitted:
+            raise ValueError("Model is not fitted")
+        return self.intercept + self.design_matrix(df) @ self.coef
+
+    def predict_proba(self, df):
+        """Probability of leaving for every employee in ``df``."""
+        return expit(self.predict_log_odds(df))
+
+    def evaluate(self, df, left):
+        """AUC, Brier score and log loss of the predictions for ``df``."""
+        y = np.asarray(left, dtype=float)
+        probability = self.predict_proba(df)
+        return {'employees': len(y), 'auc': auc_score(y, probability),
+                'brier': float(np.mean((probability - y) ** 2)),
+                'log_loss': float(-np.mean(xlogy(y, probability) + xlogy(1 - y, 1 - probability)))}
+
+    # ------------------------------------------
+    # Interpretation
+    # ------------------------------------------
+    def coefficients(self):
+        """Coefficient per design column with its odds ratio.
+
+        Numeric effects are per standard deviation of the (transformed)
+        feature; categorical ones are relative to the most common level.
+        """
+        return pd.DataFrame({'group': self.groups, 'coef': self.coef, 'odds_ratio': np.exp(self.coef)},
+                            index=pd.Index(self.columns, name='column'))
+
+    def _importance(self, x):
+        groups = np.array(self.groups)
+        spread = {}
+        for group in FACTOR_LABELS:
+            mask = groups == group
+            spread[group] = (x[:, mask] @ self.coef[mask]).std()
+        importance = pd.DataFrame({'factor': pd.Series(FACTOR_LABELS), 'log_odds_spread': pd.Series(spread)})
+        importance['typical_odds_ratio'] = np.exp(importance['log_odds_spread'])
+        return importance.sort_values('log_odds_spread', ascending=False)
+
+    # ------------------------------------------
+    # Persistence
+    # ------------------------------------------
+    STATE = ['ridge', 'scaling', 'missing_flags', 'levels', 'numeric_levels', 'columns', 'groups', 'offsets',
+             'intercept', 'coef', 'iterations', 'n_employees', 'base_rate', 'train_auc', 'log_loss']
+
+    def save(self, path):
+        """Write the fitted model as JSON (plain numbers and level lists)."""
+        state = {name: getattr(self, name) for name in self.STATE}
+        state.update(coef=self.coef.tolist(), intercept=float(self.intercept), base_rate=float(self.base_rate),
+                     train_auc=float(self.train_auc), log_loss=float(self.log_loss),
+                     importance=self.importance.reset_index().to_dict(orient='list'),
+                     holdout=getattr(self, 'holdout', None))
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            state = json.load(f)
+        model = cls(state['ridge'])
+        for name in cls.STATE:
+            setattr(model, name, state[name])
+        model.coef = np.asarray(model.coef)
+        model.scaling = {column: tuple(values) for column, values in model.scaling.items()}
+        model.importance = pd.DataFrame(state['importance']).set_index('index')
+        model.holdout = state['holdout']
+        model.fitted = True
+        return model
+
+
+def _level_label(value):
+    """Display label of a level (numeric levels print as integers)."""
+    return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+
+
+# ==========================================
+# TRAINING / SCORING
+# ==========================================
+def attrition_labels(df):
+    return (df[TARGET] == POSITIVE).fillna(False).to_numpy(dtype=bool)
+
+
+def fit_risk_model(df, ridge=DEFAULT_RIDGE, holdout=HOLDOUT, seed=SEED):
+    """Fit on all of ``df``, after measuring the fit on a random holdout share.
+
+    The model is first fitted without the holdout employees and scored on
+    them; ``model.holdout`` keeps those metrics. The returned model is then
+    fitted on every employee.
+    """
+    left = attrition_labels(df)
+    model = AttritionRiskModel(ridge)
+    if holdout:
+        held = np.random.default_rng(seed).random(len(df)) < holdout
+        trained = model.fit(df[~held], left[~held])
+        model.holdout = trained.evaluate(df[held], left[held])
+    else:
+        model.holdout = None
+    return model.fit(df, left)
+
+
+def score_frame(model, df):
+    """Id, probability and band per employee of ``df``."""
+    probability = model.predict_proba(df)
+    scores = pd.DataFrame({'risk_score': probability, 'risk_band': risk_bands(probability)})
+    if ID_COLUMN in df:
+        scores.insert(0, ID_COLUMN, df[ID_COLUMN].to_numpy())
+    return scores
+
+
+def _read_chunks(model, path, columns, chunk_rows):
+    """DataFrame chunks of ``columns``, through pyarrow's streaming CSV reader when available."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+        return
+    # Fixed types, so a block where a column happens to be all blank parses like the others
+    numbers = set(NUMERIC_FEATURES + model.numeric_levels)
+    types = {column: pa.float64() if column in numbers else pa.string() for column in FEATURES}
+    reader = pa_csv.open_csv(path, pa_csv.ReadOptions(block_size=chunk_rows * ROW_BYTES),
+                             convert_options=pa_csv.ConvertOptions(column_types=types, include_columns=columns))
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def _write_chunks(f, chunks):
+    """Write DataFrame chunks to an open CSV file, through pyarrow's CSV writer when available."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        for number, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=number == 0, lineterminator='\n', float_format='%.6f')
+        return
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk.round({'risk_score': 6}), preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa_csv.CSVWriter(f, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def score_csv(model, path, output, chunk_rows=CHUNK_ROWS):
+    """Score every employee of a CSV export chunk by chunk and write the scores to ``output``.
+
+    Only the model's columns (and ``EmployeeNumber``) are read, so memory
+    stays bounded by one chunk. Returns the number of employees per band.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [column for column in [ID_COLUMN] + FEATURES if column in header]
+    labels = [label for label, _ in RISK_BANDS]
+    counts = []
+
+    def scored():
+        for chunk in _read_chunks(model, path, columns, chunk_rows):
+            scores = score_frame(model, chunk)
+            counts.append(scores['risk_band'].value_counts())
+            yield scores
+
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        _write_chunks(f, scored())
+    os.replace(tmp_path, output)
+    return pd.concat(counts).groupby(level=0).sum().reindex(labels, fill_value=0).astype(np.int64)
+
+
+# ==========================================
+# REPORT
+# ==========================================
+def print_risk_drivers(model):
+    print("ATTRITION RISK DRIVERS (Strongest to Weakest, from the fitted model):")
+    for rank, row in enumerate(model.importance.itertuples(), 1):
+        print(f"{rank}. {row.factor} - typical odds ratio x{row.typical_odds_ratio:.2f}")
+
+
+def print_model_fit(model):
+    print(f"Fitted on {model.n_employees} employees, {len(model.columns)} design columns "
+          f"(ridge {model.ridge:g}, {model.iterations} Newton iterations)")
+    print(f"Base attrition rate: {model.base_rate * 100:.1f}%, training AUC: {model.train_auc:.3f}")
+    if model.holdout:
+        print(f"Holdout ({model.holdout['employees']} employees): AUC {model.holdout['auc']:.3f}, "
+              f"Brier {model.holdout['brier']:.4f}, log loss {model.holdout['log_loss']:.4f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fit the attrition risk model or score an employee export.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    fit = commands.add_parser('fit', help='fit on an export with Attrition and save the model')
+    fit.add_argument('--data', default='WA_Fn-UseC_-HR-Employee-Attrition.csv')
+    fit.add_argument('--model', default=MODEL_FILE)
+    fit.add_argument('--ridge', type=float, default=DEFAULT_RIDGE, help='L2 penalty on the coefficients')
+    fit.add_argument('--holdout', type=float, default=HOLDOUT, help='share held out to measure the fit')
+    score = commands.add_parser('score', help='score every employee of an export with a saved model')
+    score.add_argument('data')
+    score.add_argument('--model', default=MODEL_FILE)
+    score.add_argument('--output', default='risk_scores.csv')
+    score.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("ATTRITION RISK MODEL")
+    print("=" * 80)
+    if args.command == 'fit':
+        df = pd.read_csv(args.data, usecols=FEATURES + [TARGET])
+        model = fit_risk_model(df, args.ridge, args.holdout)
+        print_model_fit(model)
+        print()
+        print_risk_drivers(model)
+        print(f"\nModel saved to {model.save(args.model)}")
+        return
+
+    model = AttritionRiskModel.load(args.model)
+    start = time.perf_counter()
+    bands = score_csv(model, args.data, args.output, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    total = bands.sum()
+    print(f"Scored {total:,} employees in {elapsed:.2f}s ({total / elapsed:,.0f} employees/second)")
+    for label, count in bands.items():
+        print(f"  {label:<6} risk: {count:>10,} ({count / total * 100:.1f}%)")
+    print(f"Scores written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+Tenure Survival Analysis
+========================
+Kaplan-Meier retention curves, hazard tables and log-rank tests of tenure
+for every segment of several dimensions, computed together.
+
+Tenure (``YearsAtCompany``) is the time and leaving (``Attrition == 'Yes'``)
+the event. Employees who stayed are censored at their current tenure. Tenure
+is counted in whole years, so the time grid is 0 .. the longest tenure and
+every estimate is a product or sum over that grid:
+
+- ``at_risk[t]``: employees with at least ``t`` completed years
+- ``events[t]``: employees who left after exactly ``t`` completed years
+- hazard ``h[t] = events[t] / at_risk[t]``: the share leaving during
+  tenure year ``t + 1`` among those who reached it
+- retention ``R(y) = prod_{t < y} (1 - h[t])``: the share still employed
+  after ``y`` years (Kaplan-Meier), with Greenwood standard errors
+
+One pass over the employees fills the (segment, tenure) counts of every
+dimension at once. Each (dimension, segment, tenure) cell gets a slot in one
+flat array, filled by one ``np.bincount`` per block of employees, as in
+``attrition_cube``. Everything after that works on small (segments x years)
+matrices. The cost scales with the number of employees, not with the number
+of segments or curves. The log-rank tests (all segments of a dimension
+together, and each segment against the rest) come from the same matrices.
+
+Usage:
+    python survival.py [--data WA_Fn-UseC_-HR-Employee-Attrition.csv] [--dimensions Department OverTime]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.rendering import Panel
+from analysis_core.significance import benjamini_hochberg
+from attrition_cube import BLOCK_ROWS, encode_dimension
+
+# Tenure bands of the hazard table: [first year, last year] of tenure, 1-based
+HAZARD_BANDS = [(1, 1), (2, 2), (3, 3), (4, 5), (6, 10), (11, None)]
+RETENTION_YEARS = [1, 2, 5]
+SUMMARY_COLUMNS = ['employees', 'left', 'median_tenure'] + [f'retained_{years}y_pct' for years in RETENTION_YEARS] \
+    + ['logrank_chi2', 'p_value', 'q_value']
+# Short column headers of the printed summary
+SUMMARY_LABELS = {'median_tenure': 'median_years', 'logrank_chi2': 'chi2_vs_rest', 'q_value': 'q',
+                  **{f'retained_{years}y_pct': f'after_{years}y_%' for years in RETENTION_YEARS}}
+
+
+def band_label(first, last):
+    if last is None:
+        return f'Years {first}+'
+    return f'Year {first}' if first == last else f'Years {first}-{last}'
+
+
+def _tenure(duration):
+    """Whole-year tenure per employee (-1 when missing)."""
+    values = np.asarray(pd.to_numeric(duration), dtype=float)
+    known = ~np.isnan(values)
+    if (values[known] < 0).any() or (values[known] != np.floor(values[known])).any():
+        raise ValueError("Tenure must be whole, non-negative numbers (e.g. completed years)")
+    return np.where(known, values, -1).astype(np.int64)
+
+
+def _retention(events, at_risk):
+    """Kaplan-Meier retention after 0 .. T + 1 years, and its Greenwood standard error.
+
+    ``events`` and ``at_risk`` are (curves x years) count matrices. Years
+    after a curve's last employee at risk are NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+        greenwood = np.where(at_risk > events, events / (at_risk * (at_risk - events)),
+                             np.where(events > 0, np.inf, 0.0))
+    shape = (len(events), 1)
+    retention = np.concatenate([np.ones(shape), np.cumprod(1 - hazard, axis=1)], axis=1)
+    variance = retention ** 2 * np.concatenate([np.zeros(shape), np.cumsum(greenwood, axis=1)], axis=1)
+    # Defined up to one year past the last tenure anyone in the curve reached
+    observed = np.concatenate([np.ones(shape, dtype=bool), at_risk > 0], axis=1)
+    retention[~observed] = np.nan
+    with np.errstate(invalid='ignore'):
+        standard_error = np.sqrt(np.where(retention > 0, variance, 0.0))
+    standard_error[~observed] = np.nan
+    return retention, standard_error
+
+
+def _logrank(events, at_risk):
+    """Log-rank test of all curves together, and of each curve against the others.
+
+    Returns ``(chi2, df, p)`` of the k-sample test, and arrays of chi2 and p
+    for every curve against the rest (same at-risk totals, so the pooled
+    expectation is shared).
+    """
+    from scipy import stats
+
+    total_events, total_at_risk = events.sum(axis=0), at_risk.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(total_at_risk > 0, at_risk / total_at_risk, 0.0)
+        weight = np.where(total_at_risk > 1,
+                          total_events * (total_at_risk - total_events) / (total_at_risk - 1), 0.0)
+    difference = events.sum(axis=1) - share @ total_events
+    weighted = share * weight
+    covariance = np.diag(weighted.sum(axis=1)) - weighted @ share.T
+
+    # The k curves' differences sum to zero: drop one and invert the rest
+    reduced = covariance[:-1, :-1]
+    dof = np.linalg.matrix_rank(reduced) if len(reduced) else 0
+    chi2 = float(difference[:-1] @ np.linalg.pinv(reduced) @ difference[:-1]) if dof else np.nan
+    p_value = stats.chi2.sf(chi2, dof) if dof else np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        single = np.where(np.diag(covariance) > 0, difference ** 2 / np.diag(covariance), np.nan)
+    return (chi2, dof, p_value), single, stats.chi2.sf(single, 1)
+
+
+class TenureSurvival:
+    """Kaplan-Meier curves, hazards and log-rank tests per segment of several dimensions.
+
+    Build it with ``TenureSurvival.build``.
+
+    Parameters
+    ----------
+    counts : dict
+        Dimension -> ``(levels, events, at_risk)``, the two count matrices
+        being (levels x years), levels no employee has dropped.
+    events, at_risk : ndarray
+        Counts over all employees with a known tenure, per year.
+    duration, target : str
+        Tenure column and event column.
+    """
+
+    def __init__(self, counts, events, at_risk, duration='YearsAtCompany', target='Attrition'):
+        self.counts = counts
+        self.events = events
+        self.at_risk = at_risk
+        self.duration = duration
+        self.target = target
+        self.tests = {}
+        segment_tests = []
+        for dimension, (levels, segment_events, segment_at_risk) in counts.items():
+            overall, chi2, p_values = _logrank(segment_events, segment_at_risk)
+            self.tests[dimension] = overall
+            segment_tests.append(pd.DataFrame({'logrank_chi2': chi2, 'p_value': p_values},
+                                              index=pd.MultiIndex.from_product([[dimension], levels])))
+        # One false discovery rate across every segment-vs-rest test
+        self.segment_tests = pd.concat(segment_tests) if segment_tests else pd.DataFrame()
+        if len(self.segment_tests):
+            self.segment_tests['q_value'] = benjamini_hochberg(self.segment_tests['p_value'])
+
+    @classmethod
+    def build(cls, df, dimensions, duration='YearsAtCompany', target='Attrition', positive='Yes',
+              block_rows=BLOCK_ROWS):
+        """Count events and employees at risk per (segment, tenure year) of every dimension in one pass."""
+        tenure = _tenure(df[duration])
+        left = (df[target] == positive).fillna(False).to_numpy(dtype=bool)
+        years = int(tenure.max()) + 1 if len(tenure) and tenure.max() >= 0 else 1
+        encoded = [encode_dimension(df[dimension]) for dimension in dimensions]
+        # Missing levels get one extra segment per dimension, dropped at the end;
+        # the last block of slots is every employee together
+        sizes = np.array([len(levels) + 1 for _, levels in encoded] + [1], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)])[:-1]
+
+        exits = np.zeros(sizes.sum() * years)
+        leavers = np.zeros(sizes.sum() * years)
+        for start in range(0, len(df), block_rows):
+            block = slice(start, start + block_rows)
+            known = tenure[block] >= 0
+            segments = np.empty((known.sum(), len(sizes)), dtype=np.int64)
+            for position, (codes, _) in enumerate(encoded):
+                codes = codes[block][known]
+                segments[:, position] = np.where(codes < 0, sizes[position] - 1, codes)
+            segments[:, -1] = 0
+            slots = ((segments + offsets) * years + tenure[block][known][:, None]).ravel()
+            exits += np.bincount(slots, minlength=len(exits))
+            leavers += np.bincount(slots, np.repeat(left[block][known], len(sizes)), minlength=len(leavers))
+
+        # Employees at risk at tenure t: everyone whose tenure is t or longer
+        exits = exits.reshape(-1, years)
+        leavers = np.rint(leavers).astype(np.int64).reshape(-1, years)
+        at_risk = np.rint(np.cumsum(exits[:, ::-1], axis=1)[:, ::-1]).astype(np.int64)
+        counts = {}
+        for position, (dimension, (_, levels)) in enumerate(zip(dimensions, encoded)):
+            rows = slice(offsets[position], offsets[position] + sizes[position] - 1)
+            kept = at_risk[rows, 0] > 0
+            counts[dimension] = (levels[kept].rename(dimension), leavers[rows][kept], at_risk[rows][kept])
+        return cls(counts, leavers[-1], at_risk[-1], duration, target)
+
+    # Lookups ----------------------------------------------------------
+    @property
+    def dimensions(self):
+        return list(self.counts)
+
+    @property
+    def years(self):
+        return len(self.at_risk)
+
+    def retention(self, dimension=None):
+        """Share still employed (%) after 0 .. T + 1 years, one column per segment.
+
+        Without ``dimension``, the single curve of all employees.
+        """
+        levels, events, at_risk = self._counts(dimension)
+        retention, _ = _retention(events, at_risk)
+        return pd.DataFrame(retention.T * 100, index=pd.RangeIndex(self.years + 1, name=self.duration),
+                            columns=levels)
+
+    def hazard(self, dimension=None):
+        """Share leaving per year of tenure (%), pooled over the ``HAZARD_BANDS``, one row per segment."""
+        levels, events, at_risk = self._counts(dimension)
+        cumulative = [np.concatenate([np.zeros((len(values), 1)), np.cumsum(values, axis=1)], axis=1)
+                      for values in (events, at_risk)]
+        columns = {}
+        for first, last in HAZARD_BANDS:
+            low, high = min(first - 1, self.years), min(self.years if last is None else last, self.years)
+            band_events, band_at_risk = (values[:, high] - values[:, low] for values in cumulative)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                columns[band_label(first, last)] = np.where(band_at_risk > 0, band_events / band_at_risk * 100,
+                                                            np.nan)
+        return pd.DataFrame(columns, index=levels)
+
+    def summary(self, dimension):
+        """Employees, leavers, median tenure, retention and log-rank test per segment."""
+        levels, events, at_risk = self._counts(dimension)
+        retention, _ = _retention(events, at_risk)
+        with np.errstate(invalid='ignore'):
+            below = retention <= 0.5
+        median = np.where(below.any(axis=1), below.argmax(axis=1), np.nan)
+        table = pd.DataFrame({'employees': at_risk[:, 0], 'left': events.sum(axis=1), 'median_tenure': median},
+                             index=levels)
+        for years in RETENTION_YEARS:
+            table[f'retained_{years}y_pct'] = retention[:, years] * 100 if years <= self.years else np.nan
+        tests = self.segment_tests.loc[dimension]
+        for column in ['logrank_chi2', 'p_value', 'q_value']:
+            table[column] = tests[column].to_numpy()
+        return table[SUMMARY_COLUMNS]
+
+    def standard_errors(self, dimension=None):
+        """Greenwood standard errors (percentage points) of ``retention``."""
+        levels, events, at_risk = self._counts(dimension)
+        _, standard_error = _retention(events, at_risk)
+        return pd.DataFrame(standard_error.T * 100, index=pd.RangeIndex(self.years + 1, name=self.duration),
+                            columns=levels)
+
+    def _counts(self, dimension):
+        if dimension is None:
+            return pd.Index(['All employees']), self.events[None, :], self.at_risk[None, :]
+        return self.counts[dimension]
+
+
+# ==========================================
+# REPORT
+# ==========================================
+def survival_panels(survival, max_years=None):
+    """One 'step' panel of retention curves per dimension."""
+    panels = []
+    for dimension in survival.dimensions:
+        curves = survival.retention(dimension)
+        if max_years is not None:
+            curves = curves.loc[:max_years]
+        panels.append(Panel(f'retention_by_{dimension}', 'step', f'Retention by {dimension}',
+                            {'x': curves.index.to_numpy(),
+                             'series': {str(level): curves[level].to_numpy() for level in curves.columns}},
+                            'Years at Company', 'Still Employed (%)', {'ylim': (0, 100)}))
+    return panels
+
+
+def print_survival(survival, dimension):
+    chi2, dof, p_value = survival.tests[dimension]
+    print(f"\n{survival.duration} by {dimension} (log-rank chi2 = {chi2:.1f}, df = {dof}, p = {p_value:.2e}):")
+    summary = survival.summary(dimension)
+    shown = summary.drop(columns=['p_value']).round(1).assign(q_value=summary['q_value'].map('{:.1e}'.format))
+    print(shown.rename(columns=SUMMARY_LABELS).to_string())
+    print("Share leaving per year of tenure (%):")
+    print(survival.hazard(dimension).round(1).to_string())
+
+
+def main(argv=None):
+    from hr_attrition_analysis import DATA_FILE, SURVIVAL_DIMENSIONS, load_data
+
+    parser = argparse.ArgumentParser(description='Kaplan-Meier tenure survival and log-rank tests per segment.')
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--dimensions', nargs='+', default=SURVIVAL_DIMENSIONS)
+    args = parser.parse_args(argv)
+
+    survival = TenureSurvival.build(load_data(args.data), args.dimensions)
+    print("=" * 80)
+    print("TENURE SURVIVAL")
+    print("=" * 80)
+    overall = survival.retention()['All employees']
+    print(f"\nEmployees: {survival.at_risk[0]:,}, left: {survival.events.sum():,}; still employed after "
+          + ", ".join(f"{years}y: {overall[years]:.1f}%" for years in RETENTION_YEARS if years <= survival.years))
+    for dimension in survival.dimensions:
+        print_survival(survival, dimension)
+
+
+if __name__ == '__main__':
+    main()
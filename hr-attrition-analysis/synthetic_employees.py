@@ -0,0 +1,124 @@
+"""
+Synthetic Employees
+===================
+Schema-faithful synthetic copies of the IBM HR attrition export at any size.
+
+Rows are drawn with replacement from the bundled
+``WA_Fn-UseC_-HR-Employee-Attrition.csv``, so every column keeps its real
+values and its joint distribution with the others (job level vs income vs
+tenure, overtime vs attrition, ...). Each drawn row then becomes a new
+employee:
+
+- a fresh ``EmployeeNumber``
+- ``MonthlyIncome`` scaled by a little log-normal noise
+- ``DailyRate``, ``HourlyRate`` and ``MonthlyRate`` redrawn uniformly over
+  their observed ranges (in the source they are unrelated to everything else)
+- survey answers left blank at ``--null-rate``, as non-response shows up in
+  real exports (the bundled file has no missing values)
+
+Files are written in chunks with the source's UTF-8 BOM, so 10M rows need no
+more memory than one chunk.
+
+Usage:
+    python synthetic_employees.py --rows 1M [--output benchmark_data/employees-1000000.csv] [--seed 42]
+
+Author: [Your Name]
+Date: October 2025
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_core.benchmarking import parse_size
+
+SOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+CHUNK_ROWS = 500_000
+INCOME_NOISE = 0.05                           # sigma of the log-normal income factor
+UNIFORM_COLUMNS = ['DailyRate', 'HourlyRate', 'MonthlyRate']
+SURVEY_COLUMNS = ['EnvironmentSatisfaction', 'JobSatisfaction', 'RelationshipSatisfaction',
+                  'WorkLifeBalance', 'JobInvolvement']
+DEFAULT_NULL_RATE = 0.01
+
+
+def load_source(path=SOURCE_FILE):
+    return pd.read_csv(path)
+
+
+def generate_employees(source, rows, start=0, seed=42, null_rate=DEFAULT_NULL_RATE):
+    """Synthetic employees ``start .. start + rows - 1`` drawn from ``source``.
+
+    Parameters
+    ----------
+    source : DataFrame
+        The seed export from ``load_source``.
+    rows : int
+        Number of employees to generate.
+    start : int
+        Position of the first employee in the whole file; employee numbers
+        are ``start + 1`` onwards.
+    seed : int
+        Seed shared by all chunks of one file.
+    null_rate : float
+        Share of survey answers left blank.
+    """
+    rng = np.random.default_rng([seed, start])
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+
+    df['EmployeeNumber'] = np.arange(start + 1, start + rows + 1)
+    df['MonthlyIncome'] = np.round(df['MonthlyIncome'] * rng.lognormal(0, INCOME_NOISE, rows)).astype(np.int64)
+    for column in UNIFORM_COLUMNS:
+        df[column] = rng.integers(source[column].min(), source[column].max() + 1, rows)
+    if null_rate > 0:
+        for column in SURVEY_COLUMNS:
+            # Nullable integers keep the answers written as 1..4 rather than 1.0..4.0
+            df[column] = df[column].astype('Int64').mask(rng.random(rows) < null_rate)
+    return df
+
+
+def write_employees(path, rows, seed=42, source_path=SOURCE_FILE, null_rate=DEFAULT_NULL_RATE,
+                    chunk_rows=CHUNK_ROWS):
+    """Write ``rows`` synthetic employees to ``path`` chunk by chunk."""
+    source = load_source(source_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_employees(source, min(chunk_rows, rows - start), start, seed, null_rate)
+            chunk.to_csv(f, index=False, header=start == 0, lineterminator='\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_path(data_dir, rows, seed=42, null_rate=DEFAULT_NULL_RATE):
+    return os.path.join(data_dir, f'employees-{rows}-s{seed}-n{null_rate:g}.csv')
+
+
+def ensure_employees(data_dir, rows, seed=42, null_rate=DEFAULT_NULL_RATE):
+    """Path of a synthetic file with these parameters, generating it if missing."""
+    path = synthetic_path(data_dir, rows, seed, null_rate)
+    if not os.path.exists(path):
+        write_employees(path, rows, seed, null_rate=null_rate)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic IBM HR attrition export.')
+    parser.add_argument('--rows', type=parse_size, default=parse_size('10k'), help='e.g. 10k, 1M, 10M')
+    parser.add_argument('--output', default=None, help='default: benchmark_data/employees-<rows>-s<seed>-n<rate>.csv')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--null-rate', type=float, default=DEFAULT_NULL_RATE, help='share of blank survey answers')
+    args = parser.parse_args(argv)
+
+    output = args.output or synthetic_path('benchmark_data', args.rows, args.seed, args.null_rate)
+    write_employees(output, args.rows, args.seed, null_rate=args.null_rate)
+    print(f"✓ Saved: {output} ({args.rows:,} employees, {os.path.getsize(output) / 2 ** 20:,.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
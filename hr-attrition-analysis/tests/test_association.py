@@ -0,0 +1,88 @@
+"""Every measure of the association matrix matches a per-pair pandas/scipy computation."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats.contingency import association
+
+from analysis_core import association as engine
+from analysis_core.association import association_matrix, target_associations
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+NUMERIC = ['Age', 'MonthlyIncome', 'YearsAtCompany', 'DistanceFromHome', 'StandardHours']
+CATEGORICAL = ['Attrition', 'Department', 'JobRole', 'OverTime', 'MaritalStatus']
+
+
+@pytest.fixture(scope='module')
+def employees():
+    df = pd.read_csv(DATA)[NUMERIC + CATEGORICAL + ['EmployeeNumber']]
+    rng = np.random.default_rng(1)
+    df.loc[rng.choice(df.index, 50, replace=False), 'MonthlyIncome'] = np.nan
+    df.loc[rng.choice(df.index, 30, replace=False), 'JobRole'] = np.nan
+    df['EmployeeNumber'] = df['EmployeeNumber'].astype(str)      # an identifier: too many levels
+    return df
+
+
+def _eta(values, labels):
+    keep = values.notna() & labels.notna()
+    values, labels = values[keep], labels[keep]
+    means = values.groupby(labels).transform('mean')
+    return np.sqrt(((means - values.mean()) ** 2).sum() / ((values - values.mean()) ** 2).sum())
+
+
+def test_measures_match_pairwise(employees, monkeypatch):
+    # Small blocks, so pairs of blocks and the thread pool are exercised too
+    monkeypatch.setattr(engine, 'BLOCK_COLUMNS', 3)
+    matrix, kinds = association_matrix(employees, bias_corrected=False, workers=2)
+
+    assert 'EmployeeNumber' not in matrix.index
+    assert kinds[NUMERIC].eq('numeric').all() and kinds[CATEGORICAL].eq('categorical').all()
+    assert np.allclose(matrix, matrix.T, equal_nan=True)
+
+    present = [column for column in NUMERIC if column != 'StandardHours']
+    expected = employees[present].corr()
+    assert np.allclose(matrix.loc[present, present], expected)
+    # A constant column has no association with anything
+    assert matrix.loc['StandardHours'].drop('StandardHours').isna().all()
+
+    for numeric in ['Age', 'MonthlyIncome']:
+        for categorical in ['Department', 'JobRole', 'OverTime']:
+            eta = _eta(employees[numeric], employees[categorical])
+            assert matrix.loc[numeric, categorical] == pytest.approx(eta), (numeric, categorical)
+
+    for a, b in [('Attrition', 'OverTime'), ('Department', 'JobRole'), ('MaritalStatus', 'JobRole')]:
+        table = pd.crosstab(employees[a], employees[b]).to_numpy()
+        assert matrix.loc[a, b] == pytest.approx(association(table, method='cramer', correction=False)), (a, b)
+
+
+def test_spearman_and_bias_correction(employees):
+    matrix, _ = association_matrix(employees, method='spearman', max_levels=50)
+    complete = ['Age', 'YearsAtCompany', 'DistanceFromHome']
+    assert np.allclose(matrix.loc[complete, complete], employees[complete].corr('spearman'))
+    # Each column is ranked once over its own values, then correlated pairwise
+    assert matrix.loc['Age', 'MonthlyIncome'] == pytest.approx(
+        employees['Age'].rank().corr(employees['MonthlyIncome'].rank()))
+
+    # Bergsma's correction only ever shrinks V
+    plain, _ = association_matrix(employees, columns=CATEGORICAL, bias_corrected=False)
+    corrected, _ = association_matrix(employees, columns=CATEGORICAL)
+    assert (corrected <= plain + 1e-12).all().all()
+    table = pd.crosstab(employees['Department'], employees['JobRole']).to_numpy()
+    n = table.sum()
+    r, k = table.shape
+    phi2 = association(table, method='cramer', correction=False) ** 2 * (min(r, k) - 1)
+    phi2 = max(0, phi2 - (k - 1) * (r - 1) / (n - 1))
+    r_tilde, k_tilde = r - (r - 1) ** 2 / (n - 1), k - (k - 1) ** 2 / (n - 1)
+    assert corrected.loc['Department', 'JobRole'] == pytest.approx(np.sqrt(phi2 / (min(r_tilde, k_tilde) - 1)))
+
+
+def test_target_associations(employees):
+    matrix, kinds = association_matrix(employees, columns=NUMERIC + CATEGORICAL)
+    table = target_associations(matrix, kinds, 'Attrition')
+    assert 'Attrition' not in table.index
+    assert table['measure'].to_dict()['Age'] == 'eta'
+    assert table['measure'].to_dict()['OverTime'] == 'cramers_v'
+    ranked = table['abs_association'].dropna()
+    assert ranked.is_monotonic_decreasing
@@ -0,0 +1,64 @@
+"""The attrition cube's counts and rates match plain pandas groupbys."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from attrition_cube import AttritionCube
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+DIMENSIONS = ['Department', 'JobRole', 'OverTime', 'JobLevel', 'MaritalStatus']
+MIN_SUPPORT = 15
+
+
+@pytest.fixture(scope='module')
+def employees():
+    df = pd.read_csv(DATA)
+    # Some missing levels, which the cube leaves out like groupby does
+    rng = np.random.default_rng(0)
+    df.loc[rng.choice(df.index, 40, replace=False), 'JobRole'] = np.nan
+    df.loc[rng.choice(df.index, 25, replace=False), 'JobLevel'] = np.nan
+    return df
+
+
+def _counts(df, keys):
+    grouped = df.groupby(keys)['Attrition']
+    return pd.DataFrame({'employees': grouped.size(), 'left': grouped.apply(lambda s: (s == 'Yes').sum())})
+
+
+@pytest.mark.parametrize('block_rows', [64, 1 << 15])
+def test_tables_match_groupby(employees, block_rows):
+    cube = AttritionCube.build(employees, DIMENSIONS, min_support=MIN_SUPPORT, block_rows=block_rows)
+    assert cube.employees == len(employees)
+    assert cube.left == (employees['Attrition'] == 'Yes').sum()
+
+    for dimension in DIMENSIONS:
+        expected = _counts(employees, dimension)
+        table = cube.table(dimension)
+        assert list(table.index) == list(expected.index), dimension
+        assert (table['employees'].to_numpy() == expected['employees'].to_numpy()).all(), dimension
+        assert (table['left'].to_numpy() == expected['left'].to_numpy()).all(), dimension
+        rate = employees.groupby(dimension)['Attrition'].apply(lambda s: (s == 'Yes').mean() * 100)
+        assert np.allclose(cube.rate(dimension).to_numpy(), rate.to_numpy())
+
+    shares = pd.crosstab(employees['OverTime'], employees['Attrition'], normalize='index') * 100
+    assert np.allclose(cube.shares('OverTime')[['No', 'Yes']].to_numpy(), shares[['No', 'Yes']].to_numpy())
+
+
+def test_pairs_match_groupby(employees):
+    cube = AttritionCube.build(employees, DIMENSIONS, min_support=MIN_SUPPORT)
+    for a, b in [('Department', 'JobRole'), ('OverTime', 'JobLevel'), ('JobRole', 'MaritalStatus')]:
+        expected = _counts(employees, [a, b])
+        expected = expected[expected['employees'] >= MIN_SUPPORT]
+        table = cube.pair(a, b)
+        assert sorted(table.index) == sorted(expected.index), (a, b)
+        aligned = table.loc[expected.index]
+        assert (aligned['employees'].to_numpy() == expected['employees'].to_numpy()).all(), (a, b)
+        assert (aligned['left'].to_numpy() == expected['left'].to_numpy()).all(), (a, b)
+        # Either order gives the same cells
+        assert cube.pair(b, a).swaplevel().sort_index().equals(table.sort_index())
+    cell = cube.cell(OverTime='Yes', JobLevel=1)
+    subset = employees[(employees['OverTime'] == 'Yes') & (employees['JobLevel'] == 1)]
+    assert cell['employees'] == len(subset) and cell['left'] == (subset['Attrition'] == 'Yes').sum()
@@ -0,0 +1,97 @@
+"""Saved, chunked and served risk scores all equal the in-memory model's."""
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_model import FEATURES, ID_COLUMN, AttritionRiskModel, fit_risk_model, score_csv, score_frame
+from scoring_service import MicroBatcher, ScoringServer
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+
+
+@pytest.fixture(scope='module')
+def employees():
+    return pd.read_csv(DATA)
+
+
+@pytest.fixture(scope='module')
+def model(employees):
+    return fit_risk_model(employees)
+
+
+def _records(df):
+    return [{column: (None if pd.isna(value) else value.item() if hasattr(value, 'item') else value)
+             for column, value in row.items()} for row in df[[ID_COLUMN] + FEATURES].to_dict(orient='records')]
+
+
+def test_fit(model, employees):
+    assert model.holdout['auc'] > 0.7 and model.train_auc > 0.7
+    probability = model.predict_proba(employees)
+    assert ((probability > 0) & (probability < 1)).all()
+    assert probability.mean() == pytest.approx((employees['Attrition'] == 'Yes').mean(), abs=0.01)
+
+
+def test_saved_and_chunked_scores_match(model, employees, tmp_path):
+    loaded = AttritionRiskModel.load(model.save(str(tmp_path / 'model.json')))
+    expected = score_frame(model, employees)
+    assert np.allclose(score_frame(loaded, employees)['risk_score'], expected['risk_score'])
+
+    output = str(tmp_path / 'scores.csv')
+    bands = score_csv(loaded, DATA, output, chunk_rows=100)
+    scores = pd.read_csv(output)
+    assert (scores[ID_COLUMN] == employees[ID_COLUMN]).all()
+    assert np.allclose(scores['risk_score'], expected['risk_score'], atol=1e-6)
+    assert bands.to_dict() == expected['risk_band'].value_counts().reindex(bands.index, fill_value=0).to_dict()
+
+
+def test_micro_batches_match_one_batch(model, employees):
+    expected = model.predict_proba(employees)
+    batcher = MicroBatcher(model, max_batch=32, max_wait=0.01)
+    try:
+        records = _records(employees)
+        # Requests of one to three employees, in order
+        bounds = np.cumsum([0] + [1, 2, 3] * 50)
+        requests = [records[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        futures = [batcher.submit(request) for request in requests]
+        scores = np.concatenate([future.result(timeout=10) for future in futures])
+    finally:
+        batcher.close()
+    assert np.allclose(scores, expected[:len(scores)])
+    assert batcher.stats()['batches'] < len(requests)
+
+
+def test_service(model, employees):
+    server = ScoringServer(('127.0.0.1', 0), model, max_batch=8, max_wait_ms=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    def post(payload):
+        request = urllib.request.Request(url + '/score', json.dumps(payload).encode(),
+                                         {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    try:
+        records = _records(employees.head(5))
+        single = post(records[0])
+        assert single[ID_COLUMN] == records[0][ID_COLUMN]
+        assert single['risk_score'] == pytest.approx(model.predict_proba(employees.head(1))[0])
+        scores = post({'employees': records})['scores']
+        assert [score['risk_score'] for score in scores] == pytest.approx(model.predict_proba(employees.head(5)))
+
+        incomplete = dict(records[0])
+        del incomplete['OverTime']
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(incomplete)
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,81 @@
+"""The batched significance engine matches scipy, and its permutation p-values handle degenerate columns."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from analysis_core.significance import benjamini_hochberg, significance_tests
+
+PERMUTATIONS = 400
+
+
+@pytest.fixture(scope='module')
+def frame():
+    rng = np.random.default_rng(7)
+    n = 300
+    group = rng.random(n) < 0.3
+    df = pd.DataFrame({
+        'shifted': rng.normal(0, 1, n) + group * 0.8,
+        'noise': rng.normal(0, 1, n),
+        'ties': rng.integers(1, 5, n).astype(float),
+        'constant': np.full(n, 4.0),
+        'one_in_group': np.where(group, np.nan, rng.normal(0, 1, n)),
+        'overtime': np.where(rng.random(n) < 0.3 + group * 0.3, 'Yes', 'No'),
+        'single_level': 'Y',
+    })
+    df.loc[np.flatnonzero(group)[0], 'one_in_group'] = 1.0
+    df.loc[rng.choice(n, 20, replace=False), 'noise'] = np.nan
+    return df, group
+
+
+def test_tests_match_scipy(frame):
+    df, group = frame
+    table = significance_tests(df, group, n_permutations=0)
+
+    for column in ['shifted', 'noise', 'ties']:
+        values = df[column].to_numpy()
+        a, b = values[group], values[~group]
+        a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+        welch = stats.ttest_ind(a, b, equal_var=False)
+        assert table.loc[column, 'statistic'] == pytest.approx(welch.statistic)
+        assert table.loc[column, 'p_value'] == pytest.approx(welch.pvalue)
+        mw = stats.mannwhitneyu(a, b, method='asymptotic')
+        assert table.loc[column, 'mw_u'] == pytest.approx(mw.statistic)
+        assert table.loc[column, 'mw_p'] == pytest.approx(mw.pvalue)
+
+    chi2, p, dof, _ = stats.chi2_contingency(pd.crosstab(df['overtime'], group))
+    assert table.loc['overtime', 'statistic'] == pytest.approx(chi2)
+    assert table.loc['overtime', 'p_value'] == pytest.approx(p)
+    assert table.loc['overtime', 'dof'] == dof
+
+
+def test_permutation_p_values_on_degenerate_columns(frame):
+    df, group = frame
+    table = significance_tests(df, group, n_permutations=PERMUTATIONS, seed=0)
+
+    # Undefined observed test: no p-value, and none counted by the FDR adjustment
+    for column in ['constant', 'one_in_group', 'single_level']:
+        assert np.isnan(table.loc[column, 'perm_p']), column
+        assert np.isnan(table.loc[column, 'perm_q']), column
+    defined = table['perm_p'].dropna()
+    assert list(defined.index) == ['shifted', 'noise', 'ties', 'overtime']
+    assert ((defined >= 1 / (1 + PERMUTATIONS)) & (defined <= 1)).all()
+    assert defined['shifted'] == pytest.approx(1 / (1 + PERMUTATIONS))
+    assert table.loc['noise', 'perm_p'] == pytest.approx(table.loc['noise', 'p_value'], abs=0.1)
+
+    again = significance_tests(df, group, n_permutations=PERMUTATIONS, seed=0)
+    assert again['perm_p'].equals(table['perm_p'])
+
+
+def test_group_without_members():
+    df = pd.DataFrame({'value': np.arange(10, dtype=float), 'level': list('ababababab')})
+    table = significance_tests(df, np.zeros(10, dtype=bool), n_permutations=50, seed=0)
+    assert table['perm_p'].isna().all()
+    assert (table['n_group'] == 0).all()
+
+
+def test_benjamini_hochberg_skips_missing():
+    q = benjamini_hochberg([0.01, np.nan, 0.04, 0.03])
+    assert np.isnan(q[1])
+    assert q[[0, 2, 3]] == pytest.approx([0.03, 0.04, 0.04])
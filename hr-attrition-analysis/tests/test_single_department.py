@@ -0,0 +1,32 @@
+"""A one-department export keeps its constant ``Department`` column and runs every section."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from hr_attrition_analysis import CONSTANT_COLUMNS, SECTIONS, compact_data, load_data, run_analysis
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'WA_Fn-UseC_-HR-Employee-Attrition.csv')
+DEPARTMENT = 'Research & Development'
+
+
+@pytest.fixture
+def one_department(tmp_path):
+    path = tmp_path / 'attrition.csv'
+    df = pd.read_csv(DATA)
+    df[df['Department'] == DEPARTMENT].to_csv(path, index=False)
+    return str(path)
+
+
+def test_constant_department_is_kept(one_department):
+    df, report = compact_data(load_data(one_department))
+    assert 'Department' in df.columns
+    assert not set(CONSTANT_COLUMNS) & set(df.columns)
+    assert sorted(report.set_index('step').loc['drop constant', 'columns']) == sorted(CONSTANT_COLUMNS)
+
+
+def test_sections_run_on_one_department(one_department, tmp_path):
+    sections = [name for name in SECTIONS if name != 'plots']
+    results = run_analysis(one_department, str(tmp_path), sections)
+    assert list(results['breakdown']['department'].index) == [DEPARTMENT]
@@ -0,0 +1,67 @@
+"""Kaplan-Meier, hazard and log-rank results of a small case worked out by hand."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from survival import TenureSurvival
+
+# (years at company, left) per employee of two departments; the employee
+# without a tenure is left out
+EMPLOYEES = {
+    'A': [(0, 'Yes'), (1, 'No'), (1, 'Yes'), (2, 'Yes'), (3, 'No'), (np.nan, 'Yes')],
+    'B': [(0, 'No'), (1, 'Yes'), (2, 'No'), (2, 'No')],
+}
+
+
+@pytest.fixture(params=[2, 1 << 15], ids=['blocks', 'one block'])
+def survival(request):
+    rows = [(department, years, left) for department, employees in EMPLOYEES.items() for years, left in employees]
+    df = pd.DataFrame(rows, columns=['Department', 'YearsAtCompany', 'Attrition'])
+    return TenureSurvival.build(df, ['Department'], block_rows=request.param)
+
+
+def test_kaplan_meier(survival):
+    # A: at risk 5, 4, 2, 1 and leaving 1, 1, 1, 0 at tenure 0 .. 3
+    # B: at risk 4, 3, 2, 0 and leaving 0, 1, 0, 0
+    retention = survival.retention('Department')
+    assert retention['A'].to_numpy() == pytest.approx([100, 80, 60, 30, 30])
+    assert retention['B'].to_numpy()[:4] == pytest.approx([100, 100, 200 / 3, 200 / 3])
+    assert np.isnan(retention['B'].iloc[4])             # nobody in B reached 3 years
+    assert survival.retention()['All employees'].to_numpy() == pytest.approx(
+        [100, 800 / 9, 4000 / 63, 1000 / 21, 1000 / 21])
+
+    greenwood = 1 / (5 * 4) + 1 / (4 * 3) + 1 / (2 * 1)
+    assert survival.standard_errors('Department').loc[3, 'A'] == pytest.approx(30 * np.sqrt(greenwood))
+
+
+def test_hazard_and_summary(survival):
+    hazard = survival.hazard('Department')
+    assert hazard.loc['A', ['Year 1', 'Year 2', 'Year 3', 'Years 4-5']].to_numpy() == pytest.approx([20, 25, 50, 0])
+    assert hazard.loc['B', ['Year 1', 'Year 2', 'Year 3']].to_numpy() == pytest.approx([0, 100 / 3, 0])
+    assert np.isnan(hazard.loc['B', 'Years 4-5'])
+
+    summary = survival.summary('Department')
+    assert summary['employees'].tolist() == [5, 4]
+    assert summary['left'].tolist() == [3, 1]
+    assert summary.loc['A', 'median_tenure'] == 3
+    assert np.isnan(summary.loc['B', 'median_tenure'])
+    assert summary.loc['A', 'retained_2y_pct'] == pytest.approx(60)
+    assert np.isnan(summary.loc['A', 'retained_5y_pct'])
+
+
+def test_logrank(survival):
+    # Observed minus expected leavers of A, and its variance, at the three tenures with leavers
+    at_risk_a, at_risk, leaving = np.array([5, 4, 2]), np.array([9, 7, 4]), np.array([1, 2, 1])
+    expected = (leaving * at_risk_a / at_risk).sum()
+    variance = (at_risk_a * (at_risk - at_risk_a) * leaving * (at_risk - leaving) / (at_risk ** 2 * (at_risk - 1))).sum()
+    chi2 = (3 - expected) ** 2 / variance
+
+    overall_chi2, dof, p_value = survival.tests['Department']
+    assert overall_chi2 == pytest.approx(chi2)
+    assert dof == 1
+    assert p_value == pytest.approx(stats.chi2.sf(chi2, 1))
+    # With two segments each one against the rest is the same test
+    summary = survival.summary('Department')
+    assert summary['logrank_chi2'].to_numpy() == pytest.approx([chi2, chi2])